@@ -0,0 +1,1113 @@
+"""
+Benchmark script for Snake Odyssey: Themed Evolution
+Measures throughput of the headless game systems
+"""
+
+import sys
+import os
+import time
+import random
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+def bench_environment(steps=200000, num_envs=16):
+    """Measure environment steps per second, single and vectorized."""
+    import numpy as np
+    from ai.environment import SnakeEnv, VecSnakeEnv
+    
+    print("🤖 Environment Throughput")
+    print("=" * 50)
+    
+    env = SnakeEnv()
+    env.reset(seed=0)
+    rng = random.Random(0)
+    actions = [rng.randrange(4) for _ in range(1024)]
+    
+    start = time.perf_counter()
+    for i in range(steps):
+        _, _, terminated, truncated, _ = env.step(actions[i & 1023])
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    print(f"  SnakeEnv:          {steps / elapsed:12,.0f} steps/sec")
+    
+    vec_env = VecSnakeEnv(num_envs)
+    vec_env.reset(seed=0)
+    batch = np.array(actions[:num_envs])
+    rounds = steps // num_envs
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        vec_env.step(batch)
+        batch = (batch + 1) & 3
+    elapsed = time.perf_counter() - start
+    print(f"  VecSnakeEnv x{num_envs:<3}  {rounds * num_envs / elapsed:12,.0f} steps/sec")
+
+def serpentine_body(length, grid_width, grid_height):
+    """Build a snake body that zigzags row by row from the top-left."""
+    body = []
+    for y in range(grid_height):
+        xs = range(grid_width) if y % 2 == 0 else range(grid_width - 1, -1, -1)
+        for x in xs:
+            body.append((x, y))
+            if len(body) == length:
+                return body[::-1]
+    return body[::-1]
+
+def bench_bitboard(repeats=2000):
+    """Compare tuple/list and bitboard board operations."""
+    from collections import deque
+    from config import GRID_WIDTH, GRID_HEIGHT
+    from components.bitboard import BitBoard, CellMask
+    
+    print("🧮 Bitboard vs Tuple/List Board")
+    print("=" * 50)
+    
+    board = BitBoard()
+    obstacles = [(5, 25), (20, 20), (30, 28), (35, 15)]
+    
+    def timed(func):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            func()
+        return (time.perf_counter() - start) / repeats * 1e6
+        
+    for length in (10, 300, 1000):
+        body = serpentine_body(length, GRID_WIDTH, GRID_HEIGHT)
+        head = body[0]
+        obstacle_list = list(obstacles)
+        body_mask = CellMask(board, body)
+        obstacle_mask = CellMask(board, obstacles)
+        
+        def list_collision():
+            return head in body[1:] or head in obstacle_list
+            
+        def bit_collision():
+            return head in body_mask or head in obstacle_mask
+            
+        def list_free_count():
+            taken = set(body) | set(obstacle_list)
+            return GRID_WIDTH * GRID_HEIGHT - len(taken)
+            
+        def bit_free_count():
+            return board.free_count(body_mask.value, obstacle_mask.value)
+            
+        def list_flood_fill():
+            taken = set(body) | set(obstacle_list)
+            start = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+            seen = {start}
+            queue = deque([start])
+            while queue:
+                x, y = queue.popleft()
+                for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if (0 <= nxt[0] < GRID_WIDTH and 0 <= nxt[1] < GRID_HEIGHT and
+                        nxt not in taken and nxt not in seen):
+                        seen.add(nxt)
+                        queue.append(nxt)
+            return len(seen)
+            
+        def bit_flood_fill():
+            passable = board.free_mask(body_mask.value, obstacle_mask.value)
+            seed = board.bit((GRID_WIDTH - 1, GRID_HEIGHT - 1))
+            return board.flood_fill(seed, passable)
+            
+        print(f"  Snake length {length}:")
+        for label, list_func, bit_func in (("collision", list_collision, bit_collision),
+                                           ("free count", list_free_count, bit_free_count),
+                                           ("flood fill", list_flood_fill, bit_flood_fill)):
+            list_us = timed(list_func)
+            bit_us = timed(bit_func)
+            print(f"    {label:<11} list {list_us:9.2f} us | bitboard {bit_us:9.2f} us "
+                  f"| {list_us / bit_us:6.1f}x")
+
+def bench_snapshots(repeats=20000):
+    """Measure game-state snapshots per second against deepcopy."""
+    import copy
+    from config import GRID_WIDTH, GRID_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT
+    from components.snake import Snake
+    from components.food import Food
+    from components.game_state import GameState
+    from managers.score_manager import ScoreManager
+    
+    print("📸 Snapshot / Restore Throughput")
+    print("=" * 50)
+    
+    for length in (10, 300, 1200):
+        body = serpentine_body(length, GRID_WIDTH, GRID_HEIGHT)
+        snake = Snake(0, 0, (0, 255, 0))
+        snake.body = body
+        snake.direction = (0, 1) if length < 1200 else (1, 0)
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT)
+        food.regular_food = (GRID_WIDTH - 1, GRID_HEIGHT - 1) if length < 1200 else None
+        score_manager = ScoreManager(persistent=False)
+        obstacles = [(3, 28), (20, 27), (37, 26)] if length < 1000 else []
+        state = GameState.from_game(snake, food, score_manager, obstacles)
+        
+        start = time.perf_counter()
+        for _ in range(repeats):
+            state.restore(state.snapshot())
+        elapsed = time.perf_counter() - start
+        snapshot_rate = repeats / elapsed
+        
+        start = time.perf_counter()
+        for _ in range(repeats):
+            state.step(record=True)
+            state.undo()
+        elapsed = time.perf_counter() - start
+        step_rate = repeats / elapsed
+        
+        deep_repeats = max(20, repeats // (length // 10 + 1))
+        start = time.perf_counter()
+        for _ in range(deep_repeats):
+            copy.deepcopy((snake, food, score_manager, obstacles))
+        elapsed = time.perf_counter() - start
+        deep_rate = deep_repeats / elapsed
+        
+        print(f"  Length {length:>4}: snapshot+restore {snapshot_rate:11,.0f}/s | "
+              f"step+undo {step_rate:10,.0f}/s | deepcopy {deep_rate:9,.0f}/s")
+
+def crowded_state(seed, length=150):
+    """Build a late-game state: a long snake and the maximum of 10 obstacles."""
+    from config import GRID_WIDTH, GRID_HEIGHT
+    from components.game_state import GameState, build_chain
+    
+    state = GameState.new_game((0, 0), rng=random.Random(seed))
+    body = serpentine_body(length, GRID_WIDTH, GRID_HEIGHT)
+    state.head = build_chain(body)
+    state.length = length
+    state.body_mask = state.board.mask_of(body)
+    state.direction = (0, 1) if body[0][0] in (0, GRID_WIDTH - 1) else (body[0][0] - body[1][0], 0)
+    state.score_manager.current_score = 1100
+    state.score_manager.food_eaten = length
+    state.spawn_food()
+    state.update_obstacles()
+    return state
+
+def bench_mcts(games=3, decisions=250, move_delay=40):
+    """Measure MCTS rollouts per second and play quality per worker count."""
+    from ai.mcts import MCTSController, safe_directions
+    
+    print(f"🌳 MCTS Controller (150-cell snake, 10 obstacles, {move_delay} ms moves)")
+    print("=" * 50)
+    
+    def greedy(state):
+        options = safe_directions(state)
+        if not options:
+            return None
+        head, food = state.head.cell, state.food
+        return min(options, key=lambda d: abs(head[0] + d[0] - food[0]) +
+                                          abs(head[1] + d[1] - food[1]))
+                                          
+    for workers in (None, 1, 2, 4):
+        controller = None if workers is None else MCTSController(workers=workers, seed=0)
+        food_total = 0
+        survived = 0
+        ticks = 0
+        rollouts = 0
+        search_time = 0.0
+        for game in range(games):
+            state = crowded_state(game)
+            start_food = state.score_manager.get_food_count()
+            for _ in range(decisions):
+                if not state.alive:
+                    break
+                if controller is None:
+                    direction = greedy(state)
+                else:
+                    start = time.perf_counter()
+                    direction = controller.decide(state, move_delay)
+                    search_time += time.perf_counter() - start
+                    rollouts += controller.rollouts
+                state.step(direction)
+            food_total += state.score_manager.get_food_count() - start_food
+            survived += state.alive
+            ticks += state.tick
+        if controller is None:
+            label = "greedy"
+            rate = "-"
+        else:
+            controller.shutdown()
+            label = f"{workers} worker{'s' if workers > 1 else ''}"
+            rate = f"{rollouts / search_time:,.0f}"
+        print(f"  {label:<10} rollouts/s {rate:>8} | food/game {food_total / games:5.1f} | "
+              f"ticks/game {ticks / games:5.0f} | survived {survived}/{games}")
+              
+def bench_rendering(frames=300):
+    """Compare per-segment primitives with batched atlas blits on the board."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from config import (GRID_WIDTH, GRID_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, CELL_SIZE,
+                       SCREEN_WIDTH, SCREEN_HEIGHT, THEMES)
+    from components.snake import Snake
+    from components.food import Food
+    from managers.sprite_manager import SpriteManager
+    from managers.board_renderer import BoardRenderer
+    
+    print("🎨 Board Rendering: Primitives vs Sprite Atlas vs Persistent Layer")
+    print("=" * 50)
+    
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    board_surface = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT)).convert()
+    sprite_manager = SpriteManager()
+    
+    start = time.perf_counter()
+    for theme_name in THEMES:
+        sprite_manager.get_sprites(theme_name)
+    build_ms = (time.perf_counter() - start) / len(THEMES) * 1000
+    print(f"  Atlas build: {build_ms:.2f} ms per theme")
+    
+    theme = THEMES['forest']
+    sprites = sprite_manager.get_sprites('forest')
+    obstacles = [(5, 25), (20, 20), (30, 28), (35, 15), (12, 27)]
+    
+    def frame_ms(snake, food, use_sprites):
+        start = time.perf_counter()
+        for _ in range(frames):
+            board_surface.fill(theme['background_color'])
+            if use_sprites:
+                board_surface.blits([(sprites['obstacle'], (x * CELL_SIZE, y * CELL_SIZE))
+                                     for x, y in obstacles], False)
+                food.draw(board_surface, 0, 0, theme, sprites)
+                snake.draw(board_surface, 0, 0, sprites)
+            else:
+                for x, y in obstacles:
+                    rect = (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                    pygame.draw.rect(board_surface, theme['obstacle_color'], rect)
+                    pygame.draw.rect(board_surface, (255, 255, 255), rect, 1)
+                food.draw(board_surface, 0, 0, theme)
+                snake.draw(board_surface, 0, 0)
+        return (time.perf_counter() - start) / frames * 1000
+        
+    def layer_ms(snake, food):
+        screen = pygame.display.get_surface()
+        renderer = BoardRenderer(sprite_manager)
+        renderer.draw(screen, 0, 0, 'forest', snake, food, obstacles)
+        tail = snake.body[-1]
+        start = time.perf_counter()
+        for _ in range(frames):
+            renderer.on_snake_move(snake, tail)  # Same cells, same cost as a move
+            renderer.draw(screen, 0, 0, 'forest', snake, food, obstacles)
+        return (time.perf_counter() - start) / frames * 1000
+        
+    for length in (10, 300, 1000, 1150):
+        snake = Snake(0, 0, theme['snake_color'])
+        snake.body = serpentine_body(length, GRID_WIDTH, GRID_HEIGHT)
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT)
+        food.regular_food = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+        food.bonus_food = (GRID_WIDTH - 3, GRID_HEIGHT - 1)
+        primitive_ms = frame_ms(snake, food, False)
+        atlas_ms = frame_ms(snake, food, True)
+        persistent_ms = layer_ms(snake, food)
+        print(f"  Length {length:>4}: primitives {primitive_ms:6.2f} ms | "
+              f"atlas {atlas_ms:6.2f} ms | layer {persistent_ms:6.2f} ms")
+    pygame.quit()
+    
+def bench_audio(plays=2000):
+    """Measure theme sound synthesis, warm-up time, memory and play cost."""
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from config import THEMES
+    from managers.sound_manager import SoundManager, synthesize_theme
+    
+    print("🔊 Synthesized Theme Audio")
+    print("=" * 50)
+    
+    for sound_theme in sorted({theme['sound_theme'] for theme in THEMES.values()}):
+        start = time.perf_counter()
+        samples = synthesize_theme(sound_theme)
+        elapsed = (time.perf_counter() - start) * 1000
+        seconds = sum(len(data) for data in samples.values()) / 44100
+        print(f"  {sound_theme:<7} synthesized {seconds:4.1f} s of audio in {elapsed:6.2f} ms")
+        
+    pygame.mixer.init()
+    sound_manager = SoundManager()
+    start = time.perf_counter()
+    sound_manager.warm_up('forest')
+    call_ms = (time.perf_counter() - start) * 1000
+    sound_manager.ready.wait(30)
+    stats = sound_manager.get_stats()
+    print(f"  warm_up() returned in {call_ms:.2f} ms; background warm-up "
+          f"{stats['warm_up_time'] * 1000:.0f} ms")
+    print(f"  Cache: {len(stats['cached_themes'])} themes, "
+          f"{stats['memory_bytes'] / 1024 ** 2:.2f} MB of {stats['memory_budget'] / 1024 ** 2:.0f} MB budget")
+    
+    start = time.perf_counter()
+    for i in range(plays):
+        sound_manager.play('eat', 'forest')
+    elapsed = (time.perf_counter() - start) / plays * 1e6
+    print(f"  play(): {elapsed:.1f} us per call")
+    sound_manager.shutdown()
+    pygame.mixer.quit()
+    
+def bench_history(games=2000000, repeats=5):
+    """Measure columnar archive appends and queries over millions of games."""
+    import tempfile
+    import numpy as np
+    from managers.history_manager import HistoryManager, DEATH_CAUSES
+    
+    print(f"🗄️  Game History Archive ({games:,} games)")
+    print("=" * 50)
+    
+    rng = np.random.default_rng(0)
+    food = rng.geometric(0.05, games).clip(0, 2000)
+    bonus = food // 10
+    columns = {
+        'timestamp': 1.7e9 + np.arange(games) * 60.0,
+        'score': food * 10 + bonus * 20,
+        'length': 1 + food + bonus,
+        'food': food,
+        'bonus': bonus,
+        'duration': food * 1.5 + rng.random(games) * 5,
+        'theme': rng.integers(0, 5, games),
+        'cause': rng.integers(0, len(DEATH_CAUSES) - 1, games),
+        'death_x': rng.integers(-1, 41, games),
+        'death_y': rng.integers(-1, 31, games),
+    }
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        history = HistoryManager(temp_dir)
+        start = time.perf_counter()
+        history.append_many(columns)
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(temp_dir, name))
+                   for name in os.listdir(temp_dir))
+        print(f"  Bulk append: {elapsed * 1000:8.1f} ms | {size / games:.0f} bytes/game "
+              f"| {size / 1024 ** 2:.1f} MB")
+              
+        start = time.perf_counter()
+        for i in range(200):
+            history.append(120, 13, 12, 0, 20.0, 'forest', 'wall', (40, 5))
+        print(f"  Single append: {(time.perf_counter() - start) / 200 * 1e6:6.0f} us/game")
+        
+        queries = (
+            ("score distribution", lambda: history.distribution('score', bins=50)),
+            ("score percentiles", lambda: history.percentiles('score', (50, 90, 99))),
+            ("theme averages", lambda: history.theme_averages('score')),
+            ("sea percentiles", lambda: history.percentiles('length', theme='sea')),
+            ("death causes", lambda: history.death_causes()),
+        )
+        for label, query in queries:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                query()
+            elapsed = (time.perf_counter() - start) / repeats * 1000
+            print(f"  {label:<19} {elapsed:8.2f} ms")
+        history.maps = {}  # Release the memmaps before the directory is removed
+        
+def bench_heatmap(games=1000000, ticks=200000):
+    """Measure heatmap recording per tick and viewer load over a million games."""
+    import tempfile
+    import numpy as np
+    from managers.heatmap_manager import HeatmapManager
+    from config import GRID_WIDTH, GRID_HEIGHT
+    
+    print(f"🔥 Heatmaps ({games:,} games)")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        heatmap = HeatmapManager(temp_dir)
+        heatmap.set_context('forest', 0)
+        rng = np.random.default_rng(0)
+        cells = [(int(x), int(y)) for x, y in zip(rng.integers(0, GRID_WIDTH, ticks),
+                                                   rng.integers(0, GRID_HEIGHT, ticks))]
+        start = time.perf_counter()
+        for cell in cells:
+            heatmap.record_visit(cell)
+        heatmap.flush()
+        print(f"  Record visit: {(time.perf_counter() - start) / ticks * 1e9:8.0f} ns/tick "
+              f"(including flushes)")
+        
+        # Counts of a million games of about 200 moves each, spread over every slice
+        visits = rng.poisson(games * 200 / heatmap.size, heatmap.shape)
+        deaths = rng.poisson(games / heatmap.size, heatmap.shape)
+        heatmap.merge(visits, deaths)
+        heatmap.save()
+        for i in range(20):  # Shards from later sessions
+            heatmap.record_death((i, i))
+            heatmap.save()
+        
+        for label in ("Load + compact", "Load"):
+            viewer = HeatmapManager(temp_dir)
+            start = time.perf_counter()
+            viewer.load()
+            print(f"  {label:<15} {(time.perf_counter() - start) * 1000:8.2f} ms")
+            
+        size = sum(os.path.getsize(os.path.join(temp_dir, name)) for name in os.listdir(temp_dir))
+        print(f"  On disk:        {size / 1024:8.0f} KB")
+        
+        for label, kind, theme in (("Render all", 'visits', None),
+                                   ("Render theme", 'deaths', 'sea'),
+                                   ("Render cached", 'deaths', 'sea')):
+            start = time.perf_counter()
+            viewer.render(kind, theme)
+            print(f"  {label:<15} {(time.perf_counter() - start) * 1000:8.2f} ms")
+            
+def cycle_direction(cell, grid_width, grid_height):
+    """Get the direction that keeps a snake on a Hamiltonian cycle of the board.
+    
+    The cycle runs right along the top row, zigzags down the other rows
+    and returns up the first column (grid_height must be even).
+    """
+    x, y = cell
+    if y == 0:
+        return (1, 0) if x < grid_width - 1 else (0, 1)
+    if x == 0:
+        return (0, -1)
+    if y % 2 == 1:
+        if x > 1:
+            return (-1, 0)
+        return (0, 1) if y < grid_height - 1 else (-1, 0)
+    return (1, 0) if x < grid_width - 1 else (0, 1)
+
+def bench_replay(ticks=100000, seeks=2000):
+    """Measure replay recording, file size and seeking in a long game."""
+    import tempfile
+    from components.snake import Snake
+    from components.food import Food
+    from components.game_clock import GameClock
+    from components.replay import Replay, ReplayRecorder, ReplayState, ReplayPlayer
+    from managers.score_manager import ScoreManager
+    from managers.theme_manager import ThemeManager
+    from config import GRID_WIDTH, GRID_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT
+    
+    print(f"🎬 Keyframed Replays ({ticks:,} ticks)")
+    print("=" * 50)
+    
+    # A snake following a Hamiltonian cycle never dies, so it can grow long
+    clock = GameClock()
+    snake = Snake(0, 0, (0, 255, 0))
+    food = Food(BOARD_WIDTH, BOARD_HEIGHT, rng=random.Random(0), clock=clock)
+    score_manager = ScoreManager(persistent=False)
+    obstacles = []
+    food.spawn_regular_food(snake.body, obstacles)
+    recorder = ReplayRecorder(snake, food, score_manager, obstacles, ThemeManager(clock), 0)
+    
+    record_time = 0.0
+    for tick in range(1, ticks + 1):
+        snake.direction = cycle_direction(snake.body[0], GRID_WIDTH, GRID_HEIGHT)
+        snake.move()
+        clock.time = tick * 80
+        food.update_bonus_food()
+        regular_eaten, bonus_eaten = food.check_food_eaten(snake.body[0])
+        if regular_eaten or bonus_eaten:
+            snake.grow()
+        if regular_eaten:
+            score_manager.add_regular_food_score()
+            if len(snake.body) < 1000:
+                food.spawn_regular_food(snake.body, obstacles)
+            if score_manager.should_spawn_bonus():
+                food.spawn_bonus_food(snake.body, obstacles)
+        if bonus_eaten:
+            score_manager.add_bonus_food_score()
+        start = time.perf_counter()
+        recorder.record_move(clock.time)
+        record_time += time.perf_counter() - start
+    replay = recorder.replay
+    print(f"  Record:        {record_time / ticks * 1e6:8.2f} us/tick "
+          f"(final length {len(snake.body)})")
+          
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'game.replay.npz')
+        start = time.perf_counter()
+        replay.save(path)
+        print(f"  Save:          {(time.perf_counter() - start) * 1000:8.2f} ms | "
+              f"{os.path.getsize(path) / ticks:.1f} bytes/tick")
+        start = time.perf_counter()
+        replay = Replay.load(path)
+        print(f"  Load:          {(time.perf_counter() - start) * 1000:8.2f} ms")
+        
+    rng = random.Random(1)
+    state = ReplayState()
+    times = []
+    for _ in range(seeks):
+        target = rng.randrange(ticks + 1)
+        start = time.perf_counter()
+        replay.seek(state, target)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"  Random seek:   {sum(times) / seeks * 1000:8.3f} ms mean | "
+          f"{times[-1] * 1000:.3f} ms max")
+          
+    # Without keyframes a seek replays every move from the start
+    start = time.perf_counter()
+    replay.restore(state, 0)
+    while state.tick < ticks:
+        replay.step(state)
+    print(f"  From tick 0:   {(time.perf_counter() - start) * 1000:8.1f} ms to the last tick")
+    
+    for speed in (0.25, 1, 64):
+        player = ReplayPlayer(replay)
+        player.set_speed(speed)
+        player.seek_time(replay.get_duration() / 2)
+        start = time.perf_counter()
+        for _ in range(600):
+            player.update(1000 / 60)
+        elapsed = (time.perf_counter() - start) / 600
+        print(f"  Playback {speed:>5g}x: {elapsed * 1e6:8.1f} us/frame")
+        
+def bench_leaderboard(entries=20000):
+    """Measure leaderboard submission cost and upload throughput."""
+    import tempfile
+    from managers.leaderboard_manager import LeaderboardManager
+    from leaderboard_server import LeaderboardServer
+    
+    print(f"🏆 Leaderboard Sync ({entries:,} submissions)")
+    print("=" * 50)
+    
+    entry = {'score': 0, 'player': 'Player', 'date': '2025-01-01T12:00:00',
+             'food_eaten': 0, 'bonus_eaten': 0}
+    for batch_size in (1, 10, 100):
+        server = LeaderboardServer().start()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = LeaderboardManager(server.url, temp_dir, batch_size=batch_size)
+            count = entries if batch_size > 1 else entries // 10
+            start = time.perf_counter()
+            for score in range(count):
+                client.submit('forest', dict(entry, score=score))
+            submit_time = time.perf_counter() - start
+            client.flush()
+            elapsed = time.perf_counter() - start
+            client.shutdown()
+        server.stop()
+        print(f"  Batch {batch_size:>3}: {count / elapsed:8.0f} entries/s | submit "
+              f"{submit_time / count * 1e6:5.1f} us | {server.stats['batches']} requests "
+              f"on {server.stats['connections']} connection(s)")
+              
+    # Queued offline, then a crash; the next start delivers everything once
+    server = LeaderboardServer().start()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        offline = LeaderboardManager(None, temp_dir)
+        for score in range(entries // 10):
+            offline.submit('sea', dict(entry, score=score))
+        server.fail_requests = 3
+        start = time.perf_counter()
+        client = LeaderboardManager(server.url, temp_dir, min_backoff=0.05)
+        client.flush()
+        elapsed = time.perf_counter() - start
+        client.shutdown()
+    server.stop()
+    print(f"  After crash: {len(server.entries):,}/{entries // 10:,} delivered in "
+          f"{elapsed * 1000:.0f} ms ({server.stats['failed']} failed requests retried)")
+          
+def bench_quality(frames=300):
+    """Measure a heavy frame (waves, particles, theme fade) at each quality tier."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from config import (GRID_WIDTH, GRID_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, BOARD_X, BOARD_Y,
+                       SCREEN_WIDTH, SCREEN_HEIGHT, THEMES, QUALITY_TIERS,
+                       QUALITY_FRAME_BUDGET_MS)
+    from components.snake import Snake
+    from components.food import Food
+    from components.game_clock import GameClock
+    from managers.theme_manager import ThemeManager
+    from managers.sprite_manager import SpriteManager
+    from managers.board_renderer import BoardRenderer
+    
+    print(f"🎚️ Quality Tiers ({frames} heavy frames, budget {QUALITY_FRAME_BUDGET_MS:.1f} ms)")
+    print("=" * 50)
+    
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    snake = Snake(0, 0, THEMES['sea']['snake_color'])
+    snake.body = serpentine_body(300, GRID_WIDTH, GRID_HEIGHT)
+    food = Food(BOARD_WIDTH, BOARD_HEIGHT)
+    food.regular_food = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+    
+    for quality in QUALITY_TIERS:
+        clock = GameClock()
+        theme_manager = ThemeManager(clock)
+        theme_manager.set_quality(quality)
+        theme_manager.current_theme = 'sea'
+        renderer = BoardRenderer(SpriteManager())
+        renderer.set_grid(quality['grid'])
+        particles = []
+        start = time.perf_counter()
+        for frame in range(frames):
+            clock.advance(1000 / 60)
+            if frame % 30 == 0:
+                # A burst of bonus pickups during a theme change
+                theme_manager.start_transition()
+                for _ in range(10):
+                    particles.extend(theme_manager.create_particle_effect((600, 400), 'bonus'))
+            theme_manager.update_transition()
+            theme_manager.update_particles(particles)
+            theme_manager.draw_background(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
+            renderer.draw(screen, BOARD_X, BOARD_Y, 'sea', snake, food, [])
+            theme_manager.draw_particles(screen, particles)
+        frame_ms = (time.perf_counter() - start) / frames * 1000
+        print(f"  {quality['name']:<8}: {frame_ms:6.2f} ms/frame "
+              f"({frame_ms / QUALITY_FRAME_BUDGET_MS:4.0%} of budget)")
+    pygame.quit()
+    
+def bench_renderers(frames=3000, frames_per_move=4):
+    """Measure frames per second and output bytes per frame of each renderer."""
+    import io
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from config import (GRID_WIDTH, GRID_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT,
+                       SCREEN_WIDTH, SCREEN_HEIGHT, THEMES)
+    from components.snake import Snake
+    from components.food import Food
+    from components.game_clock import GameClock
+    from managers.theme_manager import ThemeManager
+    from managers.score_manager import ScoreManager
+    from managers.sprite_manager import SpriteManager
+    from managers.board_renderer import BoardRenderer
+    from managers.ui_manager import UIManager
+    from renderers.renderer import Frame, NullRenderer
+    from renderers.pygame_renderer import PygameRenderer
+    from renderers.terminal_renderer import TerminalRenderer
+    
+    print(f"🖥️ Renderer Backends ({frames} frames, a move every {frames_per_move})")
+    print("=" * 50)
+    
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = GameClock()
+    theme_manager = ThemeManager(clock)
+    backends = [
+        ('pygame', PygameRenderer(screen, theme_manager, BoardRenderer(SpriteManager()),
+                                  UIManager(), clock)),
+        ('terminal', TerminalRenderer(io.BytesIO(), input_stream=False)),
+        ('null', NullRenderer()),
+    ]
+    for name, renderer in backends:
+        snake = Snake(0, 0, THEMES['forest']['snake_color'])
+        snake.body = serpentine_body(300, GRID_WIDTH, GRID_HEIGHT)
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=clock)
+        food.regular_food = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+        frame = Frame().update('forest', snake, food, [], ScoreManager())
+        start = time.perf_counter()
+        for i in range(frames):
+            if i % frames_per_move == 0:
+                snake.direction = cycle_direction(snake.body[0], GRID_WIDTH, GRID_HEIGHT)
+                snake.move()
+            renderer.render(frame)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<8}: {frames / elapsed:9.0f} FPS | "
+              f"{renderer.get_bytes_per_frame():9.1f} bytes/frame")
+    pygame.quit()
+    
+def bench_idle(seconds=2.0):
+    """Measure CPU use of the real main loop per screen, with and without idle mode."""
+    import tempfile
+    import threading
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from managers.game_manager import GameManager
+    
+    print(f"💤 Idle Screens (CPU share over {seconds:g} s of the main loop)")
+    print("=" * 50)
+    
+    def enter_state(game, state):
+        if state == 'scores':
+            game.ui_manager.setup_scores_menu(game.score_manager, game.theme_manager)
+        elif state == 'paused':
+            game.start_game()
+            game.state = 'paused'
+            game.game_clock.pause()
+        elif state == 'game_over':
+            game.start_game()
+            game.game_over()
+        elif state == 'playing':
+            game.start_game()
+            game.autopilot_enabled = True
+            
+    def cpu_share(state, theme, idle_mode):
+        game = GameManager()
+        game.idle_mode = idle_mode
+        game.theme_manager.current_theme = theme
+        enter_state(game, state)
+        game.sound_manager.ready.wait()  # Sound synthesis would count as idle CPU
+        timer = threading.Timer(seconds, pygame.event.post, (pygame.event.Event(pygame.QUIT),))
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        timer.start()
+        game.run()
+        return (time.process_time() - start_cpu) / (time.perf_counter() - start_wall)
+        
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Scores, history and replays go to the temporary data directory
+        os.chdir(temp_dir)
+        try:
+            for state, theme in (('menu', 'forest'), ('menu', 'sea'), ('scores', 'forest'),
+                                 ('game_over', 'forest'), ('paused', 'forest'),
+                                 ('playing', 'forest')):
+                before = cpu_share(state, theme, False)
+                after = cpu_share(state, theme, True)
+                print(f"  {state:<9} ({theme:<6}): {before:6.1%} CPU -> {after:6.1%} CPU")
+        finally:
+            os.chdir(cwd)
+            
+def bench_input(maneuvers=20000, move_delay=80, frame_ms=1000 / 60):
+    """Compare immediate direction changes with the input buffer on quick double turns."""
+    from components.snake import Snake
+    from components.input_buffer import InputBuffer
+    from config import INPUT_EARLY_TURN_FRACTION
+    
+    print(f"🎮 Input Handling ({maneuvers:,} quick U-turns, {move_delay} ms per move)")
+    print("=" * 50)
+    
+    # Each maneuver presses a side turn and then the way back, 20-60 ms apart
+    rng = random.Random(7)
+    presses = []
+    start = 0.0
+    for _ in range(maneuvers):
+        first = start + rng.uniform(0, move_delay)
+        presses.append((first, rng.random() < 0.5))
+        presses.append((first + rng.uniform(20, 60), None))
+        start = first + 3 * move_delay
+    end_time = start + move_delay
+    
+    for mode in ('immediate', 'buffered', 'early turns'):
+        snake = Snake(0, 0, (0, 255, 0))
+        buffer = InputBuffer(early_turns=mode == 'early turns')
+        heading = snake.direction  # Direction of the last move
+        reversals = 0
+        pending = []  # Immediate mode: press times waiting for the next move
+        latencies = []
+        last_move = 0.0
+        index = 0
+        now = 0.0
+        while now < end_time:
+            now += frame_ms
+            
+            # Presses reach the game at the start of a frame
+            while index < len(presses) and presses[index][0] <= now:
+                side = presses[index][1]
+                if side is None:
+                    direction = (-heading_before[0], -heading_before[1])
+                else:
+                    heading_before = snake.direction if mode == 'immediate' else heading
+                    direction = ((heading_before[1], heading_before[0]) if side else
+                                 (-heading_before[1], -heading_before[0]))
+                if mode == 'immediate':
+                    previous = snake.direction
+                    snake.change_direction(direction)
+                    if snake.direction != previous:
+                        pending.append(now)
+                else:
+                    buffer.push(direction, now)
+                index += 1
+                
+            while True:
+                move_time = last_move + move_delay
+                if buffer.early_turns:
+                    pressed = buffer.next_turn_time(snake.direction)
+                    if pressed is not None:
+                        early = last_move + move_delay * INPUT_EARLY_TURN_FRACTION
+                        move_time = min(move_time, max(early, pressed))
+                if now < move_time:
+                    break
+                last_move = move_time
+                if mode == 'immediate':
+                    latencies.extend(last_move - pressed for pressed in pending)
+                    pending = []
+                elif buffer.apply(snake, last_move):
+                    latencies.append(buffer.latencies[-1])
+                if snake.direction == (-heading[0], -heading[1]):
+                    reversals += 1  # Straight back into the neck
+                heading = snake.direction
+                
+        latencies.sort()
+        mean = sum(latencies) / len(latencies)
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"  {mode:<11}: {reversals / maneuvers:6.1%} of U-turns kill the snake | "
+              f"latency mean {mean:5.1f} ms, p95 {p95:5.1f} ms")
+              
+def bench_export(moves=600):
+    """Measure replay-to-video export speed against real time."""
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from managers.game_manager import GameManager
+    from config import EXPORT_FPS
+    
+    print(f"🎬 Video Export ({moves} autopilot moves at {EXPORT_FPS} FPS)")
+    print("=" * 50)
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            # Record an autopilot game, restarting after crashes
+            game = GameManager()
+            game.start_game()
+            game.autopilot_enabled = True
+            while len(game.replay_recorder.replay.moves) < moves:
+                game.game_clock.advance(game.move_delay)
+                game.update_game(0)
+                if game.state != 'playing':
+                    game.start_game()
+            replay = game.replay_recorder.replay
+            video_seconds = replay.get_duration() / 1000
+            
+            # An encoder that only drains its input measures the pipeline itself
+            encoder = os.path.join(temp_dir, 'drain.sh')
+            with open(encoder, 'w') as f:
+                f.write('#!/bin/sh\ncat > /dev/null\n')
+            os.chmod(encoder, 0o755)
+            
+            for label, path in (('raw to encoder', 'clip.mp4'), ('PNG sequence', 'clip')):
+                start = time.perf_counter()
+                writer = game.export_replay(replay, path, encoder=encoder)
+                elapsed = time.perf_counter() - start
+                print(f"  {label:<14}: {writer.frames / elapsed:6.0f} FPS | "
+                      f"{video_seconds / elapsed:5.1f}x real time")
+            game.cleanup()
+        finally:
+            os.chdir(cwd)
+            
+def bench_session(repeats=2000):
+    """Measure session save size, pack time and write time by snake length."""
+    import tempfile
+    from types import SimpleNamespace
+    from components.snake import Snake
+    from components.food import Food
+    from components.game_clock import GameClock
+    from managers.score_manager import ScoreManager
+    from managers.theme_manager import ThemeManager
+    from managers.session_manager import SessionManager
+    from config import BOARD_WIDTH, BOARD_HEIGHT, GRID_WIDTH, GRID_HEIGHT
+    
+    print(f"💾 Session Save ({repeats:,} saves per size)")
+    print("=" * 50)
+    
+    clock = GameClock()
+    food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=clock)
+    food.regular_food = (0, 0)
+    game = SimpleNamespace(snake=Snake(0, 0, (0, 255, 0)), food=food, obstacles=[],
+                           score_manager=ScoreManager(persistent=False),
+                           theme_manager=ThemeManager(clock), game_clock=clock,
+                           last_move_time=0.0, game_start_time=0.0)
+    cells = GRID_WIDTH * GRID_HEIGHT
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = SessionManager(os.path.join(temp_dir, 'session.bin'))
+        for length in (10, cells // 2, cells):
+            game.snake.body = serpentine_body(length, GRID_WIDTH, GRID_HEIGHT)
+            
+            start = time.perf_counter()
+            for _ in range(repeats):
+                data = manager.pack(game)
+            pack_ms = (time.perf_counter() - start) * 1000 / repeats
+            
+            start = time.perf_counter()
+            for _ in range(repeats):
+                manager.unpack(data)
+            unpack_ms = (time.perf_counter() - start) * 1000 / repeats
+            
+            start = time.perf_counter()
+            for _ in range(repeats // 10):
+                manager.save(data)
+            save_ms = (time.perf_counter() - start) * 10000 / repeats
+            print(f"  {length:>5} cells: {len(data):5,} bytes | pack {pack_ms:.3f} ms | "
+                  f"load {unpack_ms:.3f} ms | write {save_ms:.3f} ms (worker thread)")
+    print("  The game thread only packs; the worker writes the file")
+
+def bench_gc(frames=6000):
+    """Compare frame times and GC pauses with the default collector and GC control."""
+    import gc
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from managers.game_manager import GameManager, IDLE_STATES
+    from components.frame_stats import FrameStats
+    from components.gc_control import GCController
+    
+    print(f"🗑️ Garbage Collection ({frames:,} autopilot frames at 4x speed)")
+    print("=" * 50)
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            for label, enabled in (('default GC', False), ('GC control', True)):
+                gc.unfreeze()
+                gc.collect()
+                game = GameManager()
+                if not enabled:
+                    # Undo the startup freeze and only time the collector
+                    gc.unfreeze()
+                    game.gc_controller.shutdown()
+                    game.gc_controller = GCController(enabled=False)
+                controller = game.gc_controller
+                game.sound_manager.ready.wait(30)  # Synthesis would compete for the CPU
+                stats = FrameStats()
+                game.game_clock.set_scale(4.0)
+                game.start_game()
+                game.autopilot_enabled = True
+                for _ in range(frames):
+                    controller.set_active(True)
+                    start = time.perf_counter()
+                    controller.take_frame_pause()
+                    game.update(1 / 60)
+                    game.draw()
+                    stats.record((time.perf_counter() - start) * 1000, controller.take_frame_pause())
+                    if game.state != 'playing':
+                        # The game-over screen is the safe point
+                        controller.set_active(game.state not in IDLE_STATES)
+                        game.start_game()
+                        game.autopilot_enabled = True
+                        
+                result = stats.get_stats()
+                counts = list(controller.stats['collections'])
+                
+                # What a full collection would cost in the middle of play
+                start = time.perf_counter()
+                gc.collect()
+                full_ms = (time.perf_counter() - start) * 1000
+                
+                print(f"  {label}: p50 {result['p50']:.2f} ms | p99 {result['p99']:.2f} ms | "
+                      f"max {result['max']:.2f} ms")
+                print(f"    in-frame collections (gen0/1/2): {counts[0]}/{counts[1]}/{counts[2]} | "
+                      f"GC time {result['gc_total']:.1f} ms, longest {result['gc_max']:.2f} ms")
+                print(f"    frames over budget: {result['spikes']}, "
+                      f"{result['gc_spikes']} of them with a collection")
+                print(f"    safe-point collections: {controller.stats['safe_collections']} "
+                      f"({controller.stats['safe_pause_ms']:.1f} ms) | "
+                      f"one full collection: {full_ms:.2f} ms")
+                game.cleanup()
+        finally:
+            os.chdir(cwd)
+            gc.unfreeze()
+
+def bench_tuner(population=16, games=4):
+    """Measure one tuner generation on 1, 2 and 4 worker processes."""
+    import random
+    import tempfile
+    from ai.tuner import HeuristicTuner
+    
+    print(f"🧬 Bot Tuner ({population} weight vectors x {games} games per generation)")
+    print("=" * 50)
+    
+    base_ms = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for workers in (1, 2, 4):
+            tuner = HeuristicTuner(seed=1, population=population, games=games, workers=workers,
+                                   directory=temp_dir, log=lambda message: None)
+            try:
+                rng = random.Random(1)
+                starts = tuner.make_starts('snow', rng)
+                population_weights = tuner.initial_population(rng)
+                tuner.evaluate(population_weights, starts, random.Random(0))  # Start the workers
+                start = time.perf_counter()
+                fitness = tuner.evaluate(population_weights, starts, random.Random(0))
+                generation_ms = (time.perf_counter() - start) * 1000
+            finally:
+                tuner.shutdown()
+            base_ms = base_ms or generation_ms
+            print(f"  {workers} worker(s): {generation_ms:7.1f} ms per generation "
+                  f"({base_ms / generation_ms:.2f}x) | best {max(fitness):.3f}")
+    print(f"  {os.cpu_count()} core(s) available; the speedup is bounded by the core count")
+
+def bench_compositing(frames=600):
+    """Measure frame render time drawn in turn and as parallel layers, on 1, 2 and 4 cores."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from config import (SCREEN_WIDTH, SCREEN_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, GRID_WIDTH,
+                       GRID_HEIGHT, THEMES)
+    from renderers.renderer import Frame
+    from renderers.pygame_renderer import PygameRenderer
+    from managers.theme_manager import ThemeManager
+    from managers.board_renderer import BoardRenderer
+    from managers.sprite_manager import SpriteManager
+    from managers.ui_manager import UIManager
+    from managers.score_manager import ScoreManager
+    from components.snake import Snake
+    from components.food import Food
+    from components.game_clock import GameClock
+    from components.distance_field import DistanceField
+    
+    print(f"🧩 Layer Compositing ({frames} frames with particles)")
+    print("=" * 50)
+    
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = GameClock()
+    snake = Snake(0, 0, THEMES['sea']['snake_color'])
+    snake.body = serpentine_body(GRID_WIDTH * GRID_HEIGHT // 4, GRID_WIDTH, GRID_HEIGHT)
+    food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=clock)
+    food.regular_food = (30, 25)
+    obstacles = [(5, 25), (20, 20), (30, 28)]
+    field = DistanceField()
+    field.reset(snake.body, obstacles, (food.regular_food, None))
+    theme_manager = ThemeManager(clock)
+    particles = (theme_manager.create_particle_effect((500, 400)) +
+                 theme_manager.create_particle_effect((700, 300), 'bonus'))
+    frame = Frame().update('forest', snake, food, obstacles, ScoreManager(persistent=False),
+                           particles, field)
+    
+    def frame_ms(threads):
+        renderer = PygameRenderer(screen, theme_manager, BoardRenderer(SpriteManager()),
+                                  UIManager(), clock, threads=threads)
+        try:
+            for _ in range(30):
+                renderer.render(frame)
+            start = time.perf_counter()
+            for _ in range(frames):
+                clock.advance(1000 / 60)
+                renderer.render(frame)
+            return (time.perf_counter() - start) / frames * 1000
+        finally:
+            renderer.close()
+            
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else None
+    try:
+        for cores in (1, 2, 4):
+            if available is not None:
+                if cores > len(available):
+                    print(f"  {cores} cores: skipped, {len(available)} available")
+                    continue
+                os.sched_setaffinity(0, available[:cores])
+            for theme in ('forest', 'sea'):  # Still and animated backgrounds
+                theme_manager.set_theme(theme)
+                frame.theme = theme
+                in_turn_ms = frame_ms(0)
+                layered_ms = frame_ms(3)
+                print(f"  {cores} core(s), {theme:6}: in turn {in_turn_ms:6.3f} ms | "
+                      f"3 layer threads {layered_ms:6.3f} ms ({in_turn_ms / layered_ms:.2f}x)")
+    finally:
+        if available is not None:
+            os.sched_setaffinity(0, available)
+    pygame.quit()
+
+BENCHMARKS = {
+    'env': bench_environment,
+    'bitboard': bench_bitboard,
+    'snapshot': bench_snapshots,
+    'mcts': bench_mcts,
+    'render': bench_rendering,
+    'audio': bench_audio,
+    'history': bench_history,
+    'heatmap': bench_heatmap,
+    'replay': bench_replay,
+    'leaderboard': bench_leaderboard,
+    'quality': bench_quality,
+    'renderers': bench_renderers,
+    'idle': bench_idle,
+    'input': bench_input,
+    'export': bench_export,
+    'session': bench_session,
+    'gc': bench_gc,
+    'tuner': bench_tuner,
+    'compositing': bench_compositing,
+}
+
+def main():
+    """Run the benchmarks named on the command line, or all of them."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+            return False
+        BENCHMARKS[name]()
+        print()
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
\ No newline at end of file
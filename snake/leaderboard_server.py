@@ -0,0 +1,152 @@
+"""
+Stand-in leaderboard server for Snake Odyssey.
+Collects scores from game clients, for tests, benchmarks and local setups.
+
+Usage:
+    python leaderboard_server.py [port]
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+class LeaderboardServer:
+    """In-memory leaderboard behind a small keep-alive HTTP API.
+    
+    POST /scores takes {"entries": [...]} and answers {"accepted": n};
+    entries are deduplicated by their id. GET /leaderboard?theme=&limit=
+    returns the best entries and GET /stats the request counters. Setting
+    fail_requests makes that many following requests fail with 503.
+    """
+    
+    def __init__(self, host='127.0.0.1', port=0):
+        """Initialize server; port 0 picks a free port."""
+        self.entries = {}  # id -> entry
+        self.lock = threading.Lock()
+        self.fail_requests = 0
+        self.stats = {'connections': 0, 'requests': 0, 'batches': 0,
+                      'accepted': 0, 'duplicates': 0, 'failed': 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+        
+    @property
+    def url(self):
+        """Get the base URL clients should use."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+        
+    def start(self):
+        """Serve on a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+        
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        
+    def add_entries(self, entries):
+        """Store entries not seen before; returns (accepted, duplicates)."""
+        accepted = 0
+        with self.lock:
+            for entry in entries:
+                if entry['id'] not in self.entries:
+                    self.entries[entry['id']] = entry
+                    accepted += 1
+            self.stats['batches'] += 1
+            self.stats['accepted'] += accepted
+            self.stats['duplicates'] += len(entries) - accepted
+        return accepted, len(entries) - accepted
+        
+    def get_top(self, theme=None, limit=10):
+        """Get the best entries, optionally of one theme."""
+        with self.lock:
+            entries = [e for e in self.entries.values() if theme is None or e['theme'] == theme]
+        entries.sort(key=lambda e: e['score'], reverse=True)
+        return entries[:limit]
+        
+    def _make_handler(self):
+        """Build the request handler class bound to this server."""
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep connections alive
+            disable_nagle_algorithm = True  # Headers and body are written separately
+            
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.stats['connections'] += 1
+                    
+            def log_message(self, format, *args):
+                pass
+                
+            def send_json(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                
+            def should_fail(self):
+                with server.lock:
+                    server.stats['requests'] += 1
+                    if server.fail_requests > 0:
+                        server.fail_requests -= 1
+                        server.stats['failed'] += 1
+                        return True
+                return False
+                
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.should_fail():
+                    self.send_json(503, {'error': 'unavailable'})
+                elif urlsplit(self.path).path != '/scores':
+                    self.send_json(404, {'error': 'not found'})
+                else:
+                    try:
+                        entries = json.loads(body)['entries']
+                        accepted, duplicates = server.add_entries(entries)
+                    except (ValueError, KeyError, TypeError):
+                        self.send_json(400, {'error': 'bad entries'})
+                        return
+                    self.send_json(200, {'accepted': accepted, 'duplicates': duplicates})
+                    
+            def do_GET(self):
+                if self.should_fail():
+                    self.send_json(503, {'error': 'unavailable'})
+                    return
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                if parts.path == '/leaderboard':
+                    theme = query.get('theme', [None])[0]
+                    limit = int(query.get('limit', ['10'])[0])
+                    self.send_json(200, {'entries': server.get_top(theme, limit)})
+                elif parts.path == '/stats':
+                    with server.lock:
+                        stats = dict(server.stats, entries=len(server.entries))
+                    self.send_json(200, stats)
+                else:
+                    self.send_json(404, {'error': 'not found'})
+                    
+        return Handler
+
+def main():
+    """Run the stand-in server until interrupted."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = LeaderboardServer('0.0.0.0', port)
+    print(f"🏆 Leaderboard server listening on port {port}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
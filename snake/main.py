@@ -3,6 +3,7 @@ Snake Odyssey: Themed Evolution
 A modern, theme-based Snake game with progressive difficulty and dynamic visuals.
 """
 
+import argparse
 import pygame
 import sys
 import os
@@ -11,16 +12,68 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from managers.game_manager import GameManager
+from components.classic_game import pick_speed_level
+from components.replay import Replay
+
+RENDERERS = ('pygame', 'terminal', 'null')
+
+def parse_args(argv=None):
+    """Parse the command line; unknown options and invalid combinations exit with usage."""
+    parser = argparse.ArgumentParser(description="Snake Odyssey: Themed Evolution")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--classic', action='store_true',
+                      help="play the original game, starting with its speed level picker")
+    mode.add_argument('--replay', metavar='FILE',
+                      help="open a recorded game in the replay viewer")
+    parser.add_argument('--export', metavar='OUT',
+                        help="render the --replay game to a video instead of showing it")
+    parser.add_argument('--renderer', choices=RENDERERS,
+                        help="output backend; the others need no window, so SSH "
+                             "sessions work without a display")
+    args = parser.parse_args(argv)
+    if args.export and not args.replay:
+        parser.error("--export needs --replay FILE")
+    return args
 
 def main():
     """Main entry point for Snake Odyssey game."""
+    # Parsed first: a usage error must exit with its own status
+    args = parse_args()
     try:
+        classic_level = None
+        if args.classic:
+            classic_level = pick_speed_level()
+            if classic_level is None:
+                return
+                
+        if args.renderer not in (None, 'pygame'):
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        if args.export:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+            
         # Initialize pygame
         pygame.init()
         pygame.mixer.init()
         
+        replay = Replay.load(args.replay) if args.replay else None
+        
         # Create and run the game
-        game = GameManager()
+        game = GameManager(args.renderer)
+        if args.export:
+            writer = game.export_replay(replay, args.export)
+            print(f"🎬 Exported {writer.frames} frames to {writer.path}")
+            game.cleanup()
+            return
+        if classic_level:
+            game.classic_standalone = True
+            game.start_classic(classic_level)
+        elif replay:
+            game.start_replay(replay)
+        elif game.resume_session():
+            pass  # The interrupted game comes back paused; P continues it
+        elif not game.renderer.draws_menus:
+            game.start_game()
         game.run()
         
     except Exception as e:
@@ -0,0 +1,2 @@
+# Snake Odyssey: Themed Evolution
+# AI modules
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Autopilot controller for the Snake Odyssey game.
+"""
+
+from config import DIRECTIONS
+
+class Autopilot:
+    """Steers the snake along the distance field towards food."""
+    
+    def __init__(self, distance_field):
+        """Initialize autopilot."""
+        self.distance_field = distance_field
+        
+    def choose_direction(self, snake):
+        """Pick the next direction for the snake."""
+        head = snake.get_head_position()
+        reverse = (-snake.direction[0], -snake.direction[1])
+        
+        direction = self.distance_field.next_step_to_food(head)
+        if direction is not None and direction != reverse:
+            return direction
+            
+        # No path to food: stay on any open cell, preferring straight ahead
+        field = self.distance_field
+        candidates = [snake.direction] + list(DIRECTIONS.values())
+        for candidate in candidates:
+            if candidate == reverse:
+                continue
+            cell = (head[0] + candidate[0], head[1] + candidate[1])
+            if field.in_bounds(cell) and not field.blocked[field.index(cell)]:
+                return candidate
+        return snake.direction
@@ -0,0 +1,235 @@
+"""
+Reinforcement-learning environment for the Snake Odyssey game.
+"""
+
+import random
+import numpy as np
+from config import (BOARD_WIDTH, BOARD_HEIGHT, GRID_WIDTH, GRID_HEIGHT,
+                   DIRECTIONS, BASE_MOVE_DELAY, MIN_MOVE_DELAY)
+from components.snake import Snake
+from components.food import Food
+from components.obstacle_placer import ObstaclePlacer
+from managers.score_manager import ScoreManager
+
+# Actions index the absolute directions
+ACTIONS = list(DIRECTIONS.values())
+
+# Observation channels
+BODY, HEAD, FOOD, BONUS, OBSTACLE = range(5)
+NUM_CHANNELS = 5
+
+class OccupiedCells:
+    """Membership view over the body and obstacle observation channels."""
+    
+    def __init__(self, obs):
+        """Initialize view."""
+        self.body = obs[BODY]
+        self.obstacles = obs[OBSTACLE]
+        
+    def __contains__(self, cell):
+        return bool(self.body[cell[1], cell[0]] or self.obstacles[cell[1], cell[0]])
+
+class SnakeEnv:
+    """Gym-style environment running the game rules without a display.
+    
+    Observations are uint8 grids of shape (NUM_CHANNELS, height, width).
+    step() updates the same buffer in place and returns it, so callers
+    that keep observations across steps must copy them.
+    """
+    
+    def __init__(self, max_steps=10000, starve_steps=None, obs_buffer=None):
+        """Initialize environment."""
+        self.grid_width = GRID_WIDTH
+        self.grid_height = GRID_HEIGHT
+        self.max_steps = max_steps
+        self.starve_steps = starve_steps or GRID_WIDTH * GRID_HEIGHT
+        
+        if obs_buffer is None:
+            obs_buffer = np.zeros((NUM_CHANNELS, GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+        self.obs = obs_buffer
+        self.occupied = OccupiedCells(self.obs)
+        
+        self.rng = random.Random()
+        self.score_manager = ScoreManager(persistent=False)
+        self.obstacle_placer = ObstaclePlacer(rng=self.rng)
+        self.snake = None
+        self.food = None
+        self.obstacles = []
+        self.steps = 0
+        self.steps_since_food = 0
+        self.sim_time = 0.0  # seconds, advanced by move_delay per step
+        self.info = {'score': 0, 'length': 1, 'death': None}
+        
+    def reset(self, seed=None):
+        """Start a new episode and return (observation, info)."""
+        if seed is not None:
+            self.rng.seed(seed)
+        self.score_manager.reset_score()
+        self.steps = 0
+        self.steps_since_food = 0
+        self.sim_time = 0.0
+        
+        self.snake = Snake(GRID_WIDTH // 2, GRID_HEIGHT // 2, None)
+        self.food = Food(BOARD_WIDTH, BOARD_HEIGHT, rng=self.rng)
+        self.obstacles = []
+        self.obstacle_placer.reset(self.snake.body)
+        
+        obs = self.obs
+        obs.fill(0)
+        head = self.snake.get_head_position()
+        obs[BODY, head[1], head[0]] = 1
+        obs[HEAD, head[1], head[0]] = 1
+        self._spawn_regular_food()
+        
+        self.info['score'] = 0
+        self.info['length'] = 1
+        self.info['death'] = None
+        return obs, self.info
+        
+    def step(self, action):
+        """Advance one tick; returns (obs, reward, terminated, truncated, info)."""
+        obs = self.obs
+        snake = self.snake
+        score_manager = self.score_manager
+        
+        snake.change_direction(ACTIONS[action])
+        old_head = snake.body[0]
+        tail = snake.move()
+        head = snake.body[0]
+        x, y = head
+        
+        self.steps += 1
+        self.steps_since_food += 1
+        delay = max(MIN_MOVE_DELAY, int(BASE_MOVE_DELAY / score_manager.get_speed_multiplier()))
+        self.sim_time += delay / 1000.0
+        
+        # Vacate the tail first: moving into it is legal
+        if tail is not None:
+            obs[BODY, tail[1], tail[0]] = 0
+        obs[HEAD, old_head[1], old_head[0]] = 0
+        
+        if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
+            return self._terminate('wall')
+        if obs[OBSTACLE, y, x]:
+            return self._terminate('obstacle')
+        if obs[BODY, y, x]:
+            return self._terminate('self')
+            
+        obs[BODY, y, x] = 1
+        obs[HEAD, y, x] = 1
+        self.obstacle_placer.advance(head, tail)
+        
+        reward = 0.0
+        regular_eaten, bonus_eaten = self.food.check_food_eaten(head)
+        if regular_eaten:
+            obs[FOOD, y, x] = 0
+            snake.grow()
+            score_manager.add_regular_food_score()
+            reward += 1.0
+            if not self._spawn_regular_food():
+                return self._terminate(None, reward)
+            if score_manager.should_spawn_bonus():
+                self._spawn_bonus_food()
+                
+        if bonus_eaten:
+            obs[BONUS, y, x] = 0
+            snake.grow()
+            score_manager.add_bonus_food_score()
+            reward += 2.0
+            
+        if regular_eaten or bonus_eaten:
+            self.steps_since_food = 0
+            self._update_obstacles()
+            
+        # Bonus food expires on simulated time
+        bonus = self.food.bonus_food
+        if bonus is not None:
+            self.food.update_bonus_food(now=self.sim_time)
+            if self.food.bonus_food is None:
+                obs[BONUS, bonus[1], bonus[0]] = 0
+                
+        self.info['score'] = score_manager.current_score
+        self.info['length'] = len(snake.body)
+        truncated = (self.steps >= self.max_steps or
+                     self.steps_since_food >= self.starve_steps)
+        return obs, reward, False, truncated, self.info
+        
+    def _terminate(self, cause, reward=-1.0):
+        """End the episode; cause is None when the board is full."""
+        self.info['score'] = self.score_manager.current_score
+        self.info['length'] = len(self.snake.body)
+        self.info['death'] = cause
+        return self.obs, reward, True, False, self.info
+        
+    def _spawn_regular_food(self):
+        """Spawn regular food; returns False when no free cell is left."""
+        free = self.obstacle_placer.get_free_count()
+        if self.food.bonus_food is not None:
+            free -= 1
+        if free <= 0:
+            return False
+        self.food.spawn_regular_food(self.occupied, (self.food.bonus_food,))
+        food = self.food.regular_food
+        self.obs[FOOD, food[1], food[0]] = 1
+        return True
+        
+    def _spawn_bonus_food(self):
+        """Spawn (or move) bonus food if a free cell is left."""
+        if self.obstacle_placer.get_free_count() < 2:
+            return
+        bonus = self.food.bonus_food
+        if bonus is not None:
+            self.obs[BONUS, bonus[1], bonus[0]] = 0
+        self.food.spawn_bonus_food(self.occupied, (), now=self.sim_time)
+        bonus = self.food.bonus_food
+        self.obs[BONUS, bonus[1], bonus[0]] = 1
+        
+    def _update_obstacles(self):
+        """Add obstacles as the score crosses obstacle milestones."""
+        target_count = self.score_manager.get_obstacle_count()
+        head = self.snake.body[0]
+        blocked = (self.food.regular_food, self.food.bonus_food)
+        while len(self.obstacles) < target_count:
+            pos = self.obstacle_placer.place(head, blocked)
+            if pos is None:
+                break
+            self.obstacles.append(pos)
+            self.obs[OBSTACLE, pos[1], pos[0]] = 1
+
+class VecSnakeEnv:
+    """Steps many SnakeEnv instances together over shared buffers.
+    
+    Finished environments are reset automatically; the observation then
+    shows the first state of the new episode.
+    """
+    
+    def __init__(self, num_envs, **env_kwargs):
+        """Initialize vectorized environment."""
+        self.num_envs = num_envs
+        self.obs = np.zeros((num_envs, NUM_CHANNELS, GRID_HEIGHT, GRID_WIDTH),
+                            dtype=np.uint8)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.envs = [SnakeEnv(obs_buffer=self.obs[i], **env_kwargs)
+                     for i in range(num_envs)]
+                     
+    def reset(self, seed=None):
+        """Reset every environment; env i is seeded with seed + i."""
+        for i, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + i)
+        return self.obs
+        
+    def step(self, actions):
+        """Step all environments; returns (obs, rewards, terminated, truncated)."""
+        rewards = self.rewards
+        terminated = self.terminated
+        truncated = self.truncated
+        for i, env in enumerate(self.envs):
+            _, reward, done, cut, _ = env.step(actions[i])
+            rewards[i] = reward
+            terminated[i] = done
+            truncated[i] = cut
+            if done or cut:
+                env.reset()
+        return self.obs, rewards, terminated, truncated
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Weighted heuristic controller for the Snake Odyssey game.
+"""
+
+import json
+import os
+from config import DATA_DIR, BOT_WEIGHTS, BOT_WEIGHTS_FILE, THEMES, DIFFICULTY_MILESTONE
+from components.bitboard import popcount
+
+# Board features of a move, in the order weight vectors use
+FEATURES = ('free_space', 'tail_distance', 'food_distance')
+
+# Mix mode shows the themes in this order, one per difficulty level
+THEME_ORDER = tuple(THEMES)
+
+def get_level_theme(level):
+    """Get the theme mix mode shows at a difficulty level."""
+    return THEME_ORDER[level % len(THEME_ORDER)]
+
+def get_theme_levels(theme, max_levels):
+    """Get the difficulty levels below max_levels at which mix mode shows a theme."""
+    return list(range(THEME_ORDER.index(theme), max_levels, len(THEME_ORDER)))
+
+def get_score_theme(score):
+    """Get the theme mix mode shows at a score."""
+    return get_level_theme(score // DIFFICULTY_MILESTONE)
+
+def to_vector(weights):
+    """Convert a {feature: weight} dict to a weight tuple in FEATURES order."""
+    return tuple(float(weights[feature]) for feature in FEATURES)
+
+def to_dict(vector):
+    """Convert a weight tuple in FEATURES order to a {feature: weight} dict."""
+    return dict(zip(FEATURES, vector))
+
+def move_features(state, direction):
+    """Get the features of moving a GameState in a direction, or None if the move is fatal.
+    
+    One flood fill from the new head, one distance layer per step, gives
+    all three: the free cells it can reach, and its distances to the tail
+    (which moves out of the way) and to the food. Each is a fraction of
+    the board area; an unreachable target counts as a whole board away.
+    """
+    board = state.board
+    head = state.head.cell
+    new_head = (head[0] + direction[0], head[1] + direction[1])
+    head_bit = board.bit(new_head)
+    if not head_bit:
+        return None
+        
+    # The body after the move: the tail vacates unless the snake grows
+    body = state.body_mask
+    if state.grow_pending:
+        tail = state.tail_cell()
+    else:
+        body &= ~board.bit(state.tail_cell())
+        if state.length > 1:
+            tail = state.head.ancestor(state.head.depth - state.length + 2).cell
+        else:
+            tail = new_head
+    if (body | state.obstacle_mask) & head_bit:
+        return None
+    body |= head_bit
+    
+    tail_bit = board.bit(tail)
+    food_bit = board.bit(state.food) if state.food is not None else 0
+    passable = board.free_mask(body, state.obstacle_mask) | tail_bit
+    area = board.grid_width * board.grid_height
+    tail_distance = food_distance = area
+    region = head_bit
+    distance = 0
+    while True:
+        if region & tail_bit and tail_distance == area:
+            tail_distance = distance
+        if region & food_bit and food_distance == area:
+            food_distance = distance
+        grown = region | (board.neighbours(region) & passable)
+        if grown == region:
+            break
+        region = grown
+        distance += 1
+    free_space = popcount(region) - 1  # Not counting the head
+    return (free_space / area, tail_distance / area, food_distance / area)
+
+class HeuristicBot:
+    """Picks the move with the best weighted sum of board features.
+    
+    Weights are kept per theme, as tuned by ai.tuner for the difficulty
+    levels at which mix mode shows that theme; themes without tuned
+    weights use the defaults. Only the direction of a weight vector
+    matters, so tuned vectors are scaled to a magnitude sum of 1.
+    """
+    
+    def __init__(self, weights=BOT_WEIGHTS, theme_weights=None):
+        """Initialize bot with default weights and optional {theme: weights} overrides."""
+        self.weights = to_vector(weights)
+        self.theme_weights = {theme: to_vector(theme_weights[theme])
+                              for theme in (theme_weights or {})}
+                              
+    @classmethod
+    def load(cls, path=None):
+        """Create a bot with the tuned weights saved at path, if there are any."""
+        path = path or os.path.join(DATA_DIR, BOT_WEIGHTS_FILE)
+        try:
+            with open(path, 'r') as f:
+                tuned = json.load(f)
+            return cls(theme_weights={theme: entry['weights'] for theme, entry in tuned.items()
+                                      if theme in THEMES})
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading bot weights: {e}")
+            return cls()
+            
+    def get_weights(self, theme=None):
+        """Get the weight vector used for a theme."""
+        return self.theme_weights.get(theme, self.weights)
+        
+    def choose_direction(self, state, theme=None):
+        """Pick the next direction for a GameState, weighted for theme."""
+        weights = self.get_weights(theme)
+        best = None
+        best_value = None
+        for direction in state.legal_directions():
+            features = move_features(state, direction)
+            if features is None:
+                continue
+            value = sum(weight * feature for weight, feature in zip(weights, features))
+            if best is None or value > best_value:
+                best = direction
+                best_value = value
+        return best if best is not None else state.direction
\ No newline at end of file
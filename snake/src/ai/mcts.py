@@ -0,0 +1,207 @@
+"""
+Monte-Carlo tree search controller for the Snake Odyssey game.
+"""
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import SCORE_PER_FOOD, MCTS_WORKERS, MCTS_TIME_FRACTION
+from components.game_state import GameState
+
+DEATH_PENALTY = 3.0  # in units of regular food
+GREEDY_ROLLOUT_RATE = 0.8  # share of rollout moves that head for food
+DISCOUNT = 0.95  # per-move weight, so earlier food is worth more
+
+class SearchNode:
+    """Statistics of one action sequence in an open-loop search tree."""
+    
+    __slots__ = ('children', 'visits', 'value')
+    
+    def __init__(self):
+        """Initialize node."""
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+def safe_directions(state):
+    """Get legal directions that do not hit a wall, obstacle or the body."""
+    head = state.head.cell
+    return [d for d in state.legal_directions()
+            if not state.is_blocked((head[0] + d[0], head[1] + d[1]))]
+
+def rollout(state, rng, depth, discount=DISCOUNT):
+    """Play a heuristic rollout; returns discounted food units gained."""
+    gained = 0.0
+    weight = 1.0
+    for _ in range(depth):
+        if not state.alive:
+            break
+        options = safe_directions(state)
+        if not options:
+            state.step()  # Trapped: let the rules kill the snake
+            break
+        food = state.food
+        if food is not None and rng.random() < GREEDY_ROLLOUT_RATE:
+            head = state.head.cell
+            direction = min(options, key=lambda d: abs(head[0] + d[0] - food[0]) +
+                                                   abs(head[1] + d[1] - food[1]))
+        else:
+            direction = rng.choice(options)
+        weight *= discount
+        gained += weight * state.step(direction) / SCORE_PER_FOOD
+    return gained
+
+def evaluate(state):
+    """Estimate a surviving leaf as the discounted value of the next food."""
+    food = state.food
+    if food is None:
+        return 0.0
+    head = state.head.cell
+    return DISCOUNT ** (abs(head[0] - food[0]) + abs(head[1] - food[1]))
+
+def search(compact_state, seed, budget, rollout_depth=10, exploration=1.0, iterations=None):
+    """Run open-loop UCT for budget seconds, or for a number of iterations.
+    
+    Every iteration restores the root snapshot and replays the tree path,
+    so food spawns are resampled. A fixed iteration count makes the result
+    depend on the seed alone. Returns ([(direction, visits, value)],
+    rollout count). This is the worker entry point and must stay picklable.
+    """
+    rng = random.Random(seed)
+    state = GameState.from_compact(compact_state, rng=rng)
+    root_snapshot = state.snapshot()
+    root = SearchNode()
+    deadline = time.perf_counter() + budget
+    rollouts = 0
+    
+    while True:
+        state.restore(root_snapshot)
+        node = root
+        path = [root]
+        reward = 0.0
+        
+        # Selection and expansion
+        while state.alive:
+            actions = state.legal_directions()
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                child = node.children[action] = SearchNode()
+                reward += state.step(action) / SCORE_PER_FOOD
+                path.append(child)
+                break
+            log_visits = math.log(node.visits)
+            action = max(actions, key=lambda a: (
+                node.children[a].value / node.children[a].visits +
+                exploration * math.sqrt(log_visits / node.children[a].visits)))
+            reward += state.step(action) / SCORE_PER_FOOD
+            node = node.children[action]
+            path.append(node)
+            
+        reward += rollout(state, rng, rollout_depth)
+        if state.alive:
+            reward += evaluate(state)
+        elif state.death_cause != 'full':
+            reward -= DEATH_PENALTY
+            
+        for visited in path:
+            visited.visits += 1
+            visited.value += reward
+        rollouts += 1
+        
+        if rollouts == iterations or (iterations is None and time.perf_counter() >= deadline):
+            break
+            
+    stats = [(action, child.visits, child.value) for action, child in root.children.items()]
+    return stats, rollouts
+
+class MCTSController:
+    """Root-parallel MCTS that searches in worker processes between moves.
+    
+    start_search() submits one independent search per worker and returns
+    at once. best_direction() merges whatever results have arrived into
+    the root statistics without waiting, so the render loop never blocks.
+    """
+    
+    def __init__(self, workers=MCTS_WORKERS, time_fraction=MCTS_TIME_FRACTION,
+                 rollout_depth=10, seed=None, iterations=None):
+        """Initialize controller; workers=0 searches in-process, iterations fixes the work."""
+        self.workers = workers
+        self.time_fraction = time_fraction
+        self.rollout_depth = rollout_depth
+        self.iterations = iterations
+        self.rng = random.Random(seed)
+        self.executor = None
+        self.pending = []
+        self.stats = {}
+        self.rollouts = 0
+        
+    def start_search(self, state, move_delay):
+        """Search the move after state within a share of move_delay ms."""
+        for future in self.pending:
+            future.cancel()
+        self.pending = []
+        self.stats = {}
+        self.rollouts = 0
+        
+        budget = move_delay / 1000.0 * self.time_fraction
+        compact_state = state.to_compact()
+        if self.workers == 0:
+            self._merge(search(compact_state, self.rng.getrandbits(32), budget,
+                               self.rollout_depth, iterations=self.iterations))
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            for _ in range(self.workers):
+                self.pending.append(self.executor.submit(
+                    search, compact_state, self.rng.getrandbits(32), budget,
+                    self.rollout_depth, iterations=self.iterations))
+        
+    def poll(self):
+        """Merge finished worker results without blocking."""
+        still_running = []
+        for future in self.pending:
+            if future.done():
+                if not future.cancelled() and future.exception() is None:
+                    self._merge(future.result())
+            else:
+                still_running.append(future)
+        self.pending = still_running
+        
+    def wait(self):
+        """Block until all workers of the current search have reported."""
+        for future in self.pending:
+            self._merge(future.result())
+        self.pending = []
+        
+    def _merge(self, result):
+        """Add one search's root statistics to the merged root."""
+        stats, rollouts = result
+        for action, visits, value in stats:
+            total_visits, total_value = self.stats.get(action, (0, 0.0))
+            self.stats[action] = (total_visits + visits, total_value + value)
+        self.rollouts += rollouts
+        
+    def best_direction(self):
+        """Get the most visited root action so far, or None."""
+        self.poll()
+        if not self.stats:
+            return None
+        return max(self.stats, key=lambda action: self.stats[action][0])
+        
+    def decide(self, state, move_delay):
+        """Search synchronously and return the chosen direction."""
+        self.start_search(state, move_delay)
+        self.wait()
+        return self.best_direction()
+        
+    def shutdown(self):
+        """Stop the worker processes."""
+        searching = any(not future.cancel() and not future.done() for future in self.pending)
+        self.pending = []
+        if self.executor is not None:
+            # Idle workers stop at once; not waiting for them leaves the
+            # pool's wakeup pipe to a race with interpreter exit
+            self.executor.shutdown(wait=not searching)
+            self.executor = None
\ No newline at end of file
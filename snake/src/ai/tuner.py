@@ -0,0 +1,268 @@
+"""
+Evolutionary tuner for the heuristic bot's weights.
+"""
+
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from config import (DATA_DIR, TUNER_DIR, BOT_WEIGHTS, BOT_WEIGHTS_FILE, TUNER_POPULATION,
+                   TUNER_GENERATIONS, TUNER_GAMES, TUNER_LEVELS, TUNER_MAX_MOVES, TUNER_ELITE,
+                   TUNER_MUTATION, TUNER_WORKERS, GRID_WIDTH, GRID_HEIGHT, DIFFICULTY_MILESTONE)
+from components.game_state import GameState
+from ai.heuristic import HeuristicBot, FEATURES, to_vector, to_dict, get_theme_levels
+
+START_ATTEMPTS = 20  # games tried to reach a level before giving up on a seed
+TOURNAMENT_SIZE = 3
+
+def play(state, weights, max_moves, target_score=None):
+    """Let a bot with the weight vector play a GameState; returns the moves made.
+    
+    Stops at death, at target_score, after max_moves, or when the snake
+    has gone a board area's worth of moves without eating.
+    """
+    bot = HeuristicBot(to_dict(weights))
+    starve_moves = GRID_WIDTH * GRID_HEIGHT
+    moves = 0
+    since_food = 0
+    while state.alive and moves < max_moves and since_food < starve_moves:
+        if target_score is not None and state.score_manager.current_score >= target_score:
+            break
+        points = state.step(bot.choose_direction(state))
+        moves += 1
+        since_food = 0 if points else since_food + 1
+    return moves
+
+def make_start(level, seed, max_moves=TUNER_MAX_MOVES):
+    """Get a compact state at the start of a difficulty level, or None.
+    
+    The untuned bot plays seeded games until one reaches the level, so
+    the state (snake length, obstacles) is what a game of that level
+    looks like. This is a worker entry point and must stay picklable.
+    """
+    rng = random.Random(seed)
+    target_score = level * DIFFICULTY_MILESTONE
+    weights = to_vector(BOT_WEIGHTS)
+    for _ in range(START_ATTEMPTS):
+        state = GameState.new_game((GRID_WIDTH // 2, GRID_HEIGHT // 2), rng=rng)
+        if level:
+            play(state, weights, max_moves * (level + 1), target_score)
+        if state.alive and state.score_manager.current_score >= target_score:
+            return state.to_compact()
+    return None
+
+def evaluate_game(weights, start, seed, max_moves=TUNER_MAX_MOVES):
+    """Score a weight vector on one game from a compact start state.
+    
+    The bot plays until the score reaches the next difficulty level. The
+    result is the share of the level's points it scored, minus 1 if it
+    died, minus a small charge per move so that faster clears win ties.
+    This is a worker entry point and must stay picklable.
+    """
+    state = GameState.from_compact(start, rng=random.Random(seed))
+    start_score = state.score_manager.current_score
+    target_score = (start_score // DIFFICULTY_MILESTONE + 1) * DIFFICULTY_MILESTONE
+    moves = play(state, weights, max_moves, target_score)
+    gained = min(state.score_manager.current_score, target_score) - start_score
+    fitness = gained / (target_score - start_score) - 0.25 * moves / max_moves
+    if not state.alive:
+        fitness -= 1.0
+    return fitness
+
+def normalize(vector):
+    """Scale a weight vector to a magnitude sum of 1 (only its direction matters)."""
+    total = sum(abs(weight) for weight in vector)
+    if not total:
+        return tuple(1.0 / len(vector) for _ in vector)
+    return tuple(weight / total for weight in vector)
+
+def _evaluate_task(task):
+    """Unpack one (weights, start, seed, max_moves) task for executor.map."""
+    return evaluate_game(*task)
+
+def _start_task(task):
+    """Unpack one (level, seed, max_moves) task for executor.map."""
+    return make_start(*task)
+
+class HeuristicTuner:
+    """Evolves HeuristicBot weight vectors for each theme on seeded headless games.
+    
+    Themes share the rules, so a theme is tuned on the difficulty levels
+    at which mix mode shows it: its games start from states the untuned
+    bot reached at those levels (longer snake, more obstacles later on).
+    Every generation plays each vector on the same seeded games, keeps
+    the best vectors, and fills the rest with tournament-selected,
+    crossed and mutated children. Games are independent, so they are
+    spread over worker processes; results come back in submission order
+    and every random choice derives from the seed, so a run is
+    reproducible. The population is checkpointed after each generation,
+    and an interrupted run resumes from its checkpoint.
+    """
+    
+    def __init__(self, seed=0, population=TUNER_POPULATION, generations=TUNER_GENERATIONS,
+                 games=TUNER_GAMES, levels=TUNER_LEVELS, max_moves=TUNER_MAX_MOVES,
+                 elite=TUNER_ELITE, mutation=TUNER_MUTATION, workers=TUNER_WORKERS,
+                 directory=None, weights_path=None, log=print):
+        """Initialize tuner; workers=0 plays the games in-process."""
+        self.seed = seed
+        self.population_size = population
+        self.generations = generations
+        self.games = games
+        self.levels = levels
+        self.max_moves = max_moves
+        self.elite = elite
+        self.mutation = mutation
+        self.workers = workers
+        self.directory = directory or os.path.join(DATA_DIR, TUNER_DIR)
+        self.weights_path = weights_path or os.path.join(DATA_DIR, BOT_WEIGHTS_FILE)
+        self.log = log
+        self.executor = None
+        
+    def get_settings(self):
+        """Get the settings a checkpoint must match to be resumed."""
+        return {'seed': self.seed, 'population': self.population_size, 'games': self.games,
+                'levels': self.levels, 'max_moves': self.max_moves, 'elite': self.elite,
+                'mutation': self.mutation, 'features': list(FEATURES)}
+                
+    def map(self, function, tasks):
+        """Run a function over tasks in the worker processes, keeping their order."""
+        if self.workers == 0:
+            return list(map(function, tasks))
+        workers = self.workers or os.cpu_count() or 1
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(tasks) // (4 * workers))
+        return list(self.executor.map(function, tasks, chunksize=chunksize))
+        
+    def make_starts(self, theme, rng):
+        """Get the compact start states of a theme's games."""
+        levels = get_theme_levels(theme, self.levels)
+        if not levels:
+            raise ValueError(f"Mix mode does not show {theme!r} in the first {self.levels} levels")
+        tasks = [(levels[i % len(levels)], rng.getrandbits(32), self.max_moves)
+                 for i in range(self.games)]
+        starts = [start for start in self.map(_start_task, tasks) if start is not None]
+        if not starts:
+            raise ValueError(f"The untuned bot reached none of the levels {levels}")
+        return starts
+        
+    def initial_population(self, rng):
+        """Get the first generation: the untuned weights and random vectors."""
+        population = [normalize(to_vector(BOT_WEIGHTS))]
+        while len(population) < self.population_size:
+            population.append(normalize([rng.uniform(-1.0, 1.0) for _ in FEATURES]))
+        return population
+        
+    def evaluate(self, population, starts, rng):
+        """Get the mean fitness of each weight vector over the same seeded games."""
+        seeds = [rng.getrandbits(32) for _ in starts]
+        tasks = [(weights, start, seed, self.max_moves)
+                 for weights in population for start, seed in zip(starts, seeds)]
+        results = self.map(_evaluate_task, tasks)
+        games = len(starts)
+        return [sum(results[i * games:(i + 1) * games]) / games for i in range(len(population))]
+        
+    def select(self, population, fitness, rng):
+        """Pick a parent by tournament."""
+        entrants = [rng.randrange(len(population)) for _ in range(TOURNAMENT_SIZE)]
+        return population[max(entrants, key=lambda i: (fitness[i], -i))]
+        
+    def next_generation(self, population, fitness, rng):
+        """Breed the next generation from a scored one."""
+        ranked = sorted(range(len(population)), key=lambda i: -fitness[i])
+        children = [population[i] for i in ranked[:self.elite]]
+        while len(children) < len(population):
+            first = self.select(population, fitness, rng)
+            second = self.select(population, fitness, rng)
+            child = [rng.choice(pair) + rng.gauss(0.0, self.mutation)
+                     for pair in zip(first, second)]
+            children.append(normalize(child))
+        return children
+        
+    def checkpoint_path(self, theme):
+        """Get the checkpoint file of a theme."""
+        return os.path.join(self.directory, f'{theme}.json')
+        
+    def save_checkpoint(self, theme, checkpoint):
+        """Write a theme's checkpoint, replacing the previous one atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.checkpoint_path(theme)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(path + '.tmp', path)
+        
+    def load_checkpoint(self, theme):
+        """Get a theme's checkpoint if it was made with the same settings, else None."""
+        try:
+            with open(self.checkpoint_path(theme), 'r') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('settings') != self.get_settings():
+            return None
+        return checkpoint
+        
+    def tune(self, theme):
+        """Evolve weights for a theme; returns (best weights dict, best fitness)."""
+        rng = random.Random(f'{self.seed}-{theme}')
+        starts = self.make_starts(theme, rng)
+        generation = 0
+        population = self.initial_population(rng)
+        best = None
+        best_fitness = None
+        
+        checkpoint = self.load_checkpoint(theme)
+        if checkpoint is not None:
+            generation = checkpoint['generation']
+            population = [tuple(weights) for weights in checkpoint['population']]
+            best = tuple(checkpoint['best'])
+            best_fitness = checkpoint['best_fitness']
+            version, internal, gauss_next = checkpoint['rng_state']
+            rng.setstate((version, tuple(internal), gauss_next))
+            self.log(f"🧬 {theme}: resuming at generation {generation}")
+            
+        while generation < self.generations:
+            fitness = self.evaluate(population, starts, rng)
+            leader = max(range(len(population)), key=lambda i: (fitness[i], -i))
+            if best_fitness is None or fitness[leader] > best_fitness:
+                best = population[leader]
+                best_fitness = fitness[leader]
+            generation += 1
+            self.log(f"🧬 {theme}: generation {generation}/{self.generations}, "
+                     f"best {fitness[leader]:.3f}, mean {sum(fitness) / len(fitness):.3f}")
+            population = self.next_generation(population, fitness, rng)
+            self.save_checkpoint(theme, {
+                'settings': self.get_settings(), 'theme': theme, 'generation': generation,
+                'population': population, 'best': best, 'best_fitness': best_fitness,
+                'rng_state': rng.getstate()})
+                
+        weights = to_dict(best)
+        self.save_best(theme, weights, best_fitness)
+        return weights, best_fitness
+        
+    def tune_all(self, themes):
+        """Tune each theme in turn; returns {theme: (weights, fitness)}."""
+        try:
+            return {theme: self.tune(theme) for theme in themes}
+        finally:
+            self.shutdown()
+            
+    def save_best(self, theme, weights, fitness):
+        """Record a theme's best weights in the bot weights file, keeping other themes."""
+        try:
+            with open(self.weights_path, 'r') as f:
+                tuned = json.load(f)
+        except (OSError, ValueError):
+            tuned = {}
+        tuned[theme] = {'weights': weights, 'fitness': fitness, 'seed': self.seed,
+                        'generations': self.generations}
+        os.makedirs(os.path.dirname(self.weights_path) or '.', exist_ok=True)
+        with open(self.weights_path + '.tmp', 'w') as f:
+            json.dump(tuned, f, indent=2)
+        os.replace(self.weights_path + '.tmp', self.weights_path)
+        
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
\ No newline at end of file
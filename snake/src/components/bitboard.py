@@ -0,0 +1,163 @@
+"""
+Bitboard board representation for the Snake Odyssey game.
+"""
+
+from config import GRID_WIDTH, GRID_HEIGHT
+from components.snake import Snake
+
+def popcount(mask):
+    """Count set bits in a mask."""
+    return bin(mask).count('1')
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    def popcount(mask):
+        """Count set bits in a mask."""
+        return mask.bit_count()
+
+class BitBoard:
+    """Geometry of a board whose cells map to bits of one Python int.
+    
+    Rows are stored with one padding bit on the right (stride = width + 1),
+    so horizontal shifts never wrap a cell into the neighbouring row.
+    """
+    
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        """Initialize board geometry."""
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.stride = grid_width + 1
+        
+        row = (1 << grid_width) - 1
+        self.board_mask = 0
+        for y in range(grid_height):
+            self.board_mask |= row << (y * self.stride)
+            
+    def bit(self, cell):
+        """Get the single-bit mask of a cell, or 0 if it is off the board."""
+        x, y = cell
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            return 1 << (y * self.stride + x)
+        return 0
+        
+    def cell(self, index):
+        """Convert a bit index back to a board cell."""
+        return (index % self.stride, index // self.stride)
+        
+    def mask_of(self, cells):
+        """Build a mask from board cells."""
+        mask = 0
+        for cell in cells:
+            mask |= self.bit(cell)
+        return mask
+        
+    def cells_of(self, mask):
+        """Iterate the board cells set in a mask."""
+        while mask:
+            low = mask & -mask
+            yield self.cell(low.bit_length() - 1)
+            mask ^= low
+            
+    def neighbours(self, mask):
+        """Get all cells 4-adjacent to a mask."""
+        stride = self.stride
+        return ((mask << 1) | (mask >> 1) |
+                (mask << stride) | (mask >> stride)) & self.board_mask
+                
+    def free_mask(self, *occupied):
+        """Get the cells not covered by any of the given masks."""
+        taken = 0
+        for mask in occupied:
+            taken |= mask
+        return self.board_mask & ~taken
+        
+    def free_count(self, *occupied):
+        """Count cells not covered by any of the given masks."""
+        return popcount(self.free_mask(*occupied))
+        
+    def flood_fill(self, seed, passable):
+        """Grow seed through passable cells until it stops changing."""
+        region = seed & passable
+        while True:
+            grown = (region | self.neighbours(region)) & passable
+            if grown == region:
+                return region
+            region = grown
+            
+    def reachable_area(self, start, *occupied):
+        """Count free cells reachable from a cell's open neighbours."""
+        passable = self.free_mask(*occupied)
+        return popcount(self.flood_fill(self.neighbours(self.bit(start)), passable))
+        
+    def open_directions(self, cell, *occupied):
+        """Get the open-neighbour flags (up, down, left, right) of a cell."""
+        passable = self.free_mask(*occupied)
+        x, y = cell
+        return (bool(self.bit((x, y - 1)) & passable),
+                bool(self.bit((x, y + 1)) & passable),
+                bool(self.bit((x - 1, y)) & passable),
+                bool(self.bit((x + 1, y)) & passable))
+
+class CellMask:
+    """Set-like collection of board cells backed by a bitboard.
+    
+    Supports the membership tests used by Snake and Food, so it can stand
+    in for a list or set of cells.
+    """
+    
+    def __init__(self, board, cells=()):
+        """Initialize mask."""
+        self.board = board
+        self.value = board.mask_of(cells)
+        
+    def __contains__(self, cell):
+        return bool(self.value & self.board.bit(cell))
+        
+    def __len__(self):
+        return popcount(self.value)
+        
+    def __iter__(self):
+        return self.board.cells_of(self.value)
+        
+    def add(self, cell):
+        """Add a cell to the mask."""
+        self.value |= self.board.bit(cell)
+        
+    def discard(self, cell):
+        """Remove a cell from the mask."""
+        self.value &= ~self.board.bit(cell)
+        
+    def clear(self):
+        """Remove every cell."""
+        self.value = 0
+
+class BitboardSnake(Snake):
+    """Snake that mirrors its body in a bitboard for O(1) collision tests."""
+    
+    def __init__(self, start_x, start_y, color, board=None):
+        """Initialize the snake."""
+        super().__init__(start_x, start_y, color)
+        self.board = board or BitBoard()
+        self.body_mask = CellMask(self.board, self.body)
+        self.self_collision = False
+        
+    def move(self):
+        """Move the snake and update its body mask."""
+        tail = super().move()
+        if tail is not None:
+            self.body_mask.discard(tail)
+            
+        head = self.body[0]
+        self.self_collision = head in self.body_mask
+        self.body_mask.add(head)
+        return tail
+        
+    def check_collision(self, board_width, board_height):
+        """Check if snake collides with walls or itself."""
+        head = self.body[0]
+        if not self.board.bit(head):
+            return True
+        return self.self_collision
+        
+    def get_occupancy(self):
+        """Get the body as a container for membership tests."""
+        return self.body_mask
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+Shared board cell tuples for the Snake Odyssey game.
+"""
+
+from config import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE
+
+# One tuple per board cell, [y][x]; moves and draws reuse them instead of
+# building a new tuple every time
+CELLS = [[(x, y) for x in range(GRID_WIDTH)] for y in range(GRID_HEIGHT)]
+
+_position_tables = {}
+
+def get_cell(x, y):
+    """Get the shared tuple of a board cell; a cell off the board gets a new tuple."""
+    if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT:
+        return CELLS[y][x]
+    return (x, y)
+
+def get_cell_positions(origin_x, origin_y):
+    """Get a [y][x] table of the screen positions of cells on a board drawn at an origin."""
+    table = _position_tables.get((origin_x, origin_y))
+    if table is None:
+        table = [[(origin_x + x * CELL_SIZE, origin_y + y * CELL_SIZE) for x in range(GRID_WIDTH)]
+                 for y in range(GRID_HEIGHT)]
+        _position_tables[(origin_x, origin_y)] = table
+    return table
\ No newline at end of file
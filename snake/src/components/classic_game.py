@@ -0,0 +1,129 @@
+"""
+Classic mode for the Snake Odyssey game, ported from the original sorce.py.
+"""
+
+import random
+from collections import deque
+from config import (BOARD_WIDTH, BOARD_HEIGHT, CLASSIC_BLOCK_SIZE, CLASSIC_SPEED_LEVELS,
+                   CLASSIC_BACKGROUND, CLASSIC_SNAKE_COLOR, CLASSIC_FOOD_COLOR)
+
+class ClassicGame:
+    """The original rules: 10px blocks, one food, no bonus or obstacles.
+    
+    The snake only starts moving once a direction is pressed, may turn
+    straight back into itself, and grows by one block per food. One
+    instance is reused for every round, so restarting never allocates
+    new containers and memory stays flat however often the player retries.
+    """
+    
+    def __init__(self, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                 block_size=CLASSIC_BLOCK_SIZE, rng=None):
+        """Initialize classic game."""
+        self.block_size = block_size
+        self.grid_width = width // block_size
+        self.grid_height = height // block_size
+        self.rng = rng or random.Random()
+        
+        self.body = deque()  # Head is body[-1], tail is body[0]
+        self.occupied = set()
+        self.direction = (0, 0)
+        self.length = 1
+        self.food = None
+        self.alive = True
+        self.reset()
+        
+    def reset(self):
+        """Start a new round in place."""
+        self.body.clear()
+        self.occupied.clear()
+        head = (self.grid_width // 2, self.grid_height // 2)
+        self.body.append(head)
+        self.occupied.add(head)
+        self.direction = (0, 0)
+        self.length = 1
+        self.alive = True
+        self.spawn_food()
+        
+    def change_direction(self, direction):
+        """Turn the snake; reversing is allowed, as in the original."""
+        self.direction = direction
+        
+    def get_score(self):
+        """Get the score: food eaten this round."""
+        return self.length - 1
+        
+    def spawn_food(self):
+        """Place food on a random free block."""
+        while True:
+            cell = (self.rng.randrange(self.grid_width),
+                    self.rng.randrange(self.grid_height))
+            if cell not in self.occupied:
+                self.food = cell
+                return
+                
+    def step(self):
+        """Advance one move; returns False once the round is lost."""
+        if not self.alive or self.direction == (0, 0):
+            return self.alive
+            
+        head = self.body[-1]
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        if not (0 <= new_head[0] < self.grid_width and 0 <= new_head[1] < self.grid_height):
+            self.alive = False
+            return False
+            
+        # The vacated tail may be entered on the same move
+        if len(self.body) >= self.length:
+            self.occupied.discard(self.body.popleft())
+        if new_head in self.occupied:
+            self.alive = False
+            return False
+        self.body.append(new_head)
+        self.occupied.add(new_head)
+        
+        if new_head == self.food:
+            self.length += 1
+            self.spawn_food()
+        return True
+        
+    def draw(self, surface, x, y):
+        """Draw the board with its top-left corner at (x, y)."""
+        block = self.block_size
+        surface.fill(CLASSIC_BACKGROUND, (x, y, self.grid_width * block, self.grid_height * block))
+        surface.fill(CLASSIC_FOOD_COLOR, (x + self.food[0] * block, y + self.food[1] * block,
+                                          block, block))
+        for cell_x, cell_y in self.body:
+            surface.fill(CLASSIC_SNAKE_COLOR, (x + cell_x * block, y + cell_y * block,
+                                               block, block))
+                                               
+def pick_speed_level(default='Normal'):
+    """Ask for a speed level with the original tkinter picker.
+    
+    Returns the chosen level name, None if the window was closed, or the
+    default when tkinter is unavailable (e.g. no display).
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return default
+        
+    root.title("Snake Game - Speed Levels")
+    speed_var = tk.StringVar(value=default)
+    chosen = []
+    
+    speed_label = tk.Label(root, text=f"Selected Speed Level: {default}")
+    speed_label.pack(pady=10)
+    tk.OptionMenu(root, speed_var, *CLASSIC_SPEED_LEVELS.keys()).pack(pady=10)
+    
+    def start():
+        chosen.append(speed_var.get())
+        root.destroy()
+        
+    def show_speed_level():
+        speed_label.config(text=f"Selected Speed Level: {speed_var.get()}")
+        
+    tk.Button(root, text="Start Game", command=start).pack(pady=10)
+    tk.Button(root, text="Show Speed Level", command=show_speed_level).pack(pady=10)
+    root.mainloop()
+    return chosen[0] if chosen else None
\ No newline at end of file
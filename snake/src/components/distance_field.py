@@ -0,0 +1,262 @@
+"""
+Distance field service for the Snake Odyssey game.
+"""
+
+import heapq
+import numpy as np
+from config import GRID_WIDTH, GRID_HEIGHT, DIRECTIONS
+
+class DistanceField:
+    """Shortest-path distances from every board cell to the food and head.
+    
+    Only the food field is incremental: blocking or releasing a cell
+    repairs just the distances that depended on it. The head field is
+    not; its source moves every tick, so it is rebuilt with a full BFS,
+    lazily on the first query after a move and at most once per move.
+    """
+    
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        """Initialize distance field."""
+        # Distances live in flat arrays indexed by y * width + x
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.size = grid_width * grid_height
+        self.unreachable = self.size + 1
+        
+        self.blocked = np.zeros(self.size, dtype=bool)
+        self.food_dist = np.full(self.size, self.unreachable, dtype=np.int32)
+        self.head_dist = np.full(self.size, self.unreachable, dtype=np.int32)
+        self.food_cells = ()
+        self.food_input = None  # set_food's last argument, to skip repeats cheaply
+        self.head = None
+        self.head_dirty = True
+        self.version = 0  # Counts changes, so readers can cache what they derive
+        
+        # Precomputed 4-neighbourhoods of every flat index
+        self.neighbours = []
+        for index in range(self.size):
+            x, y = index % grid_width, index // grid_width
+            cells = []
+            for dx, dy in DIRECTIONS.values():
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < grid_width and 0 <= ny < grid_height:
+                    cells.append(ny * grid_width + nx)
+            self.neighbours.append(cells)
+            
+    def reset(self, snake_body, obstacles, food_cells):
+        """Rebuild all fields from scratch."""
+        self.blocked[:] = False
+        for cell in list(snake_body) + list(obstacles):
+            if self.in_bounds(cell):
+                self.blocked[self.index(cell)] = True
+        self.head = snake_body[0] if snake_body else None
+        self.head_dirty = True
+        self.version += 1
+        self.food_cells = ()
+        self.food_input = None
+        self.set_food(food_cells)
+        
+    def index(self, cell):
+        """Convert a board cell to a flat index."""
+        return cell[1] * self.grid_width + cell[0]
+        
+    def in_bounds(self, cell):
+        """Check if a cell lies on the board."""
+        return 0 <= cell[0] < self.grid_width and 0 <= cell[1] < self.grid_height
+        
+    def get_food_grid(self):
+        """Get the food distances as a (height, width) array view."""
+        return self.food_dist.reshape(self.grid_height, self.grid_width)
+        
+    def get_head_grid(self):
+        """Get the head distances as a (height, width) array view."""
+        self._refresh_head()
+        return self.head_dist.reshape(self.grid_height, self.grid_width)
+        
+    def set_food(self, food_cells):
+        """Move the food sources; no-op if they did not change."""
+        if food_cells == self.food_input:
+            return
+        self.food_input = food_cells
+        food_cells = tuple(cell for cell in food_cells
+                           if cell is not None and self.in_bounds(cell))
+        if food_cells == self.food_cells:
+            return
+        self.food_cells = food_cells
+        self.version += 1
+        sources = [self.index(cell) for cell in food_cells]
+        self._bfs(self.food_dist, sources)
+        
+    def on_snake_move(self, head, tail=None):
+        """Track one snake move: the tail vacates, the head enters."""
+        if tail is not None and self.in_bounds(tail):
+            self.release(tail)
+        if self.in_bounds(head):
+            self.block(head)
+        self.head = head
+        self.head_dirty = True
+        self.version += 1
+        
+    def on_obstacle_added(self, cell):
+        """Block an obstacle cell."""
+        self.block(cell)
+        self.head_dirty = True
+        self.version += 1
+        
+    def release(self, cell):
+        """Open a cell; distances can only shrink, so relax outward from it."""
+        index = self.index(cell)
+        if not self.blocked[index]:
+            return
+        self.blocked[index] = False
+        
+        dist = self.food_dist
+        if index in self._food_indices():
+            dist[index] = 0
+        else:
+            best = self._best_neighbour(dist, index) + 1
+            if best >= self.unreachable:
+                return
+            dist[index] = best
+        self._propagate(dist, [(int(dist[index]), index)])
+        
+    def block(self, cell):
+        """Close a cell and repair the distances that depended on it."""
+        index = self.index(cell)
+        if self.blocked[index]:
+            return
+        self.blocked[index] = True
+        
+        dist = self.food_dist
+        old = int(dist[index])
+        dist[index] = self.unreachable
+        if old >= self.unreachable:
+            return
+            
+        # Collect cells that lost every shortest-path parent
+        affected = []
+        stack = [(index, old)]
+        while stack:
+            current, current_dist = stack.pop()
+            for neighbour in self.neighbours[current]:
+                if (self.blocked[neighbour] or
+                    dist[neighbour] != current_dist + 1 or
+                    self._has_parent(dist, neighbour)):
+                    continue
+                dist[neighbour] = self.unreachable
+                affected.append(neighbour)
+                stack.append((neighbour, current_dist + 1))
+                
+        if not affected:
+            return
+            
+        # Re-seed the orphaned region from its intact boundary
+        heap = []
+        for cell_index in affected:
+            best = self._best_neighbour(dist, cell_index) + 1
+            if best < self.unreachable:
+                dist[cell_index] = best
+                heap.append((best, cell_index))
+        heapq.heapify(heap)
+        self._propagate(dist, heap)
+        
+    def food_distance(self, cell):
+        """Get steps from a cell to the nearest food.
+        
+        Blocked cells (such as the head) report one more than their best
+        open neighbour, so the head's distance is meaningful too.
+        """
+        if not self.in_bounds(cell):
+            return self.unreachable
+        index = self.index(cell)
+        if self.blocked[index]:
+            return min(self.unreachable, self._best_neighbour(self.food_dist, index) + 1)
+        return int(self.food_dist[index])
+        
+    def head_distance(self, cell):
+        """Get steps from the snake head to a cell."""
+        if not self.in_bounds(cell):
+            return self.unreachable
+        self._refresh_head()
+        return int(self.head_dist[self.index(cell)])
+        
+    def next_step_to_food(self, head=None):
+        """Get the direction that leads from the head towards food, or None."""
+        head = head if head is not None else self.head
+        if head is None:
+            return None
+            
+        best_direction = None
+        best_dist = self.unreachable
+        for direction in DIRECTIONS.values():
+            cell = (head[0] + direction[0], head[1] + direction[1])
+            if not self.in_bounds(cell) or self.blocked[self.index(cell)]:
+                continue
+            dist = int(self.food_dist[self.index(cell)])
+            if dist < best_dist:
+                best_dist = dist
+                best_direction = direction
+        return best_direction
+        
+    def _food_indices(self):
+        """Get flat indices of the food sources."""
+        return [self.index(cell) for cell in self.food_cells]
+        
+    def _best_neighbour(self, dist, index):
+        """Get the smallest distance among open neighbours."""
+        best = self.unreachable
+        for neighbour in self.neighbours[index]:
+            if not self.blocked[neighbour] and dist[neighbour] < best:
+                best = int(dist[neighbour])
+        return best
+        
+    def _has_parent(self, dist, index):
+        """Check if an open neighbour is one step closer to the source."""
+        target = dist[index] - 1
+        for neighbour in self.neighbours[index]:
+            if not self.blocked[neighbour] and dist[neighbour] == target:
+                return True
+        return False
+        
+    def _propagate(self, dist, heap):
+        """Lower distances outward from the cells in a (dist, index) heap."""
+        while heap:
+            current_dist, current = heapq.heappop(heap)
+            if current_dist > dist[current]:
+                continue
+            for neighbour in self.neighbours[current]:
+                if not self.blocked[neighbour] and dist[neighbour] > current_dist + 1:
+                    dist[neighbour] = current_dist + 1
+                    heapq.heappush(heap, (current_dist + 1, neighbour))
+                    
+    def _bfs(self, dist, sources):
+        """Recompute a whole field with a vectorised wavefront BFS."""
+        dist.fill(self.unreachable)
+        grid = dist.reshape(self.grid_height, self.grid_width)
+        open_grid = ~self.blocked.reshape(self.grid_height, self.grid_width)
+        
+        frontier = np.zeros_like(open_grid)
+        for source in sources:
+            frontier.flat[source] = True
+        visited = frontier.copy()
+        step = 0
+        while frontier.any():
+            grid[frontier] = step
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & open_grid & ~visited
+            visited |= frontier
+            step += 1
+            
+    def _refresh_head(self):
+        """Rebuild the head field if the head moved since the last query."""
+        if not self.head_dirty:
+            return
+        self.head_dirty = False
+        if self.head is None or not self.in_bounds(self.head):
+            self.head_dist.fill(self.unreachable)
+            return
+        self._bfs(self.head_dist, [self.index(self.head)])
\ No newline at end of file
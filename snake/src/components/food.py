@@ -6,14 +6,17 @@ import pygame
 import random
 import time
 from config import CELL_SIZE
+from components.cells import get_cell_positions
 
 class Food:
     """Represents food items in the game."""
     
-    def __init__(self, board_width, board_height):
+    def __init__(self, board_width, board_height, rng=None, clock=None):
         """Initialize food system."""
         self.board_width = board_width
         self.board_height = board_height
+        self.rng = rng  # None uses the global random module
+        self.clock = clock  # GameClock; None uses wall-clock time
         self.regular_food = None
         self.bonus_food = None
         self.bonus_timer = 0
@@ -21,31 +24,35 @@ class Food:
         
     def spawn_regular_food(self, snake_body, obstacles):
         """Spawn regular food at random position."""
+        rng = self.rng or random
         while True:
-            x = random.randint(0, (self.board_width // CELL_SIZE) - 1)
-            y = random.randint(0, (self.board_height // CELL_SIZE) - 1)
+            x = rng.randint(0, (self.board_width // CELL_SIZE) - 1)
+            y = rng.randint(0, (self.board_height // CELL_SIZE) - 1)
             position = (x, y)
             
             if position not in snake_body and position not in obstacles:
                 self.regular_food = position
                 break
                 
-    def spawn_bonus_food(self, snake_body, obstacles):
+    def spawn_bonus_food(self, snake_body, obstacles, now=None):
         """Spawn bonus food for limited time."""
+        rng = self.rng or random
         while True:
-            x = random.randint(0, (self.board_width // CELL_SIZE) - 1)
-            y = random.randint(0, (self.board_height // CELL_SIZE) - 1)
+            x = rng.randint(0, (self.board_width // CELL_SIZE) - 1)
+            y = rng.randint(0, (self.board_height // CELL_SIZE) - 1)
             position = (x, y)
             
             if (position not in snake_body and position not in obstacles and 
                 position != self.regular_food):
                 self.bonus_food = position
-                self.bonus_timer = time.time()
+                self.bonus_timer = self.get_time() if now is None else now
                 break
                 
-    def update_bonus_food(self):
+    def update_bonus_food(self, now=None):
         """Update bonus food timer."""
-        if self.bonus_food and time.time() - self.bonus_timer > self.bonus_duration:
+        if now is None:
+            now = self.get_time()
+        if self.bonus_food and now - self.bonus_timer > self.bonus_duration:
             self.bonus_food = None
             self.bonus_timer = 0
             
@@ -63,8 +70,12 @@ class Food:
             
         return regular_eaten, bonus_eaten
         
-    def draw(self, surface, board_x, board_y, theme):
+    def draw(self, surface, board_x, board_y, theme, sprites=None):
         """Draw food items on the surface."""
+        if sprites:
+            self.draw_sprites(surface, board_x, board_y, sprites)
+            return
+            
         # Draw regular food
         if self.regular_food:
             x = board_x + self.regular_food[0] * CELL_SIZE
@@ -81,7 +92,7 @@ class Food:
             y = board_y + self.bonus_food[1] * CELL_SIZE
             
             # Pulsing effect
-            pulse = abs(pygame.time.get_ticks() % 1000 - 500) / 500.0
+            pulse = abs(self.get_ticks() % 1000 - 500) / 500.0
             size_offset = int(pulse * 4)
             
             # Golden bonus food
@@ -94,13 +105,38 @@ class Food:
                                CELL_SIZE - 4 + size_offset * 2, 
                                CELL_SIZE - 4 + size_offset * 2), 2)
                                
-    def get_bonus_time_remaining(self):
+    def draw_sprites(self, surface, board_x, board_y, sprites):
+        """Draw food items from pre-rendered sprites."""
+        if self.regular_food:
+            x, y = self.regular_food
+            surface.blit(sprites['food'], get_cell_positions(board_x, board_y)[y][x])
+                                           
+        if self.bonus_food:
+            pulse = abs(self.get_ticks() % 1000 - 500) / 500.0
+            margin = sprites['bonus_margin']
+            surface.blit(sprites['bonus'][int(pulse * 4)],
+                         (board_x + self.bonus_food[0] * CELL_SIZE - margin,
+                          board_y + self.bonus_food[1] * CELL_SIZE - margin))
+                          
+    def get_bonus_time_remaining(self, now=None):
         """Get remaining time for bonus food."""
         if self.bonus_food:
-            elapsed = time.time() - self.bonus_timer
+            elapsed = (self.get_time() if now is None else now) - self.bonus_timer
             return max(0, self.bonus_duration - elapsed)
         return 0
         
+    def get_time(self):
+        """Get the current time in seconds for bonus timers."""
+        if self.clock:
+            return self.clock.get_seconds()
+        return time.time()
+        
+    def get_ticks(self):
+        """Get the current time in milliseconds for animations."""
+        if self.clock:
+            return self.clock.get_ticks()
+        return pygame.time.get_ticks()
+        
     def has_regular_food(self):
         """Check if regular food exists."""
         return self.regular_food is not None
@@ -0,0 +1,56 @@
+"""
+Frame time statistics for the Snake Odyssey game.
+"""
+
+from collections import deque
+from config import FRAME_STATS_SAMPLES, QUALITY_FRAME_BUDGET_MS
+
+class FrameStats:
+    """Recent frame work times and the garbage collector pauses inside them.
+    
+    A frame over the budget is a spike; spikes that contained a GC pause
+    are counted separately, so the share of spikes caused by collections
+    can be read off directly.
+    """
+    
+    def __init__(self, samples=FRAME_STATS_SAMPLES, budget_ms=QUALITY_FRAME_BUDGET_MS):
+        """Initialize empty statistics."""
+        self.frame_times = deque(maxlen=samples)
+        self.gc_times = deque(maxlen=samples)
+        self.budget_ms = budget_ms
+        
+    def clear(self):
+        """Forget recorded frames."""
+        self.frame_times.clear()
+        self.gc_times.clear()
+        
+    def record(self, frame_ms, gc_ms=0.0):
+        """Record one frame's work time and the GC pause time within it."""
+        self.frame_times.append(frame_ms)
+        self.gc_times.append(gc_ms)
+        
+    def get_stats(self):
+        """Get frame time percentiles, spikes and GC pause totals in milliseconds."""
+        times = sorted(self.frame_times)
+        count = len(times)
+        if not count:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0,
+                    'spikes': 0, 'gc_spikes': 0, 'gc_frames': 0, 'gc_total': 0.0, 'gc_max': 0.0}
+        spikes = 0
+        gc_spikes = 0
+        for frame_ms, gc_ms in zip(self.frame_times, self.gc_times):
+            if frame_ms > self.budget_ms:
+                spikes += 1
+                if gc_ms:
+                    gc_spikes += 1
+        return {'count': count,
+                'mean': sum(times) / count,
+                'p50': times[count // 2],
+                'p95': times[min(count - 1, int(count * 0.95))],
+                'p99': times[min(count - 1, int(count * 0.99))],
+                'max': times[-1],
+                'spikes': spikes,
+                'gc_spikes': gc_spikes,
+                'gc_frames': sum(1 for gc_ms in self.gc_times if gc_ms),
+                'gc_total': sum(self.gc_times),
+                'gc_max': max(self.gc_times)}
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Virtual game clock for the Snake Odyssey game.
+"""
+
+from config import CLOCK_MIN_SCALE, CLOCK_MAX_SCALE, MAX_FRAME_MS
+
+class GameClock:
+    """Virtual session time in milliseconds, advanced by the engine.
+    
+    Game rules read time only from here, so pausing stops every timer and
+    the scale runs the whole game slower or faster than real time. In
+    unthrottled mode the engine jumps the clock straight to the next event
+    instead of waiting for real time to pass.
+    """
+    
+    def __init__(self, scale=1.0):
+        """Initialize clock at time zero."""
+        self.time = 0.0
+        self.scale = 1.0
+        self.paused = False
+        self.unthrottled = False
+        self.set_scale(scale)
+        
+    def advance(self, real_ms):
+        """Advance by a real-time frame duration; returns the virtual delta."""
+        if self.paused:
+            return 0.0
+        delta = min(real_ms, MAX_FRAME_MS) * self.scale
+        self.time += delta
+        return delta
+        
+    def advance_to(self, target):
+        """Jump forward to a virtual time; returns the virtual delta."""
+        if self.paused or target <= self.time:
+            return 0.0
+        delta = target - self.time
+        self.time = target
+        return delta
+        
+    def set_scale(self, scale):
+        """Set the time scale, clamped to the supported range."""
+        self.scale = min(CLOCK_MAX_SCALE, max(CLOCK_MIN_SCALE, scale))
+        
+    def pause(self):
+        """Stop virtual time."""
+        self.paused = True
+        
+    def resume(self):
+        """Restart virtual time."""
+        self.paused = False
+        
+    def set_unthrottled(self, enabled):
+        """Run as fast as possible instead of following real time."""
+        self.unthrottled = enabled
+        
+    def get_ticks(self):
+        """Get virtual milliseconds, like pygame.time.get_ticks()."""
+        return int(self.time)
+        
+    def get_seconds(self):
+        """Get virtual seconds, like time.time() for timers."""
+        return self.time / 1000.0
\ No newline at end of file
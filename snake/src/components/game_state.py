@@ -0,0 +1,346 @@
+"""
+Compact game state with O(1) snapshots for the Snake Odyssey game.
+"""
+
+import random
+from config import (DIRECTIONS, BASE_MOVE_DELAY, MIN_MOVE_DELAY, BONUS_TIMER,
+                   OBSTACLE_HEAD_DISTANCE)
+from components.bitboard import BitBoard, popcount
+from managers.score_manager import ScoreManager
+
+class BodyNode:
+    """One head position in a persistent, branching trajectory.
+    
+    Each node links to the previous head position. The snake body is the
+    window of the last `length` nodes, so branches share their common past
+    and a move never copies the body. Jump pointers (Myers' skew-binary
+    scheme) find the tail ancestor in O(log length).
+    """
+    
+    __slots__ = ('cell', 'parent', 'depth', 'jump')
+    
+    def __init__(self, cell, parent=None):
+        """Initialize node."""
+        self.cell = cell
+        self.parent = parent
+        if parent is None:
+            self.depth = 0
+            self.jump = self
+        else:
+            self.depth = parent.depth + 1
+            jump = parent.jump
+            if parent.depth - jump.depth == jump.depth - jump.jump.depth:
+                self.jump = jump.jump
+            else:
+                self.jump = parent
+                
+    def ancestor(self, depth):
+        """Get the ancestor node at the given depth."""
+        node = self
+        while node.depth > depth:
+            if node.jump.depth >= depth:
+                node = node.jump
+            else:
+                node = node.parent
+        return node
+        
+    def cells(self, count):
+        """Iterate the cells of this node and its ancestors, newest first."""
+        node = self
+        for _ in range(count):
+            yield node.cell
+            node = node.parent
+
+def build_chain(body):
+    """Build a node chain from a head-first body list; returns the head node."""
+    node = None
+    for cell in reversed(body):
+        node = BodyNode(cell, node)
+    return node
+
+class GameState:
+    """Complete rules-level game state with cheap snapshot and undo.
+    
+    Everything mutable is a scalar, an immutable int bitmask or a persistent
+    BodyNode chain, so snapshot() is a flat tuple copy whatever the snake
+    length. The random generator used for food and obstacles is not part of
+    the snapshot; search code passes its own.
+    """
+    
+    def __init__(self, board=None, rng=None):
+        """Initialize empty state."""
+        self.board = board or BitBoard()
+        self.rng = rng or random.Random()
+        self.score_manager = ScoreManager(persistent=False)
+        self.history = []
+        
+        self.head = None
+        self.length = 0
+        self.body_mask = 0
+        self.direction = DIRECTIONS['RIGHT']
+        self.grow_pending = False
+        self.food = None
+        self.bonus_food = None
+        self.bonus_time = 0.0
+        self.obstacle_mask = 0
+        self.obstacle_count = 0
+        self.tick = 0
+        self.alive = True
+        self.death_cause = None
+        
+    @classmethod
+    def from_game(cls, snake, food, score_manager, obstacles, rng=None):
+        """Capture live game objects into a compact state."""
+        state = cls(rng=rng)
+        state.head = build_chain(snake.body)
+        state.length = len(snake.body)
+        state.body_mask = state.board.mask_of(snake.body)
+        state.direction = snake.direction
+        state.grow_pending = snake.grow_next
+        state.food = food.regular_food
+        state.bonus_food = food.bonus_food
+        state.bonus_time = food.get_bonus_time_remaining()
+        state.obstacle_mask = state.board.mask_of(obstacles)
+        state.obstacle_count = len(obstacles)
+        state.score_manager.current_score = score_manager.current_score
+        state.score_manager.food_eaten = score_manager.food_eaten
+        state.score_manager.bonus_food_eaten = score_manager.bonus_food_eaten
+        return state
+        
+    @classmethod
+    def new_game(cls, start, rng=None):
+        """Create the opening state of a game with the snake at start."""
+        state = cls(rng=rng)
+        state.head = BodyNode(start)
+        state.length = 1
+        state.body_mask = state.board.bit(start)
+        state.spawn_food()
+        return state
+        
+    def to_compact(self):
+        """Get a flat, picklable description of the state.
+        
+        Unlike snapshot() this is O(length), but it contains no node chain,
+        so it can be sent to other processes or written to disk.
+        """
+        score_manager = self.score_manager
+        return (self.body(), self.direction, self.grow_pending, self.food,
+                self.bonus_food, self.bonus_time, self.obstacles(), self.tick,
+                score_manager.current_score, score_manager.food_eaten,
+                score_manager.bonus_food_eaten)
+                
+    @classmethod
+    def from_compact(cls, data, rng=None):
+        """Rebuild a state from to_compact() output."""
+        (body, direction, grow_pending, food, bonus_food, bonus_time, obstacles,
+         tick, score, food_eaten, bonus_eaten) = data
+        state = cls(rng=rng)
+        state.head = build_chain(body)
+        state.length = len(body)
+        state.body_mask = state.board.mask_of(body)
+        state.direction = direction
+        state.grow_pending = grow_pending
+        state.food = food
+        state.bonus_food = bonus_food
+        state.bonus_time = bonus_time
+        state.obstacle_mask = state.board.mask_of(obstacles)
+        state.obstacle_count = len(obstacles)
+        state.tick = tick
+        state.score_manager.current_score = score
+        state.score_manager.food_eaten = food_eaten
+        state.score_manager.bonus_food_eaten = bonus_eaten
+        return state
+        
+    def snapshot(self):
+        """Capture the state as an immutable tuple in O(1)."""
+        score_manager = self.score_manager
+        return (self.head, self.length, self.body_mask, self.direction,
+                self.grow_pending, self.food, self.bonus_food, self.bonus_time,
+                self.obstacle_mask, self.obstacle_count, self.tick, self.alive,
+                self.death_cause, score_manager.current_score,
+                score_manager.food_eaten, score_manager.bonus_food_eaten)
+                
+    def restore(self, snapshot):
+        """Return to a snapshot taken from this or any compatible state."""
+        (self.head, self.length, self.body_mask, self.direction,
+         self.grow_pending, self.food, self.bonus_food, self.bonus_time,
+         self.obstacle_mask, self.obstacle_count, self.tick, self.alive,
+         self.death_cause, score, food_eaten, bonus_eaten) = snapshot
+        score_manager = self.score_manager
+        score_manager.current_score = score
+        score_manager.food_eaten = food_eaten
+        score_manager.bonus_food_eaten = bonus_eaten
+        
+    def undo(self):
+        """Step back one tick recorded by step(record=True)."""
+        if not self.history:
+            return False
+        self.restore(self.history.pop())
+        return True
+        
+    def body(self):
+        """Get the body cells, head first."""
+        return list(self.head.cells(self.length))
+        
+    def head_cell(self):
+        """Get the head cell."""
+        return self.head.cell
+        
+    def tail_cell(self):
+        """Get the tail cell."""
+        return self.head.ancestor(self.head.depth - self.length + 1).cell
+        
+    def obstacles(self):
+        """Get obstacle cells."""
+        return list(self.board.cells_of(self.obstacle_mask))
+        
+    def get_move_delay(self):
+        """Get milliseconds per move at the current score."""
+        speed_multiplier = self.score_manager.get_speed_multiplier()
+        return max(MIN_MOVE_DELAY, int(BASE_MOVE_DELAY / speed_multiplier))
+        
+    def is_blocked(self, cell):
+        """Check if a cell is a wall, obstacle or body cell."""
+        bit = self.board.bit(cell)
+        return not bit or bool((self.body_mask | self.obstacle_mask) & bit)
+        
+    def legal_directions(self):
+        """Get directions other than reversing into the neck."""
+        reverse = (-self.direction[0], -self.direction[1])
+        return [d for d in DIRECTIONS.values() if d != reverse]
+        
+    def step(self, direction=None, record=False):
+        """Advance one tick with the game rules; returns points scored."""
+        if not self.alive:
+            return 0
+        if record:
+            self.history.append(self.snapshot())
+            
+        board = self.board
+        if direction is not None and direction != (-self.direction[0], -self.direction[1]):
+            self.direction = direction
+            
+        head = self.head.cell
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        self.bonus_time -= self.get_move_delay() / 1000.0
+        self.tick += 1
+        
+        # The tail moves out of the way unless growing, so moving into it
+        # is legal; nothing changes until the move is known to be legal
+        tail_bit = 0 if self.grow_pending else board.bit(self.tail_cell())
+        bit = board.bit(new_head)
+        if not bit:
+            return self._die('wall')
+        if self.obstacle_mask & bit:
+            return self._die('obstacle')
+        if self.body_mask & ~tail_bit & bit:
+            return self._die('self')
+            
+        if self.grow_pending:
+            self.grow_pending = False
+            self.length += 1
+        self.head = BodyNode(new_head, self.head)
+        self.body_mask = (self.body_mask & ~tail_bit) | bit
+        if self.head.depth > 4 * self.length + 256:
+            self._compact()
+            
+        points = 0
+        score_manager = self.score_manager
+        if new_head == self.food:
+            self.grow_pending = True
+            before = score_manager.current_score
+            score_manager.add_regular_food_score()
+            points += score_manager.current_score - before
+            self.food = None
+            self.spawn_food()
+            if score_manager.should_spawn_bonus():
+                self.spawn_bonus()
+                
+        if new_head == self.bonus_food:
+            self.grow_pending = True
+            before = score_manager.current_score
+            score_manager.add_bonus_food_score()
+            points += score_manager.current_score - before
+            self.bonus_food = None
+            
+        if points:
+            self.update_obstacles()
+        if self.bonus_food is not None and self.bonus_time <= 0:
+            self.bonus_food = None
+        return points
+        
+    def _compact(self):
+        """Rebuild the node chain from the body so old history can be freed.
+        
+        Runs once every few body lengths of moves, so it is amortized O(1).
+        Snapshots keep their own chains and are unaffected.
+        """
+        self.head = build_chain(self.body())
+        
+    def _die(self, cause):
+        """Mark the state as finished."""
+        self.alive = False
+        self.death_cause = cause
+        return 0
+        
+    def random_free_cell(self, exclude=0):
+        """Pick a uniformly random free cell, or None if the board is full."""
+        board = self.board
+        taken = self.body_mask | self.obstacle_mask | exclude
+        for _ in range(32):
+            cell = (self.rng.randrange(board.grid_width),
+                    self.rng.randrange(board.grid_height))
+            if not taken & board.bit(cell):
+                return cell
+                
+        # Crowded board: pick among the free bits directly
+        free = board.free_mask(taken)
+        count = popcount(free)
+        if not count:
+            return None
+        for _ in range(self.rng.randrange(count)):
+            free &= free - 1
+        return board.cell((free & -free).bit_length() - 1)
+        
+    def spawn_food(self):
+        """Spawn regular food on a free cell."""
+        exclude = self.board.bit(self.bonus_food) if self.bonus_food else 0
+        self.food = self.random_free_cell(exclude)
+        if self.food is None:
+            self._die('full')
+            
+    def spawn_bonus(self):
+        """Spawn bonus food with a fresh timer."""
+        exclude = self.board.bit(self.food) if self.food else 0
+        self.bonus_food = self.random_free_cell(exclude)
+        self.bonus_time = BONUS_TIMER
+        
+    def update_obstacles(self):
+        """Add obstacles until the score-based target count is reached."""
+        board = self.board
+        target_count = self.score_manager.get_obstacle_count()
+        head = self.head.cell
+        reserved = 0
+        for cell in (self.food, self.bonus_food):
+            if cell is not None:
+                reserved |= board.bit(cell)
+        while self.obstacle_count < target_count:
+            for _ in range(50):
+                cell = self.random_free_cell(reserved)
+                if cell is None:
+                    return
+                if abs(cell[0] - head[0]) + abs(cell[1] - head[1]) <= OBSTACLE_HEAD_DISTANCE:
+                    continue
+                if self._keeps_connected(board.bit(cell)):
+                    self.obstacle_mask |= board.bit(cell)
+                    self.obstacle_count += 1
+                    break
+            else:
+                return
+                
+    def _keeps_connected(self, bit):
+        """Check that blocking a cell keeps all non-obstacle cells connected."""
+        board = self.board
+        passable = board.free_mask(self.obstacle_mask | bit)
+        seed = passable & -passable
+        return board.flood_fill(seed, passable) == passable
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Garbage collector control for the Snake Odyssey game.
+"""
+
+import gc
+import time
+from config import GC_CONTROL, GC_PLAY_THRESHOLDS
+
+class GCController:
+    """Keeps CPython's cyclic garbage collector out of the way of gameplay.
+    
+    After startup the surviving objects (modules, caches, theme data) are
+    frozen into the permanent generation, so later collections never walk
+    them again. While the game runs, the thresholds are raised: young
+    collections happen less often and full collections not at all. The
+    full collection is made at a safe point instead, when the game goes
+    to a screen that does not move (pause, game over, a menu). A
+    gc.callbacks hook times every collection, so the pauses can be added
+    to the frame they happened in. With enabled=False the collector is
+    left alone and only timed.
+    """
+    
+    def __init__(self, enabled=GC_CONTROL, play_thresholds=GC_PLAY_THRESHOLDS):
+        """Initialize controller; the collector's current thresholds are kept for idle screens."""
+        self.enabled = enabled
+        self.play_thresholds = play_thresholds
+        self.idle_thresholds = gc.get_threshold()
+        self.active = False
+        self.frozen = 0
+        
+        # Collection timing
+        self.start = None
+        self.frame_pause_ms = 0.0
+        self.safe_point = False
+        self.stats = {'collections': [0, 0, 0], 'pause_ms': [0.0, 0.0, 0.0],
+                      'max_pause_ms': [0.0, 0.0, 0.0], 'safe_collections': 0,
+                      'safe_pause_ms': 0.0}
+        gc.callbacks.append(self._on_collect)
+        
+    def _on_collect(self, phase, info):
+        """Time one collection (called by the interpreter)."""
+        if phase == 'start':
+            self.start = time.perf_counter()
+            return
+        if self.start is None:
+            return
+        pause_ms = (time.perf_counter() - self.start) * 1000
+        self.start = None
+        if self.safe_point:
+            return  # Counted by collect()
+        generation = info['generation']
+        stats = self.stats
+        stats['collections'][generation] += 1
+        stats['pause_ms'][generation] += pause_ms
+        stats['max_pause_ms'][generation] = max(stats['max_pause_ms'][generation], pause_ms)
+        self.frame_pause_ms += pause_ms
+        
+    def freeze(self):
+        """Collect once and move every surviving object to the permanent generation."""
+        if not self.enabled:
+            return
+        self.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        
+    def set_active(self, active):
+        """Switch to play thresholds, or to idle ones with a full collection at this safe point."""
+        if not self.enabled or active == self.active:
+            return
+        self.active = active
+        if active:
+            gc.set_threshold(*self.play_thresholds)
+        else:
+            gc.set_threshold(*self.idle_thresholds)
+            self.collect()
+            
+    def collect(self):
+        """Run a full collection outside any measured frame."""
+        self.safe_point = True
+        start = time.perf_counter()
+        try:
+            gc.collect()
+        finally:
+            self.safe_point = False
+        self.stats['safe_collections'] += 1
+        self.stats['safe_pause_ms'] += (time.perf_counter() - start) * 1000
+        
+    def take_frame_pause(self):
+        """Get the GC pause time since the last call in milliseconds, and reset it."""
+        pause_ms = self.frame_pause_ms
+        self.frame_pause_ms = 0.0
+        return pause_ms
+        
+    def shutdown(self):
+        """Stop timing collections and restore the idle thresholds."""
+        if self._on_collect in gc.callbacks:
+            gc.callbacks.remove(self._on_collect)
+        gc.set_threshold(*self.idle_thresholds)
+        self.active = False
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Direction input buffer for the Snake Odyssey game.
+"""
+
+from collections import deque
+from config import INPUT_BUFFER_SIZE, INPUT_EARLY_TURNS, INPUT_LATENCY_SAMPLES
+
+class InputBuffer:
+    """Bounded queue of direction presses, applied one per move.
+    
+    Presses are stamped with the game time they arrived at. Each move
+    takes the oldest press that is a real turn for the snake's current
+    direction, so Up then Left while moving Right makes two turns on two
+    moves instead of the second press overwriting the first or reversing
+    the snake. Presses beyond the queue size are dropped, and each applied
+    turn records how long it waited for its move.
+    """
+    
+    def __init__(self, size=INPUT_BUFFER_SIZE, early_turns=INPUT_EARLY_TURNS):
+        """Initialize an empty buffer."""
+        self.queue = deque()
+        self.size = size
+        self.early_turns = early_turns  # Queued turns may bring the next move forward
+        self.latencies = deque(maxlen=INPUT_LATENCY_SAMPLES)
+        self.dropped = 0
+        self.rejected = 0
+        
+    def clear(self):
+        """Forget queued presses, e.g. when a new game starts."""
+        self.queue.clear()
+        
+    def push(self, direction, time_ms):
+        """Queue a direction press made at game time time_ms."""
+        if self.queue and self.queue[-1][0] == direction:
+            return  # Key repeat or a double press
+        if len(self.queue) >= self.size:
+            self.dropped += 1
+            return
+        self.queue.append((direction, time_ms))
+        
+    def next_turn_time(self, direction):
+        """Get when the next turn from direction was pressed, or None if none is queued.
+        
+        Leading presses that are no turn (the same or the opposite
+        direction) are discarded.
+        """
+        queue = self.queue
+        while queue:
+            new_direction, time_ms = queue[0]
+            if new_direction != direction and new_direction != (-direction[0], -direction[1]):
+                return time_ms
+            queue.popleft()
+            if new_direction != direction:
+                self.rejected += 1
+        return None
+        
+    def apply(self, snake, move_time):
+        """Turn the snake for a move at game time move_time; returns True if it turned."""
+        if self.next_turn_time(snake.direction) is None:
+            return False
+        direction, time_ms = self.queue.popleft()
+        snake.direction = direction
+        self.latencies.append(move_time - time_ms)
+        return True
+        
+    def get_latency_stats(self):
+        """Get input-to-move latency statistics in milliseconds."""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        if not count:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0,
+                    'dropped': self.dropped, 'rejected': self.rejected}
+        return {'count': count,
+                'mean': sum(latencies) / count,
+                'p50': latencies[count // 2],
+                'p95': latencies[min(count - 1, int(count * 0.95))],
+                'max': latencies[-1],
+                'dropped': self.dropped,
+                'rejected': self.rejected}
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Obstacle placement engine for the Snake Odyssey game.
+"""
+
+import random
+from collections import deque
+from config import GRID_WIDTH, GRID_HEIGHT, OBSTACLE_HEAD_DISTANCE
+
+# 8-neighbourhood offsets in ring order, starting north and going clockwise
+RING_OFFSETS = [(0, -1), (1, -1), (1, 0), (1, 1),
+                (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+
+class ObstaclePlacer:
+    """Places obstacles on free cells without splitting the board."""
+    
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT,
+                 min_head_distance=OBSTACLE_HEAD_DISTANCE, rng=None):
+        """Initialize placement engine."""
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.min_head_distance = min_head_distance
+        self.rng = rng or random.Random()
+        self.obstacles = set()
+        
+        # Free cells (not snake, not obstacle) kept as a list plus an index
+        # so that both removal and random sampling are O(1)
+        self.free_cells = []
+        self.free_index = {}
+        
+        # Pool of an empty board, copied on every reset
+        self.all_cells = [(x, y) for y in range(grid_height) for x in range(grid_width)]
+        self.all_index = {cell: i for i, cell in enumerate(self.all_cells)}
+        
+    def reset(self, snake_body, obstacles=()):
+        """Rebuild the free-cell pool for a new game."""
+        self.obstacles = set(obstacles)
+        self.free_cells = list(self.all_cells)
+        self.free_index = dict(self.all_index)
+        
+        for cell in snake_body:
+            self.occupy(cell)
+        for cell in self.obstacles:
+            self.occupy(cell)
+                    
+    def in_bounds(self, cell):
+        """Check if a cell lies on the board."""
+        return 0 <= cell[0] < self.grid_width and 0 <= cell[1] < self.grid_height
+        
+    def occupy(self, cell):
+        """Remove a cell from the free pool."""
+        # Occupied cells keep their key with index -1, so the dict never
+        # grows and is never rebuilt as cells come and go
+        index = self.free_index.get(cell, -1)
+        if index < 0:
+            return
+        self.free_index[cell] = -1
+        
+        # Swap the last free cell into the hole
+        last = self.free_cells.pop()
+        if index < len(self.free_cells):
+            self.free_cells[index] = last
+            self.free_index[last] = index
+            
+    def release(self, cell):
+        """Return a cell to the free pool."""
+        if (self.free_index.get(cell, -1) >= 0 or cell in self.obstacles or
+            not self.in_bounds(cell)):
+            return
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+        
+    def advance(self, head, tail=None):
+        """Track one snake move: the tail vacates, the head enters."""
+        if tail is not None:
+            self.release(tail)
+        self.occupy(head)
+        
+    def get_free_count(self):
+        """Get number of cells not covered by snake or obstacles."""
+        return len(self.free_cells)
+        
+    def is_safe(self, cell, head, blocked=(), distance=None):
+        """Check if a free cell is an acceptable obstacle spot.
+        
+        distance is an optional cell -> path length from the head; without
+        it the Manhattan distance is used.
+        """
+        if cell in blocked:
+            return False
+        if distance is not None:
+            return distance(cell) > self.min_head_distance
+        manhattan = abs(cell[0] - head[0]) + abs(cell[1] - head[1])
+        return manhattan > self.min_head_distance
+        
+    def place(self, head, blocked=(), distance=None, attempts=50):
+        """Place one obstacle and return its cell, or None if impossible."""
+        if not self.free_cells:
+            return None
+            
+        # Random sampling is O(1) per draw and almost always succeeds
+        for _ in range(attempts):
+            cell = self.free_cells[self.rng.randrange(len(self.free_cells))]
+            if self.is_safe(cell, head, blocked, distance) and self.keeps_connected(cell):
+                self._add_obstacle(cell)
+                return cell
+                
+        # Crowded board: try every remaining free cell once
+        candidates = list(self.free_cells)
+        self.rng.shuffle(candidates)
+        for cell in candidates:
+            if self.is_safe(cell, head, blocked, distance) and self.keeps_connected(cell):
+                self._add_obstacle(cell)
+                return cell
+                
+        return None
+        
+    def _add_obstacle(self, cell):
+        """Mark a cell as an obstacle."""
+        self.occupy(cell)
+        self.obstacles.add(cell)
+        
+    def _is_open(self, cell):
+        """Check if a cell is walkable (on board and not an obstacle)."""
+        return self.in_bounds(cell) and cell not in self.obstacles
+        
+    def keeps_connected(self, cell):
+        """Check that blocking a cell leaves all open cells connected."""
+        x, y = cell
+        ring = [self._is_open((x + dx, y + dy)) for dx, dy in RING_OFFSETS]
+        
+        # Orthogonal neighbours sit at even ring positions; two consecutive
+        # ones are joined around the cell when the diagonal between them is open
+        open_sides = 0
+        links = 0
+        for i in range(0, 8, 2):
+            if ring[i]:
+                open_sides += 1
+                if ring[i + 1] and ring[(i + 2) % 8]:
+                    links += 1
+                    
+        groups = 1 if links == 4 else open_sides - links
+        if groups <= 1:
+            return True
+            
+        # The neighbourhood is split locally; confirm globally with a flood fill
+        return self._flood_fill_count(cell) == (
+            self.grid_width * self.grid_height - len(self.obstacles) - 1)
+            
+    def _flood_fill_count(self, blocked_cell):
+        """Count open cells reachable from a neighbour of blocked_cell."""
+        start = None
+        for dx, dy in RING_OFFSETS[::2]:
+            neighbour = (blocked_cell[0] + dx, blocked_cell[1] + dy)
+            if self._is_open(neighbour):
+                start = neighbour
+                break
+        if start is None:
+            return 0
+            
+        seen = {start, blocked_cell}
+        queue = deque([start])
+        while queue:
+            cx, cy = queue.popleft()
+            for dx, dy in RING_OFFSETS[::2]:
+                neighbour = (cx + dx, cy + dy)
+                if neighbour not in seen and self._is_open(neighbour):
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+                    
+        return len(seen) - 1
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Adaptive visual quality governor for the Snake Odyssey game.
+"""
+
+from config import (QUALITY_TIERS, QUALITY_FRAME_BUDGET_MS, QUALITY_DOWNGRADE_LOAD,
+                   QUALITY_UPGRADE_LOAD, QUALITY_DOWNGRADE_FRAMES, QUALITY_UPGRADE_FRAMES,
+                   QUALITY_SETTLE_FRAMES, QUALITY_SMOOTHING)
+
+class QualityGovernor:
+    """Picks a visual quality tier from measured frame times.
+    
+    Every frame reports how long its work took. The governor keeps a
+    smoothed average and drops one tier once it stays above the
+    downgrade load for a while, and raises one tier only after a much
+    longer run below the far lower upgrade load. A raise that has to be
+    undone soon after makes the next raise wait twice as long, so a
+    machine sitting between two tiers does not flip back and forth. A
+    manual override pins the tier until automatic mode is chosen again.
+    """
+    
+    def __init__(self, budget_ms=QUALITY_FRAME_BUDGET_MS, tiers=QUALITY_TIERS):
+        """Initialize governor at the best tier in automatic mode."""
+        self.budget_ms = budget_ms
+        self.tiers = tiers
+        self.tier = 0
+        self.override = None  # Tier index pinned by the user, or None for automatic
+        self.average_ms = None
+        self.over_frames = 0
+        self.under_frames = 0
+        self.settle_frames = 0
+        self.frames_since_raise = None
+        self.upgrade_frames = QUALITY_UPGRADE_FRAMES
+        self.changes = 0
+        
+    def get_tier(self):
+        """Get the settings of the active tier."""
+        return self.tiers[self.tier]
+        
+    def get_label(self):
+        """Get a short description of the tier for the HUD."""
+        mode = 'auto' if self.override is None else 'fixed'
+        return f"Quality: {self.tiers[self.tier]['name']} ({mode})"
+        
+    def record_frame(self, frame_ms):
+        """Feed one frame's work time; returns True if the tier changed."""
+        if self.override is not None:
+            return False
+        if self.frames_since_raise is not None:
+            self.frames_since_raise += 1
+        if self.settle_frames:
+            self.settle_frames -= 1
+            return False
+            
+        # One long frame (loading, a window drag) must not look like load
+        frame_ms = min(frame_ms, 2 * self.budget_ms)
+        if self.average_ms is None:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * QUALITY_SMOOTHING
+            
+        load = self.average_ms / self.budget_ms
+        self.over_frames = self.over_frames + 1 if load > QUALITY_DOWNGRADE_LOAD else 0
+        self.under_frames = self.under_frames + 1 if load < QUALITY_UPGRADE_LOAD else 0
+        
+        if self.over_frames >= QUALITY_DOWNGRADE_FRAMES and self.tier < len(self.tiers) - 1:
+            if self.frames_since_raise is not None and self.frames_since_raise < self.upgrade_frames:
+                self.upgrade_frames = min(self.upgrade_frames * 2, QUALITY_UPGRADE_FRAMES * 16)
+            self.frames_since_raise = None
+            self._set_tier(self.tier + 1)
+            return True
+        if self.under_frames >= self.upgrade_frames and self.tier > 0:
+            self.frames_since_raise = 0
+            self._set_tier(self.tier - 1)
+            return True
+        return False
+        
+    def _set_tier(self, tier):
+        """Switch tiers and start measuring afresh."""
+        self.tier = tier
+        self.average_ms = None
+        self.over_frames = 0
+        self.under_frames = 0
+        self.settle_frames = QUALITY_SETTLE_FRAMES
+        self.changes += 1
+        
+    def set_override(self, tier):
+        """Pin a tier index, or pass None to return to automatic mode."""
+        self.override = tier
+        self._set_tier(self.tier if tier is None else tier)
+        
+    def cycle_override(self):
+        """Step through automatic mode and each fixed tier, best first."""
+        if self.override is None:
+            self.set_override(0)
+        elif self.override < len(self.tiers) - 1:
+            self.set_override(self.override + 1)
+        else:
+            self.set_override(None)
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""
+Keyframed game replays for the Snake Odyssey game.
+"""
+
+import os
+import glob
+import time
+from array import array
+from bisect import bisect_right
+from itertools import chain
+import numpy as np
+from config import (DIRECTIONS, THEMES, BOARD_WIDTH, BOARD_HEIGHT, DATA_DIR, REPLAY_DIR,
+                   REPLAY_KEEP, REPLAY_KEYFRAME_INTERVAL, REPLAY_MIN_SPEED, REPLAY_MAX_SPEED,
+                   MAX_FRAME_MS)
+from components.snake import Snake
+from components.food import Food
+from components.game_clock import GameClock
+from managers.score_manager import ScoreManager
+
+DIRECTION_LIST = list(DIRECTIONS.values())
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTION_LIST)}
+
+# A move byte holds the direction code in its low two bits plus what was eaten
+ATE_FOOD = 4
+ATE_BONUS = 8
+
+# Event kinds; theme events store the theme code in x
+EVENT_FOOD = 0
+EVENT_BONUS = 1  # at (-1, -1) when the bonus food is gone
+EVENT_OBSTACLE = 2
+EVENT_THEME = 3
+NO_CELL = (-1, -1)
+
+# Integers stored per keyframe; 'cells' is where its body and obstacles start
+KEYFRAME_FIELDS = ('tick', 'event_index', 'time', 'direction', 'grow', 'food_x', 'food_y',
+                   'bonus_x', 'bonus_y', 'bonus_start', 'score', 'food_eaten', 'bonus_eaten',
+                   'theme', 'length', 'obstacle_count', 'cells')
+REPLAY_VERSION = 1
+
+class ReplayState:
+    """Game objects at one tick of a replay, shaped like the live game's."""
+    
+    def __init__(self):
+        """Initialize empty state; a replay positions it with seek()."""
+        self.clock = GameClock()
+        self.snake = Snake(0, 0, THEMES['forest']['snake_color'])
+        self.food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=self.clock)
+        self.score_manager = ScoreManager(persistent=False)
+        self.obstacles = []
+        self.theme = None
+        self.tick = None
+        self.event_index = 0
+        self.last_tail = None
+        
+    def set_theme(self, theme):
+        """Switch theme and snake color."""
+        self.theme = theme
+        self.snake.color = THEMES[theme]['snake_color']
+
+class Replay:
+    """A recorded game: one move byte per tick, sparse events and keyframes.
+    
+    Food, bonus, obstacle and theme changes are stored as events, so
+    playback needs no random generator. Every `interval` ticks a keyframe
+    holds the full state; seeking restores the keyframe at or before the
+    target and replays at most interval - 1 moves, however long the game.
+    All data lives in flat arrays, so files load with a few memory copies.
+    """
+    
+    def __init__(self, themes=None, interval=REPLAY_KEYFRAME_INTERVAL):
+        """Initialize empty replay."""
+        self.themes = list(themes or THEMES)
+        self.interval = interval
+        self.moves = bytearray()
+        self.times = array('I', [0])  # game milliseconds at each tick
+        self.events = array('i')  # tick, kind, x, y per event
+        self.keyframes = array('q')  # KEYFRAME_FIELDS per keyframe
+        self.cells = array('h')  # keyframe bodies and obstacles as x, y pairs
+        
+    def get_tick_count(self):
+        """Get the number of moves; ticks run from 0 to this."""
+        return len(self.moves)
+        
+    def get_duration(self):
+        """Get the game time of the last tick in milliseconds."""
+        return self.times[-1]
+        
+    def tick_at(self, time_ms):
+        """Get the last tick at or before a game time."""
+        return max(0, bisect_right(self.times, time_ms) - 1)
+        
+    def seek(self, state, tick):
+        """Move a state to any tick; returns True if a keyframe was restored."""
+        tick = min(max(tick, 0), len(self.moves))
+        restored = state.tick is None or not 0 <= tick - state.tick < self.interval
+        if restored:
+            keyframe_count = len(self.keyframes) // len(KEYFRAME_FIELDS)
+            self.restore(state, min(tick // self.interval, keyframe_count - 1))
+        while state.tick < tick:
+            self.step(state)
+        return restored
+        
+    def restore(self, state, index):
+        """Load keyframe number index into a state."""
+        size = len(KEYFRAME_FIELDS)
+        frame = dict(zip(KEYFRAME_FIELDS, self.keyframes[index * size:(index + 1) * size]))
+        start = frame['cells']
+        end = start + 2 * frame['length']
+        body = self.cells[start:end]
+        obstacles = self.cells[end:end + 2 * frame['obstacle_count']]
+        
+        snake = state.snake
+        snake.body = list(zip(body[0::2], body[1::2]))
+        snake.direction = DIRECTION_LIST[frame['direction']]
+        snake.grow_next = bool(frame['grow'])
+        state.obstacles = list(zip(obstacles[0::2], obstacles[1::2]))
+        
+        food = state.food
+        food.regular_food = (frame['food_x'], frame['food_y']) if frame['food_x'] >= 0 else None
+        food.bonus_food = (frame['bonus_x'], frame['bonus_y']) if frame['bonus_x'] >= 0 else None
+        food.bonus_timer = frame['bonus_start'] / 1000.0 if food.bonus_food else 0
+        
+        score_manager = state.score_manager
+        score_manager.current_score = frame['score']
+        score_manager.food_eaten = frame['food_eaten']
+        score_manager.bonus_food_eaten = frame['bonus_eaten']
+        
+        state.set_theme(self.themes[frame['theme']])
+        state.tick = frame['tick']
+        state.event_index = frame['event_index']
+        state.clock.time = frame['time']
+        state.last_tail = None
+        
+    def step(self, state):
+        """Apply the move after state.tick and the events of the next tick."""
+        code = self.moves[state.tick]
+        snake = state.snake
+        snake.direction = DIRECTION_LIST[code & 3]
+        state.last_tail = snake.move()
+        if code & ATE_FOOD:
+            snake.grow()
+            state.score_manager.add_regular_food_score()
+        if code & ATE_BONUS:
+            snake.grow()
+            state.score_manager.add_bonus_food_score()
+            
+        tick = state.tick + 1
+        state.tick = tick
+        state.clock.time = self.times[tick]
+        
+        events = self.events
+        index = state.event_index
+        while index < len(events) and events[index] == tick:
+            kind, x, y = events[index + 1:index + 4]
+            if kind == EVENT_FOOD:
+                state.food.regular_food = (x, y) if x >= 0 else None
+            elif kind == EVENT_BONUS:
+                state.food.bonus_food = (x, y) if x >= 0 else None
+                state.food.bonus_timer = state.clock.get_seconds() if x >= 0 else 0
+            elif kind == EVENT_OBSTACLE:
+                state.obstacles.append((x, y))
+            elif kind == EVENT_THEME:
+                state.set_theme(self.themes[x])
+            index += 4
+        state.event_index = index
+        
+    def save(self, path):
+        """Write the replay to a file, replacing it atomically."""
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, version=REPLAY_VERSION, themes=np.array(self.themes),
+                     interval=self.interval,
+                     moves=np.frombuffer(self.moves, dtype=np.uint8),
+                     times=np.frombuffer(self.times, dtype=np.uint32),
+                     events=np.frombuffer(self.events, dtype=np.int32),
+                     keyframes=np.frombuffer(self.keyframes, dtype=np.int64),
+                     cells=np.frombuffer(self.cells, dtype=np.int16))
+        os.replace(temp_path, path)
+        
+    @classmethod
+    def load(cls, path):
+        """Read a replay written by save()."""
+        with np.load(path) as data:
+            replay = cls(data['themes'].tolist(), int(data['interval']))
+            replay.moves = bytearray(data['moves'].tobytes())
+            replay.times = array('I', data['times'].astype(np.uint32).tobytes())
+            replay.events = array('i', data['events'].astype(np.int32).tobytes())
+            replay.keyframes = array('q', data['keyframes'].astype(np.int64).tobytes())
+            replay.cells = array('h', data['cells'].astype(np.int16).tobytes())
+        return replay
+
+class ReplayRecorder:
+    """Records a live game by comparing its objects after every move."""
+    
+    def __init__(self, snake, food, score_manager, obstacles, theme_manager, start_time,
+                 interval=REPLAY_KEYFRAME_INTERVAL):
+        """Start recording; start_time is the game time of tick 0 in milliseconds."""
+        self.replay = Replay(interval=interval)
+        self.snake = snake
+        self.food = food
+        self.score_manager = score_manager
+        self.obstacles = obstacles
+        self.theme_manager = theme_manager
+        self.start_time = start_time
+        
+        # What the replay has seen so far
+        self.food_cell = food.regular_food
+        self.bonus_cell = food.bonus_food
+        self.obstacle_count = len(obstacles)
+        self.theme = theme_manager.current_theme
+        self.food_eaten = score_manager.food_eaten
+        self.bonus_eaten = score_manager.bonus_food_eaten
+        self._add_keyframe()
+        
+    def record_move(self, time_ms):
+        """Record the move the game just made at game time time_ms."""
+        replay = self.replay
+        score_manager = self.score_manager
+        code = DIRECTION_CODES[self.snake.direction]
+        if score_manager.food_eaten != self.food_eaten:
+            self.food_eaten = score_manager.food_eaten
+            code |= ATE_FOOD
+        if score_manager.bonus_food_eaten != self.bonus_eaten:
+            self.bonus_eaten = score_manager.bonus_food_eaten
+            code |= ATE_BONUS
+        replay.moves.append(code)
+        replay.times.append(int(time_ms - self.start_time))
+        tick = len(replay.moves)
+        
+        # Random outcomes become events
+        events = replay.events
+        if self.food.regular_food != self.food_cell:
+            self.food_cell = self.food.regular_food
+            events.extend((tick, EVENT_FOOD) + (self.food_cell or NO_CELL))
+        if self.food.bonus_food != self.bonus_cell:
+            self.bonus_cell = self.food.bonus_food
+            events.extend((tick, EVENT_BONUS) + (self.bonus_cell or NO_CELL))
+        while self.obstacle_count < len(self.obstacles):
+            events.extend((tick, EVENT_OBSTACLE) + tuple(self.obstacles[self.obstacle_count]))
+            self.obstacle_count += 1
+        if self.theme_manager.current_theme != self.theme:
+            self.theme = self.theme_manager.current_theme
+            events.extend((tick, EVENT_THEME, replay.themes.index(self.theme), 0))
+            
+        if tick % replay.interval == 0:
+            self._add_keyframe()
+            
+    def _add_keyframe(self):
+        """Store the full current state as a keyframe."""
+        replay = self.replay
+        snake = self.snake
+        food = self.food
+        score_manager = self.score_manager
+        bonus_start = 0
+        if food.bonus_food:
+            bonus_start = round(food.bonus_timer * 1000 - self.start_time)
+            
+        replay.keyframes.extend((
+            len(replay.moves), len(replay.events), replay.times[-1],
+            DIRECTION_CODES[snake.direction], int(snake.grow_next))
+            + (food.regular_food or NO_CELL) + (food.bonus_food or NO_CELL) + (
+            bonus_start, score_manager.current_score, score_manager.food_eaten,
+            score_manager.bonus_food_eaten, replay.themes.index(self.theme),
+            len(snake.body), len(self.obstacles), len(replay.cells)))
+        replay.cells.extend(chain.from_iterable(snake.body))
+        replay.cells.extend(chain.from_iterable(self.obstacles))
+
+class ReplayPlayer:
+    """Plays a replay at 0.25x to 64x real time, with scrubbing.
+    
+    Playback moves a game-time position and seeks the state to it once per
+    frame, so at high speeds the ticks between two frames are replayed but
+    never drawn.
+    """
+    
+    def __init__(self, replay):
+        """Initialize player at tick 0, playing at normal speed."""
+        self.replay = replay
+        self.state = ReplayState()
+        self.position = 0.0  # game milliseconds
+        self.speed = 1.0
+        self.playing = True
+        self.restored = replay.seek(self.state, 0)
+        
+    def update(self, real_ms):
+        """Advance by a real frame; returns True if the state changed."""
+        if self.playing:
+            duration = self.replay.get_duration()
+            self.position = min(self.position + min(real_ms, MAX_FRAME_MS) * self.speed,
+                                duration)
+            if self.position >= duration:
+                self.playing = False
+        return self._sync()
+        
+    def _sync(self):
+        """Seek the state to the tick at the current position."""
+        previous = self.state.tick
+        self.restored = self.replay.seek(self.state, self.replay.tick_at(self.position))
+        return self.restored or self.state.tick != previous
+        
+    def set_speed(self, speed):
+        """Set the playback speed, clamped to the supported range."""
+        self.speed = min(REPLAY_MAX_SPEED, max(REPLAY_MIN_SPEED, speed))
+        
+    def toggle(self):
+        """Pause or resume; resuming at the end starts over."""
+        if not self.playing and self.position >= self.replay.get_duration():
+            self.position = 0.0
+        self.playing = not self.playing
+        
+    def seek_time(self, time_ms):
+        """Jump to a game time; returns True if the state changed."""
+        self.position = min(max(time_ms, 0), self.replay.get_duration())
+        return self._sync()
+        
+    def seek_fraction(self, fraction):
+        """Jump to a fraction of the game (0 to 1), as from a progress bar."""
+        return self.seek_time(fraction * self.replay.get_duration())
+        
+    def step(self, count):
+        """Pause and move by whole ticks."""
+        self.playing = False
+        tick = min(max(self.state.tick + count, 0), self.replay.get_tick_count())
+        self.position = float(self.replay.times[tick])
+        return self._sync()
+        
+    def get_progress(self):
+        """Get the position as a fraction of the game."""
+        duration = self.replay.get_duration()
+        return self.position / duration if duration else 1.0
+
+def store_replay(replay, directory=None, keep=REPLAY_KEEP):
+    """Save a finished game's replay, deleting all but the newest keep files.
+    
+    Returns the path of the new file.
+    """
+    directory = directory or os.path.join(DATA_DIR, REPLAY_DIR)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, time.strftime('%Y%m%d-%H%M%S') +
+                        f"-{time.time_ns() % 1000000:06d}.replay.npz")
+    replay.save(path)
+    for old_path in sorted(glob.glob(os.path.join(directory, '*.replay.npz')))[:-keep]:
+        os.remove(old_path)
+    return path
\ No newline at end of file
@@ -4,6 +4,7 @@ Snake component for the Snake Odyssey game.
 
 import pygame
 from config import CELL_SIZE, DIRECTIONS
+from components.cells import get_cell
 
 class Snake:
     """Represents the snake entity in the game."""
@@ -16,18 +17,22 @@ class Snake:
         self.grow_next = False
         
     def move(self):
-        """Move the snake in the current direction."""
+        """Move the snake in the current direction.
+        
+        Returns the vacated tail cell, or None when the snake grew.
+        """
         head = self.body[0]
-        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        direction = self.direction
+        new_head = get_cell(head[0] + direction[0], head[1] + direction[1])
         
         # Add new head
         self.body.insert(0, new_head)
         
         # Remove tail unless growing
         if not self.grow_next:
-            self.body.pop()
-        else:
-            self.grow_next = False
+            return self.body.pop()
+        self.grow_next = False
+        return None
             
     def change_direction(self, new_direction):
         """Change snake direction if valid."""
@@ -49,8 +54,8 @@ class Snake:
             head[1] < 0 or head[1] >= board_height // CELL_SIZE):
             return True
             
-        # Self collision
-        if head in self.body[1:]:
+        # Self collision; counting avoids copying the body
+        if self.body.count(head) > 1:
             return True
             
         return False
@@ -60,8 +65,21 @@ class Snake:
         head = self.body[0]
         return head in obstacles
         
-    def draw(self, surface, board_x, board_y):
-        """Draw the snake on the surface."""
+    def draw(self, surface, board_x, board_y, sprites=None):
+        """Draw the snake on the surface.
+        
+        With a sprite set from SpriteManager the whole body is drawn in one
+        batched blit call instead of two primitives per segment.
+        """
+        if sprites:
+            body_sprite = sprites['body']
+            surface.blits([(body_sprite, (board_x + x * CELL_SIZE, board_y + y * CELL_SIZE))
+                           for x, y in self.body[1:]], False)
+            head = self.body[0]
+            surface.blit(sprites['head'][self.direction],
+                         (board_x + head[0] * CELL_SIZE, board_y + head[1] * CELL_SIZE))
+            return
+            
         for i, segment in enumerate(self.body):
             x = board_x + segment[0] * CELL_SIZE
             y = board_y + segment[1] * CELL_SIZE
@@ -90,6 +108,10 @@ class Snake:
         """Get the position of the snake's head."""
         return self.body[0]
         
+    def get_occupancy(self):
+        """Get the body as a container for membership tests."""
+        return self.body
+        
     def get_length(self):
         """Get the current length of the snake."""
         return len(self.body)
\ No newline at end of file
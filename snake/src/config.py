@@ -13,6 +13,11 @@ BOARD_HEIGHT = 600
 BOARD_X = (SCREEN_WIDTH - BOARD_WIDTH) // 2
 BOARD_Y = (SCREEN_HEIGHT - BOARD_HEIGHT) // 2
 CELL_SIZE = 20
+GRID_WIDTH = BOARD_WIDTH // CELL_SIZE
+GRID_HEIGHT = BOARD_HEIGHT // CELL_SIZE
+BOARD_BACKEND = 'list'  # 'list' (tuple cells) or 'bitboard'
+RENDERER = 'pygame'  # 'pygame', 'terminal' (ANSI, e.g. over SSH) or 'null'
+RENDER_THREADS = 0  # threads drawing board, particle and HUD layers beside the main thread; 0 draws in turn
 
 # Colors
 BLACK = (0, 0, 0)
@@ -30,11 +35,108 @@ DARK_GRAY = (64, 64, 64)
 INITIAL_SPEED = 8
 SPEED_INCREMENT = 0.5
 MAX_SPEED = 20
+BASE_MOVE_DELAY = 150  # milliseconds per move at 1.0x speed
+MIN_MOVE_DELAY = 80
 SCORE_PER_FOOD = 10
 BONUS_SCORE = 20
 BONUS_TIMER = 9  # seconds
 DIFFICULTY_MILESTONE = 100  # points
 OBSTACLE_START_SCORE = 200
+OBSTACLE_HEAD_DISTANCE = 3  # min cells between new obstacle and head
+
+# Keyboard input
+INPUT_BUFFER_SIZE = 3  # direction presses queued ahead of the snake
+INPUT_EARLY_TURNS = False  # a queued turn may make the next move early
+INPUT_EARLY_TURN_FRACTION = 0.5  # share of the move delay that must pass first
+INPUT_LATENCY_SAMPLES = 1000  # recent input-to-move latencies kept for stats
+
+# Heatmap analytics
+HEATMAP_LEVELS = 10  # difficulty levels tracked; higher levels count as the last
+HEATMAP_FLUSH_SIZE = 65536  # buffered visits before they are added to the arrays
+HEATMAP_LOCK_TIMEOUT = 60  # seconds after which a compaction lock counts as abandoned
+
+# Replays
+REPLAY_KEYFRAME_INTERVAL = 64  # ticks between full-state keyframes
+REPLAY_MIN_SPEED = 0.25
+REPLAY_MAX_SPEED = 64.0
+REPLAY_SEEK_MS = 5000  # game time skipped by one scrub key press
+REPLAY_KEEP = 20  # most recent replay files kept on disk
+
+# Video export of replays
+EXPORT_FPS = 60
+EXPORT_QUEUE_FRAMES = 8  # captured frames waiting for the writer thread
+EXPORT_ENCODER = 'ffmpeg'  # encoder reading raw frames on stdin
+EXPORT_VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.mov')  # others get PNG frames
+EXPORT_PNG_LEVEL = 1  # zlib level of PNG frames; higher is smaller but slower
+EXPORT_PNG_WORKERS = 4  # threads encoding PNG frames
+
+# Saved sessions
+SESSION_CHECKPOINT_MS = 2000  # real time between background saves of the game in play
+
+# Virtual game clock
+CLOCK_MIN_SCALE = 0.25
+CLOCK_MAX_SCALE = 1000.0
+MAX_FRAME_MS = 250  # longer real frames (e.g. window drags) are clamped
+
+# Adaptive visual quality, from best to cheapest tier
+QUALITY_TIERS = [
+    {'name': 'High', 'particles': 1.0, 'animated': True, 'grid': True, 'alpha_step': 1},
+    {'name': 'Medium', 'particles': 0.5, 'animated': True, 'grid': True, 'alpha_step': 16},
+    {'name': 'Low', 'particles': 0.25, 'animated': False, 'grid': True, 'alpha_step': 32},
+    {'name': 'Minimal', 'particles': 0.0, 'animated': False, 'grid': False, 'alpha_step': 64},
+]
+QUALITY_FRAME_BUDGET_MS = 1000 / FPS
+QUALITY_DOWNGRADE_LOAD = 0.85  # share of the budget that counts as overloaded
+QUALITY_UPGRADE_LOAD = 0.45  # share of the budget that leaves room for the next tier up
+QUALITY_DOWNGRADE_FRAMES = 30  # overloaded frames in a row before dropping a tier
+QUALITY_UPGRADE_FRAMES = 180  # frames with headroom in a row before raising a tier
+QUALITY_SETTLE_FRAMES = 10  # frames ignored after a change (caches rebuild)
+QUALITY_SMOOTHING = 0.1  # weight of the newest frame in the average
+FRAME_STATS_SAMPLES = 3600  # recent frame times kept for statistics
+
+# Garbage collection: frozen after startup, full collections only on still screens
+GC_CONTROL = True
+GC_PLAY_THRESHOLDS = (10000, 50, 1000000)  # gen0 allocations, gen0 and gen1 runs; huge = never
+
+# Idle screens (menus, pause, game over) sleep instead of redrawing every frame
+IDLE_MODE = True
+IDLE_ANIMATION_FPS = 10  # background animation rate while idle; 0 keeps it still
+
+# Autopilot search settings
+MCTS_WORKERS = 2
+MCTS_TIME_FRACTION = 0.6  # share of each move delay spent searching
+
+# Heuristic bot and its evolutionary tuner
+BOT_WEIGHTS = {'free_space': 1.0, 'tail_distance': -0.2, 'food_distance': -1.0}  # untuned
+TUNER_POPULATION = 16  # weight vectors per generation
+TUNER_GENERATIONS = 20
+TUNER_GAMES = 4  # seeded games per weight vector and generation
+TUNER_LEVELS = 10  # difficulty levels tuned; a theme gets the levels mix mode shows it at
+TUNER_MAX_MOVES = 2000  # moves before a game is cut off
+TUNER_ELITE = 2  # best vectors copied unchanged into the next generation
+TUNER_MUTATION = 0.15  # standard deviation of weight mutations
+TUNER_WORKERS = None  # worker processes; None uses every core, 0 evaluates in-process
+
+# Audio settings
+SOUND_VOLUME = 0.5
+AMBIENT_VOLUME = 0.2
+AMBIENT_FADE_MS = 800
+SOUND_MEMORY_BUDGET = 8 * 1024 * 1024  # bytes of synthesized audio kept cached
+
+# Leaderboard sync
+LEADERBOARD_URL = None  # e.g. 'http://localhost:8765'; None keeps scores queued locally
+LEADERBOARD_BATCH_SIZE = 100  # entries per upload request
+LEADERBOARD_MIN_BACKOFF = 0.5  # seconds before the first retry
+LEADERBOARD_MAX_BACKOFF = 60.0
+LEADERBOARD_TIMEOUT = 5.0  # seconds per request
+
+# Classic mode (the original sorce.py rules)
+CLASSIC_BLOCK_SIZE = 10
+CLASSIC_SPEED_LEVELS = {'Easy': 15, 'Normal': 30, 'Hard': 45}  # moves per second
+CLASSIC_BACKGROUND = (50, 153, 213)
+CLASSIC_SNAKE_COLOR = (0, 0, 0)
+CLASSIC_FOOD_COLOR = (0, 255, 0)
+CLASSIC_MESSAGE_COLOR = (213, 50, 80)
 
 # Theme definitions
 THEMES = {
@@ -101,4 +203,11 @@ DIRECTIONS = {
 # File paths
 DATA_DIR = 'data'
 SCORES_FILE = 'high_scores.json'
-SETTINGS_FILE = 'settings.json'
\ No newline at end of file
+SETTINGS_FILE = 'settings.json'
+HISTORY_DIR = 'history'  # columnar archive of every finished game
+HEATMAP_DIR = 'heatmaps'  # per-cell visit and death counts
+REPLAY_DIR = 'replays'  # keyframed recordings of recent games
+LEADERBOARD_DIR = 'leaderboard'  # score submissions waiting for upload
+SESSION_FILE = 'session.bin'  # the interrupted game, restored paused on the next start
+BOT_WEIGHTS_FILE = 'bot_weights.json'  # best tuned bot weights per theme
+TUNER_DIR = 'tuning'  # tuner populations, checkpointed every generation
\ No newline at end of file
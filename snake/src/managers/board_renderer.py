@@ -0,0 +1,127 @@
+"""
+Board Renderer for Snake Odyssey.
+Keeps a persistent board layer that is updated incrementally each tick.
+"""
+
+import pygame
+from config import BOARD_WIDTH, BOARD_HEIGHT, CELL_SIZE, GRID_WIDTH, GRID_HEIGHT, THEMES
+from components.cells import get_cell_positions
+
+class BoardRenderer:
+    """Draws the game board from a cached background and snake layer.
+    
+    The layer holds the background, obstacles and snake. A move repaints
+    only the new head, the previous head and the vacated tail, so the cost
+    per tick does not depend on the snake length. The layer is rebuilt
+    only when the sprites change (theme or snake color) or when it falls
+    out of step with the game, e.g. after a new game starts.
+    """
+    
+    def __init__(self, sprite_manager, width=BOARD_WIDTH, height=BOARD_HEIGHT):
+        """Initialize board renderer."""
+        self.sprite_manager = sprite_manager
+        self.width = width
+        self.height = height
+        self.background = None
+        self.layer = None
+        self.sprites = None
+        self.grid = True
+        self.positions = get_cell_positions(0, 0)  # Cell corners on the layer
+        self.cell_rect = pygame.Rect(0, 0, CELL_SIZE, CELL_SIZE)
+        self.board_rect = pygame.Rect(0, 0, width, height)  # Where the board is drawn
+        
+        # What the layer currently shows
+        self.head = None
+        self.length = 0
+        self.obstacle_count = 0
+        self.rebuild_count = 0
+        
+    def invalidate(self):
+        """Force a full rebuild on the next draw."""
+        self.layer = None
+        
+    def set_grid(self, enabled):
+        """Show or hide the grid lines, rebuilding the layer if that changes."""
+        if enabled != self.grid:
+            self.grid = enabled
+            self.invalidate()
+            
+    def build_background(self, theme):
+        """Render the empty board with its grid lines, if shown."""
+        background = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        background.fill(theme['background_color'])
+        if not self.grid:
+            return background
+        for x in range(0, self.width, CELL_SIZE):
+            pygame.draw.line(background, theme['accent_color'],
+                           (x, 0), (x, self.height), 1)
+        for y in range(0, self.height, CELL_SIZE):
+            pygame.draw.line(background, theme['accent_color'],
+                           (0, y), (self.width, y), 1)
+        return background
+        
+    def rebuild(self, theme_name, snake, obstacles):
+        """Repaint the whole layer from scratch."""
+        self.background = self.build_background(THEMES[theme_name])
+        self.layer = self.background.copy()
+        
+        obstacle_sprite = self.sprites['obstacle']
+        self.layer.blits([(obstacle_sprite, (x * CELL_SIZE, y * CELL_SIZE))
+                          for x, y in obstacles], False)
+        self.obstacle_count = len(obstacles)
+        
+        snake.draw(self.layer, 0, 0, self.sprites)
+        self.head = snake.body[0]
+        self.length = len(snake.body)
+        self.rebuild_count += 1
+        
+    def on_snake_move(self, snake, tail):
+        """Apply one move to the layer; tail is the vacated cell or None."""
+        if self.layer is None:
+            return
+        body = snake.body
+        positions = self.positions
+        if tail is not None:
+            rect = self.cell_rect
+            rect.topleft = positions[tail[1]][tail[0]]
+            self.layer.blit(self.background, rect, rect)
+        if len(body) > 1:
+            neck = body[1]
+            self.layer.blit(self.sprites['body'], positions[neck[1]][neck[0]])
+        head = body[0]
+        
+        # A fatal move into a wall leaves the head off the board
+        if 0 <= head[0] < GRID_WIDTH and 0 <= head[1] < GRID_HEIGHT:
+            self.layer.blit(self.sprites['head'][snake.direction], positions[head[1]][head[0]])
+        self.head = head
+        self.length = len(body)
+        
+    def draw(self, surface, board_x, board_y, theme_name, snake, food, obstacles):
+        """Draw the board, food on top, at the given screen position."""
+        theme = THEMES[theme_name]
+        sprites = self.sprite_manager.get_sprites(theme_name, snake.color)
+        if (self.layer is None or sprites is not self.sprites or snake.body[0] != self.head or
+                len(snake.body) != self.length or len(obstacles) < self.obstacle_count):
+            self.sprites = sprites
+            self.rebuild(theme_name, snake, obstacles)
+            
+        # Obstacles are only ever added during a game
+        if len(obstacles) > self.obstacle_count:
+            obstacle_sprite = sprites['obstacle']
+            self.layer.blits([(obstacle_sprite, (x * CELL_SIZE, y * CELL_SIZE))
+                              for x, y in obstacles[self.obstacle_count:]], False)
+            self.obstacle_count = len(obstacles)
+            
+        board_rect = self.board_rect
+        if board_rect.x != board_x or board_rect.y != board_y:
+            board_rect.topleft = (board_x, board_y)
+        surface.blit(self.layer, board_rect)
+        
+        # Food animates every frame, so it stays off the layer
+        if food:
+            previous_clip = surface.get_clip()
+            surface.set_clip(board_rect)
+            food.draw(surface, board_x, board_y, theme, sprites)
+            surface.set_clip(previous_clip)
\ No newline at end of file
@@ -4,21 +4,52 @@ Main game engine that coordinates all components.
 """
 
 import pygame
-import random
 import time
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BOARD_WIDTH, BOARD_HEIGHT,
-                   BOARD_X, BOARD_Y, CELL_SIZE, DIRECTIONS, BLACK, WHITE, THEMES)
+                   BOARD_X, BOARD_Y, CELL_SIZE, DIRECTIONS, BLACK, WHITE, THEMES,
+                   BASE_MOVE_DELAY, MIN_MOVE_DELAY, BOARD_BACKEND, CLASSIC_SPEED_LEVELS,
+                   GRID_WIDTH, GRID_HEIGHT, HEATMAP_LEVELS, REPLAY_SEEK_MS, RENDERER,
+                   IDLE_MODE, IDLE_ANIMATION_FPS, INPUT_EARLY_TURN_FRACTION, EXPORT_FPS,
+                   EXPORT_ENCODER)
 from components.snake import Snake
 from components.food import Food
+from components.obstacle_placer import ObstaclePlacer
+from components.distance_field import DistanceField
+from components.bitboard import BitboardSnake, CellMask
+from components.game_state import GameState
+from components.classic_game import ClassicGame
+from components.game_clock import GameClock
+from components.replay import ReplayRecorder, ReplayPlayer, store_replay
+from components.quality_governor import QualityGovernor
+from components.input_buffer import InputBuffer
+from components.frame_stats import FrameStats
+from components.gc_control import GCController
+from ai.autopilot import Autopilot
+from ai.mcts import MCTSController
+from ai.heuristic import HeuristicBot
 from managers.theme_manager import ThemeManager
 from managers.score_manager import ScoreManager
 from managers.ui_manager import UIManager
+from managers.sprite_manager import SpriteManager
+from managers.board_renderer import BoardRenderer
+from managers.sound_manager import SoundManager
+from managers.history_manager import HistoryManager
+from managers.heatmap_manager import HeatmapManager
+from managers.leaderboard_manager import LeaderboardManager
+from managers.session_manager import SessionManager
+from renderers.renderer import Frame, NullRenderer
+from renderers.pygame_renderer import PygameRenderer
+from renderers.terminal_renderer import TerminalRenderer
+from renderers.video_writer import open_writer
+
+# States whose screen changes only on input, transitions and animation ticks
+IDLE_STATES = ('menu', 'game_over', 'paused', 'classic_over', 'heatmap')
 
 class GameManager:
     """Main game engine managing all game systems."""
     
-    def __init__(self):
-        """Initialize game manager."""
+    def __init__(self, renderer=None):
+        """Initialize game manager; renderer names a RENDERER backend."""
         # Initialize pygame
         pygame.init()
         pygame.mixer.init()
@@ -30,52 +61,180 @@ class GameManager:
         
         # Game state
         self.running = True
-        self.state = 'menu'  # 'menu', 'playing', 'paused', 'game_over'
+        self.state = 'menu'  # 'menu', 'playing', 'paused', 'game_over', 'classic', 'classic_over', 'heatmap', 'replay'
+        self.redraw_needed = True
+        self.drawn_state = None
+        self.idle_mode = IDLE_MODE
+        
+        # Virtual time for the session; all game timers run on it
+        self.game_clock = GameClock()
         
         # Initialize managers
-        self.theme_manager = ThemeManager()
+        self.theme_manager = ThemeManager(self.game_clock)
         self.score_manager = ScoreManager()
+        self.history_manager = HistoryManager()
+        self.heatmap_manager = HeatmapManager()
+        self.heatmap_manager.load()
+        self.heatmap_view = {'kind': 'deaths', 'theme': None, 'level': None}
+        self.leaderboard_manager = LeaderboardManager()
+        self.session_manager = SessionManager()
         self.ui_manager = UIManager()
+        self.sprite_manager = SpriteManager()
+        self.board_renderer = BoardRenderer(self.sprite_manager)
+        self.quality_governor = QualityGovernor()
+        self.frame_stats = FrameStats()
+        self.gc_controller = GCController()
+        self.frame = Frame()
+        self.renderer = self.create_renderer(renderer or RENDERER)
+        self.sound_manager = SoundManager()
+        self.sound_manager.warm_up(self.theme_manager.current_theme)
         
         # Game objects
         self.snake = None
         self.food = None
         self.obstacles = []
+        self.obstacle_cells = set()
         self.particles = []
+        self.obstacle_placer = ObstaclePlacer()
+        self.input_buffer = InputBuffer()
+        self.distance_field = DistanceField()
+        self.autopilot = Autopilot(self.distance_field)
+        self.autopilot_enabled = False
+        self.mcts = None
+        self.mcts_enabled = False
+        self.bot = None
+        self.bot_enabled = False
+        
+        # Classic mode, one game object reused for every round
+        self.classic = None
+        self.classic_level = 'Normal'
+        self.classic_standalone = False  # Q on the lose screen quits the program
+        self.last_classic_move = 0
         
         # Game timing
         self.last_move_time = 0
-        self.move_delay = 150  # milliseconds
+        self.game_start_time = 0
+        self.move_delay = BASE_MOVE_DELAY  # milliseconds
         self.last_bonus_spawn = 0
         
         # Mix mode tracking
         self.last_mix_change = 0
         
+        # Replays of the current game and of the one being watched
+        self.replay_recorder = None
+        self.replay_player = None
+        self.replay_return_theme = None
+        
+        # Everything made so far lives as long as the program
+        self.gc_controller.freeze()
+        
     def run(self):
         """Main game loop."""
-        while self.running:
-            time_delta = self.clock.tick(FPS) / 1000.0
-            
-            self.handle_events()
-            self.update(time_delta)
-            self.draw()
+        try:
+            while self.running:
+                # Full collections wait for a still screen, before the frame starts
+                self.gc_controller.set_active(self.state not in IDLE_STATES)
+                idle = self.is_idle()
+                first_event = None
+                if idle and not self.redraw_needed:
+                    # Nothing moves on screen: sleep until an event or animation tick
+                    first_event = pygame.event.wait(self.get_idle_timeout())
+                    if first_event.type == pygame.NOEVENT:
+                        first_event = None
+                        self.redraw_needed = self.get_animation_interval() > 0
+                        
+                # Idle frames are not held back, so input is answered at once
+                throttled = not (idle or self.game_clock.unthrottled)
+                time_delta = self.clock.tick(FPS if throttled else 0) / 1000.0
+                
+                # Time only the frame's own work, not the wait for the next one
+                frame_start = time.perf_counter()
+                self.gc_controller.take_frame_pause()
+                self.handle_events(first_event)
+                self.update(time_delta)
+                if idle and not self.redraw_needed and self.state == self.drawn_state:
+                    continue
+                self.draw()
+                self.redraw_needed = False
+                self.drawn_state = self.state
+                if idle:
+                    continue
+                frame_ms = (time.perf_counter() - frame_start) * 1000
+                self.frame_stats.record(frame_ms, self.gc_controller.take_frame_pause())
+                if self.quality_governor.record_frame(frame_ms):
+                    self.apply_quality()
+        finally:
+            # Also on Ctrl+C, so the terminal renderer can restore the terminal
+            self.renderer.close()
+            if self.mcts:
+                self.mcts.shutdown()
+            self.sound_manager.shutdown()
+            self.leaderboard_manager.shutdown()
+            self.session_manager.shutdown(self.get_session_game())
+            self.gc_controller.shutdown()
+            pygame.quit()
             
-        pygame.quit()
-        
-    def handle_events(self):
-        """Handle all game events."""
-        for event in pygame.event.get():
+    def is_idle(self):
+        """Check whether the screen can wait for events instead of redrawing."""
+        if not self.idle_mode or self.state not in IDLE_STATES:
+            return False
+        if self.state == 'paused':
+            # Game time stands still, but particles finish flying
+            return not self.particles
+        return not self.theme_manager.transitioning
+        
+    def get_animation_interval(self):
+        """Get milliseconds between idle animation frames; 0 if the screen is still."""
+        if (IDLE_ANIMATION_FPS and self.state in ('menu', 'game_over', 'heatmap') and
+                self.theme_manager.is_animated()):
+            return int(1000 / IDLE_ANIMATION_FPS)
+        return 0
+        
+    def get_idle_timeout(self):
+        """Get how long an idle frame may wait for events; 0 waits for input."""
+        intervals = [ms for ms in (self.get_animation_interval(), self.renderer.input_poll_ms) if ms]
+        return min(intervals) if intervals else 0
+        
+    def create_renderer(self, name):
+        """Create the renderer backend of the given name."""
+        if name == 'terminal':
+            return TerminalRenderer()
+        if name == 'null':
+            return NullRenderer()
+        return PygameRenderer(self.screen, self.theme_manager, self.board_renderer,
+                              self.ui_manager, self.game_clock, self.quality_governor)
+                              
+    def handle_events(self, first_event=None):
+        """Handle all game events, starting with first_event if given."""
+        events = pygame.event.get()
+        if first_event is not None:
+            events.insert(0, first_event)
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type != pygame.MOUSEMOTION:
+                # Keys, clicks and window events may change an idle screen
+                self.redraw_needed = True
                 
             # UI event handling
             ui_element = self.ui_manager.handle_event(event)
             if ui_element:
                 self.handle_ui_event(ui_element)
+            if self.ui_manager.hover_changed:
+                self.ui_manager.hover_changed = False
+                self.redraw_needed = True
                 
             # Game controls
             if event.type == pygame.KEYDOWN:
                 self.handle_keydown(event.key)
+            elif self.state == 'replay' and event.type in (pygame.MOUSEBUTTONDOWN,
+                                                           pygame.MOUSEMOTION):
+                self.handle_replay_mouse(event)
+                
+        # Keys typed into a terminal renderer
+        for key in self.renderer.poll_keys():
+            self.handle_keydown(key)
+            self.redraw_needed = True
                 
     def handle_ui_event(self, ui_element):
         """Handle UI element interactions."""
@@ -84,6 +243,12 @@ class GameManager:
         if self.ui_manager.get_current_menu() == 'main':
             if element_text == 'Start Game':
                 self.start_game()
+            elif element_text == 'Classic Mode':
+                self.ui_manager.setup_classic_menu()
+            elif element_text == 'Heatmaps':
+                self.heatmap_manager.load()
+                self.ui_manager.clear_menu()
+                self.state = 'heatmap'
             elif element_text == 'Select Theme':
                 self.ui_manager.setup_theme_menu(self.theme_manager)
             elif element_text == 'High Scores':
@@ -106,6 +271,12 @@ class GameManager:
                         break
                 self.ui_manager.setup_main_menu()
                 
+        elif self.ui_manager.get_current_menu() == 'classic':
+            if element_text == 'Back':
+                self.ui_manager.setup_main_menu()
+            elif element_text in CLASSIC_SPEED_LEVELS:
+                self.start_classic(element_text)
+                
         elif self.ui_manager.get_current_menu() == 'scores':
             if element_text == 'Back':
                 self.ui_manager.setup_main_menu()
@@ -113,62 +284,352 @@ class GameManager:
         elif self.ui_manager.get_current_menu() == 'game_over':
             if element_text == 'Play Again':
                 self.start_game()
+            elif element_text == 'Replay':
+                self.start_replay(self.replay_recorder.replay)
             elif element_text == 'Main Menu':
                 self.state = 'menu'
                 self.ui_manager.setup_main_menu()
                 
     def handle_keydown(self, key):
         """Handle keyboard input."""
+        if self.state in ('playing', 'classic') and self.handle_clock_key(key):
+            return
+        if key == pygame.K_g and self.state not in ('classic', 'classic_over'):
+            # Cycle automatic quality and each fixed tier
+            self.quality_governor.cycle_override()
+            self.apply_quality()
+            return
+            
         if self.state == 'playing':
-            # Snake movement
+            # Snake movement, queued until the moves that take it
+            now = self.game_clock.time
             if key == pygame.K_UP or key == pygame.K_w:
-                self.snake.change_direction(DIRECTIONS['UP'])
+                self.input_buffer.push(DIRECTIONS['UP'], now)
             elif key == pygame.K_DOWN or key == pygame.K_s:
-                self.snake.change_direction(DIRECTIONS['DOWN'])
+                self.input_buffer.push(DIRECTIONS['DOWN'], now)
             elif key == pygame.K_LEFT or key == pygame.K_a:
-                self.snake.change_direction(DIRECTIONS['LEFT'])
+                self.input_buffer.push(DIRECTIONS['LEFT'], now)
             elif key == pygame.K_RIGHT or key == pygame.K_d:
-                self.snake.change_direction(DIRECTIONS['RIGHT'])
+                self.input_buffer.push(DIRECTIONS['RIGHT'], now)
             elif key == pygame.K_p:
                 self.state = 'paused'
+                self.game_clock.pause()
+                self.session_manager.checkpoint(self, force=True)
+            elif key == pygame.K_TAB:
+                self.autopilot_enabled = not self.autopilot_enabled
+            elif key == pygame.K_m:
+                # Autopilot plans with tree search instead of greedy paths
+                self.mcts_enabled = not self.mcts_enabled
+                if self.mcts_enabled and self.mcts is None:
+                    self.mcts = MCTSController()
+            elif key == pygame.K_b:
+                # Autopilot weighs free space, tail and food with the tuned weights
+                self.bot_enabled = not self.bot_enabled
+                if self.bot_enabled and self.bot is None:
+                    self.bot = HeuristicBot.load()
                 
         elif self.state == 'paused':
             if key == pygame.K_p:
                 self.state = 'playing'
+                self.game_clock.resume()
+                
+        elif self.state == 'classic':
+            if key == pygame.K_LEFT:
+                self.classic.change_direction(DIRECTIONS['LEFT'])
+            elif key == pygame.K_RIGHT:
+                self.classic.change_direction(DIRECTIONS['RIGHT'])
+            elif key == pygame.K_UP:
+                self.classic.change_direction(DIRECTIONS['UP'])
+            elif key == pygame.K_DOWN:
+                self.classic.change_direction(DIRECTIONS['DOWN'])
+                
+        elif self.state == 'classic_over':
+            if key == pygame.K_c:
+                self.start_classic(self.classic_level)
+            elif key == pygame.K_q:
+                if self.classic_standalone:
+                    self.running = False
+                else:
+                    self.state = 'menu'
+                    self.ui_manager.setup_main_menu()
+                    
+        elif self.state == 'heatmap':
+            self.handle_heatmap_key(key)
+            
+        elif self.state == 'replay':
+            self.handle_replay_key(key)
+            
+        elif self.state == 'game_over' and not self.renderer.draws_menus:
+            # The renderer cannot show the menu buttons
+            if key == pygame.K_r:
+                self.start_game()
+            elif key in (pygame.K_q, pygame.K_ESCAPE):
+                self.running = False
                 
         elif self.state == 'menu':
             if key == pygame.K_ESCAPE:
                 self.running = False
                 
+    def handle_heatmap_key(self, key):
+        """Change the heatmap viewer's selection."""
+        view = self.heatmap_view
+        themes = [None] + list(THEMES)
+        levels = [None] + list(range(HEATMAP_LEVELS))
+        if key == pygame.K_TAB:
+            view['kind'] = 'visits' if view['kind'] == 'deaths' else 'deaths'
+        elif key in (pygame.K_LEFT, pygame.K_RIGHT):
+            step = 1 if key == pygame.K_RIGHT else -1
+            view['theme'] = themes[(themes.index(view['theme']) + step) % len(themes)]
+        elif key in (pygame.K_UP, pygame.K_DOWN):
+            step = 1 if key == pygame.K_UP else -1
+            view['level'] = levels[(levels.index(view['level']) + step) % len(levels)]
+        elif key == pygame.K_ESCAPE:
+            self.state = 'menu'
+            self.ui_manager.setup_main_menu()
+            
+    def handle_replay_key(self, key):
+        """Handle replay viewer playback keys."""
+        player = self.replay_player
+        if key == pygame.K_SPACE:
+            player.toggle()
+        elif key == pygame.K_LEFT:
+            player.seek_time(player.position - REPLAY_SEEK_MS)
+        elif key == pygame.K_RIGHT:
+            player.seek_time(player.position + REPLAY_SEEK_MS)
+        elif key == pygame.K_COMMA:
+            player.step(-1)
+        elif key == pygame.K_PERIOD:
+            player.step(1)
+        elif key == pygame.K_HOME:
+            player.seek_time(0)
+        elif key == pygame.K_END:
+            player.seek_time(player.replay.get_duration())
+        elif key == pygame.K_LEFTBRACKET:
+            player.set_speed(player.speed / 2)
+        elif key == pygame.K_RIGHTBRACKET:
+            player.set_speed(player.speed * 2)
+        elif key == pygame.K_0:
+            player.set_speed(1.0)
+        elif key == pygame.K_ESCAPE:
+            self.stop_replay()
+            
+    def handle_replay_mouse(self, event):
+        """Scrub the replay by clicking or dragging on the progress bar."""
+        bar = self.ui_manager.replay_bar_rect
+        if event.type == pygame.MOUSEMOTION and not event.buttons[0]:
+            return
+        if bar.inflate(0, 16).collidepoint(event.pos):
+            self.replay_player.seek_fraction((event.pos[0] - bar.x) / bar.width)
+            
+    def handle_clock_key(self, key):
+        """Handle game speed keys; returns True if the key was used."""
+        if key == pygame.K_RIGHTBRACKET:
+            self.game_clock.set_scale(self.game_clock.scale * 2)
+        elif key == pygame.K_LEFTBRACKET:
+            self.game_clock.set_scale(self.game_clock.scale / 2)
+        elif key == pygame.K_0:
+            self.game_clock.set_scale(1.0)
+            self.game_clock.set_unthrottled(False)
+        elif key == pygame.K_u:
+            self.game_clock.set_unthrottled(not self.game_clock.unthrottled)
+        else:
+            return False
+        return True
+        
+    def apply_quality(self):
+        """Hand the governor's current tier to the renderers."""
+        quality = self.quality_governor.get_tier()
+        self.theme_manager.set_quality(quality)
+        self.board_renderer.set_grid(quality['grid'])
+        
     def start_game(self):
         """Initialize and start a new game."""
         self.state = 'playing'
+        self.game_clock.resume()
         self.score_manager.reset_score()
         
         # Create snake
         start_x = (BOARD_WIDTH // CELL_SIZE) // 2
         start_y = (BOARD_HEIGHT // CELL_SIZE) // 2
         theme = self.theme_manager.get_current_theme()
-        self.snake = Snake(start_x, start_y, theme['snake_color'])
-        
-        # Create food system
-        self.food = Food(BOARD_WIDTH, BOARD_HEIGHT)
-        self.food.spawn_regular_food(self.snake.body, self.obstacles)
-        
+        if BOARD_BACKEND == 'bitboard':
+            self.snake = BitboardSnake(start_x, start_y, theme['snake_color'])
+            self.obstacle_cells = CellMask(self.snake.board)
+        else:
+            self.snake = Snake(start_x, start_y, theme['snake_color'])
+            self.obstacle_cells = set()
+            
         # Reset obstacles and particles
         self.obstacles = []
         self.particles = []
+        self.obstacle_placer.reset(self.snake.body)
+        
+        # Create food system
+        self.food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=self.game_clock)
+        self.food.spawn_regular_food(self.snake.get_occupancy(), self.obstacle_cells)
+        self.distance_field.reset(self.snake.body, self.obstacles,
+                                  (self.food.regular_food, self.food.bonus_food))
         
         # Reset timing
-        self.last_move_time = pygame.time.get_ticks()
+        self.last_move_time = self.game_clock.get_ticks()
+        self.game_start_time = self.game_clock.time
         self.last_bonus_spawn = 0
         self.last_mix_change = 0
+        self.input_buffer.clear()
+        
+        # New game, new board layer
+        self.board_renderer.invalidate()
+        self.replay_recorder = ReplayRecorder(self.snake, self.food, self.score_manager,
+                                              self.obstacles, self.theme_manager,
+                                              self.last_move_time)
         
         # Clear UI
         self.ui_manager.clear_menu()
         
+    def resume_session(self):
+        """Restore the saved session, paused; returns False if there is none."""
+        session = self.session_manager.load()
+        if session is None:
+            return False
+        self.theme_manager.set_theme(session['theme'])
+        if session['mix_mode']:
+            self.theme_manager.enable_mix_mode()
+        else:
+            self.theme_manager.disable_mix_mode()
+        self.start_game()
+        
+        snake = self.snake
+        snake.body = session['body']
+        snake.direction = session['direction']
+        snake.grow_next = session['grow_next']
+        if BOARD_BACKEND == 'bitboard':
+            snake.body_mask = CellMask(snake.board, snake.body)
+        for cell in session['obstacles']:
+            self.obstacles.append(cell)
+            self.obstacle_cells.add(cell)
+        self.obstacle_placer.reset(snake.body, self.obstacles)
+        
+        now = self.game_clock.time
+        food = self.food
+        food.regular_food = session['food']
+        food.bonus_food = session['bonus_food']
+        if food.bonus_food:
+            food.bonus_timer = now / 1000.0 - (food.bonus_duration - session['bonus_remaining'])
+        score_manager = self.score_manager
+        score_manager.current_score = session['score']
+        score_manager.food_eaten = session['food_eaten']
+        score_manager.bonus_food_eaten = session['bonus_eaten']
+        self.distance_field.reset(snake.body, self.obstacles, (food.regular_food, food.bonus_food))
+        self.last_move_time = now - session['move_phase']
+        self.game_start_time = now - session['elapsed']
+        
+        # The replay of a resumed game starts at the resume point
+        self.replay_recorder = ReplayRecorder(snake, food, score_manager, self.obstacles,
+                                              self.theme_manager, self.last_move_time)
+        self.state = 'paused'
+        self.game_clock.pause()
+        return True
+        
+    def get_session_game(self):
+        """Get self if a game is in progress and should be saved, else None."""
+        return self if self.state in ('playing', 'paused') and self.snake else None
+        
+    def start_replay(self, replay):
+        """Open the replay viewer on a recorded game."""
+        self.replay_player = ReplayPlayer(replay)
+        self.replay_return_theme = self.theme_manager.current_theme
+        self.particles = []
+        self.board_renderer.invalidate()
+        self.ui_manager.clear_menu()
+        self.state = 'replay'
+        
+    def stop_replay(self):
+        """Leave the replay viewer for the main menu."""
+        self.theme_manager.current_theme = self.replay_return_theme
+        self.board_renderer.invalidate()
+        self.state = 'menu'
+        self.ui_manager.setup_main_menu()
+        
+    def update_replay(self, time_delta):
+        """Advance replay playback by one real frame."""
+        player = self.replay_player
+        previous_tick = player.state.tick
+        player.update(time_delta * 1000)
+        
+        # A single move can be painted onto the board layer; anything
+        # else is redrawn from scratch once, whatever was skipped
+        if not player.restored and player.state.tick == previous_tick + 1:
+            self.board_renderer.on_snake_move(player.state.snake, player.state.last_tail)
+        self.theme_manager.current_theme = player.state.theme
+        
+    def export_replay(self, replay, path, fps=EXPORT_FPS, start_ms=0, end_ms=None,
+                      encoder=EXPORT_ENCODER):
+        """Render a replay, or the part from start_ms to end_ms, into a video file.
+        
+        Frames are drawn as fast as the machine allows, not in real time.
+        Returns the writer, whose path says where the frames went.
+        """
+        self.start_replay(replay)
+        player = self.replay_player
+        end_ms = replay.get_duration() if end_ms is None else min(end_ms, replay.get_duration())
+        player.seek_time(start_ms)
+        self.theme_manager.current_theme = player.state.theme
+        frame_ms = 1000 / fps
+        writer = open_writer(path, self.screen, fps, encoder)
+        try:
+            for frame in range(int((end_ms - start_ms) / frame_ms) + 1):
+                if frame:
+                    self.game_clock.advance(frame_ms)
+                    self.update_replay(frame_ms / 1000)
+                self.draw_replay(show_bar=False)
+                writer.capture(self.screen)
+        finally:
+            writer.close()
+            self.stop_replay()
+        return writer
+        
+    def start_classic(self, level):
+        """Start a classic mode round at the given speed level."""
+        if self.classic is None:
+            self.classic = ClassicGame()
+        self.classic.reset()
+        self.classic_level = level
+        self.last_classic_move = self.game_clock.get_ticks()
+        self.game_clock.resume()
+        self.state = 'classic'
+        self.ui_manager.clear_menu()
+        
+    def update_classic(self):
+        """Move the classic snake at its level's fixed rate."""
+        move_delay = 1000 / CLASSIC_SPEED_LEVELS[self.classic_level]
+        while self.game_clock.time - self.last_classic_move >= move_delay:
+            self.last_classic_move += move_delay
+            if not self.classic.step():
+                self.state = 'classic_over'
+                self.redraw_needed = True
+                break
+                
+    def get_next_move_time(self):
+        """Get the game time of the next scheduled move."""
+        if self.state == 'classic':
+            return self.last_classic_move + 1000 / CLASSIC_SPEED_LEVELS[self.classic_level]
+        move_time = self.last_move_time + self.move_delay
+        if self.input_buffer.early_turns and not self.autopilot_enabled:
+            # A queued turn is taken as soon as part of the delay has passed
+            pressed = self.input_buffer.next_turn_time(self.snake.direction)
+            if pressed is not None:
+                early = self.last_move_time + self.move_delay * INPUT_EARLY_TURN_FRACTION
+                move_time = min(move_time, max(early, pressed))
+        return move_time
+        
     def update(self, time_delta):
         """Update game state."""
+        # Advance game time with the real frame, or straight to the next move
+        if self.game_clock.unthrottled and self.state in ('playing', 'classic'):
+            self.game_clock.advance_to(self.get_next_move_time())
+        else:
+            self.game_clock.advance(time_delta * 1000)
+            
         if self.state == 'menu' or self.state == 'game_over':
             self.ui_manager.update(time_delta)
             self.theme_manager.update_transition()
@@ -176,15 +637,20 @@ class GameManager:
         elif self.state == 'playing':
             self.update_game(time_delta)
             
+        elif self.state == 'classic':
+            self.update_classic()
+            
+        elif self.state == 'replay':
+            self.update_replay(time_delta)
+            
         elif self.state == 'paused':
             # Only update particles and theme transitions during pause
+            self.sound_manager.stop_ambient()
             self.theme_manager.update_transition()
             self.theme_manager.update_particles(self.particles)
             
     def update_game(self, time_delta):
         """Update game logic during gameplay."""
-        current_time = pygame.time.get_ticks()
-        
         # Update theme transitions and particles
         self.theme_manager.update_transition()
         self.theme_manager.update_particles(self.particles)
@@ -196,98 +662,164 @@ class GameManager:
         # Update snake color based on current theme
         theme = self.theme_manager.get_current_theme()
         self.snake.color = theme['snake_color']
-        
-        # Calculate move delay based on score
-        base_delay = 150
-        speed_multiplier = self.score_manager.get_speed_multiplier()
-        self.move_delay = max(80, int(base_delay / speed_multiplier))
-        
-        # Move snake
-        if current_time - self.last_move_time > self.move_delay:
-            self.snake.move()
-            self.last_move_time = current_time
+        self.heatmap_manager.set_context(self.theme_manager.current_theme,
+                                         self.score_manager.get_difficulty_level())
+        self.sound_manager.update_ambient(self.theme_manager.current_theme)
+        
+        # Make every move that fell due since the last frame; at high
+        # time scales that is several per frame
+        while self.state == 'playing':
+            # Calculate move delay based on score
+            speed_multiplier = self.score_manager.get_speed_multiplier()
+            self.move_delay = max(MIN_MOVE_DELAY, int(BASE_MOVE_DELAY / speed_multiplier))
+            move_time = self.get_next_move_time()
+            if self.game_clock.time < move_time:
+                break
+            self.last_move_time = move_time
+            self.move_snake()
+            if self.state == 'playing':  # game_over records the fatal move itself
+                self.replay_recorder.record_move(self.last_move_time)
             
-            # Check collisions
-            if self.snake.check_collision(BOARD_WIDTH, BOARD_HEIGHT):
-                self.game_over()
-                return
-                
-            if self.snake.check_obstacle_collision(self.obstacles):
-                self.game_over()
-                return
-                
-            # Check food consumption
-            regular_eaten, bonus_eaten = self.food.check_food_eaten(self.snake.get_head_position())
-            
-            if regular_eaten:
-                self.snake.grow()
-                self.score_manager.add_regular_food_score()
-                
-                # Create eating particles
-                head_pos = self.snake.get_head_position()
-                screen_pos = (BOARD_X + head_pos[0] * CELL_SIZE + CELL_SIZE // 2,
-                             BOARD_Y + head_pos[1] * CELL_SIZE + CELL_SIZE // 2)
-                particles = self.theme_manager.create_particle_effect(screen_pos, 'eat')
-                self.particles.extend(particles)
-                
-                # Spawn new regular food
-                self.food.spawn_regular_food(self.snake.body, self.obstacles)
-                
-                # Check for bonus food spawn
-                if self.score_manager.should_spawn_bonus():
-                    self.food.spawn_bonus_food(self.snake.body, self.obstacles)
-                    
-            if bonus_eaten:
-                self.snake.grow()
-                self.score_manager.add_bonus_food_score()
-                
-                # Create bonus particles
-                head_pos = self.snake.get_head_position()
-                screen_pos = (BOARD_X + head_pos[0] * CELL_SIZE + CELL_SIZE // 2,
-                             BOARD_Y + head_pos[1] * CELL_SIZE + CELL_SIZE // 2)
-                particles = self.theme_manager.create_particle_effect(screen_pos, 'bonus')
-                self.particles.extend(particles)
-                
         # Update food system
         self.food.update_bonus_food()
+        self.distance_field.set_food((self.food.regular_food, self.food.bonus_food))
+        
+        # Keep the session on disk in case the machine sleeps or reboots
+        if self.state == 'playing':
+            self.session_manager.checkpoint(self)
+        
+    def move_snake(self):
+        """Make one move at game time last_move_time."""
+        now = self.last_move_time / 1000.0
+        if self.autopilot_enabled:
+            direction = None
+            if self.mcts_enabled:
+                direction = self.mcts.best_direction()
+            elif self.bot_enabled:
+                state = GameState.from_game(self.snake, self.food,
+                                            self.score_manager, self.obstacles)
+                direction = self.bot.choose_direction(state, self.theme_manager.current_theme)
+            if direction is None:
+                direction = self.autopilot.choose_direction(self.snake)
+            self.snake.change_direction(direction)
+        else:
+            self.input_buffer.apply(self.snake, self.last_move_time)
+            
+        tail = self.snake.move()
+        self.obstacle_placer.advance(self.snake.get_head_position(), tail)
+        
+        # Check collisions
+        if self.snake.check_collision(BOARD_WIDTH, BOARD_HEIGHT):
+            head = self.snake.get_head_position()
+            inside = 0 <= head[0] < GRID_WIDTH and 0 <= head[1] < GRID_HEIGHT
+            self.game_over('self' if inside else 'wall')
+            return
+            
+        if self.snake.check_obstacle_collision(self.obstacle_cells):
+            self.game_over('obstacle')
+            return
+            
+        self.distance_field.on_snake_move(self.snake.get_head_position(), tail)
+        self.board_renderer.on_snake_move(self.snake, tail)
+        self.heatmap_manager.record_visit(self.snake.get_head_position())
         
-        # Update obstacles
-        self.update_obstacles()
+        # Bonus food may expire between two moves of the same frame
+        self.food.update_bonus_food(now)
         
-    def update_obstacles(self):
-        """Update obstacle system."""
-        target_count = self.score_manager.get_obstacle_count()
+        # Check food consumption
+        regular_eaten, bonus_eaten = self.food.check_food_eaten(self.snake.get_head_position())
         
-        if len(self.obstacles) < target_count:
-            # Add new obstacle
-            attempts = 0
-            while attempts < 50:  # Prevent infinite loop
-                x = random.randint(0, (BOARD_WIDTH // CELL_SIZE) - 1)
-                y = random.randint(0, (BOARD_HEIGHT // CELL_SIZE) - 1)
-                pos = (x, y)
+        if regular_eaten:
+            self.snake.grow()
+            self.score_manager.add_regular_food_score()
+            self.sound_manager.play('eat', self.theme_manager.current_theme)
+            
+            # Create eating particles
+            head_pos = self.snake.get_head_position()
+            screen_pos = (BOARD_X + head_pos[0] * CELL_SIZE + CELL_SIZE // 2,
+                         BOARD_Y + head_pos[1] * CELL_SIZE + CELL_SIZE // 2)
+            particles = self.theme_manager.create_particle_effect(screen_pos, 'eat')
+            self.particles.extend(particles)
+            
+            # Spawn new regular food
+            self.food.spawn_regular_food(self.snake.get_occupancy(), self.obstacle_cells)
+            
+            # Check for bonus food spawn
+            if self.score_manager.should_spawn_bonus():
+                self.food.spawn_bonus_food(self.snake.get_occupancy(), self.obstacle_cells, now)
                 
-                # Check if position is safe
-                if (pos not in self.snake.body and 
-                    pos != self.food.regular_food and 
-                    pos != self.food.bonus_food and
-                    pos not in self.obstacles):
-                    
-                    # Don't place too close to snake head
-                    head = self.snake.get_head_position()
-                    distance = abs(pos[0] - head[0]) + abs(pos[1] - head[1])
-                    if distance > 3:
-                        self.obstacles.append(pos)
-                        break
-                        
-                attempts += 1
+        if bonus_eaten:
+            self.snake.grow()
+            self.score_manager.add_bonus_food_score()
+            self.sound_manager.play('bonus', self.theme_manager.current_theme)
+            
+            # Create bonus particles
+            head_pos = self.snake.get_head_position()
+            screen_pos = (BOARD_X + head_pos[0] * CELL_SIZE + CELL_SIZE // 2,
+                         BOARD_Y + head_pos[1] * CELL_SIZE + CELL_SIZE // 2)
+            particles = self.theme_manager.create_particle_effect(screen_pos, 'bonus')
+            self.particles.extend(particles)
+            
+        # Obstacle count only changes with the score
+        if regular_eaten or bonus_eaten:
+            self.update_obstacles()
+            
+        # Plan the next move while waiting for it
+        if self.autopilot_enabled and self.mcts_enabled:
+            state = GameState.from_game(self.snake, self.food,
+                                        self.score_manager, self.obstacles)
+            self.mcts.start_search(state, self.move_delay / self.game_clock.scale)
+            
+    def update_obstacles(self):
+        """Add obstacles until the score-based target count is reached."""
+        target_count = self.score_manager.get_obstacle_count()
+        head = self.snake.get_head_position()
+        blocked = (self.food.regular_food, self.food.bonus_food)
+        
+        while len(self.obstacles) < target_count:
+            pos = self.obstacle_placer.place(head, blocked,
+                                             self.distance_field.head_distance)
+            if pos is None:
+                break  # No cell left that keeps the board connected
+            self.obstacles.append(pos)
+            self.obstacle_cells.add(pos)
+            self.distance_field.on_obstacle_added(pos)
                 
-    def game_over(self):
+    def game_over(self, cause='other'):
         """Handle game over."""
         self.state = 'game_over'
+        self.sound_manager.stop_ambient()
+        self.session_manager.discard()
+        self.sound_manager.play('game_over', self.theme_manager.current_theme)
         
         # Save high score
         current_theme = self.theme_manager.current_theme
-        self.score_manager.save_high_score(current_theme)
+        score_entry = self.score_manager.save_high_score(current_theme)
+        
+        # Archive the game for statistics; the replay ends with the death.
+        # Each store fails on its own, so one bad write loses no other record
+        self.replay_recorder.record_move(self.last_move_time)
+        self.heatmap_manager.record_death(self.snake.get_head_position())
+        try:
+            self.leaderboard_manager.submit(current_theme, score_entry)
+        except Exception as e:
+            print(f"Error queueing leaderboard entry: {e}")
+        try:
+            self.heatmap_manager.save()
+        except Exception as e:
+            print(f"Error saving heatmaps: {e}")
+        try:
+            store_replay(self.replay_recorder.replay)
+        except Exception as e:
+            print(f"Error saving replay: {e}")
+        try:
+            self.history_manager.append(
+                self.score_manager.get_current_score(), self.snake.get_length(),
+                self.score_manager.get_food_count(), self.score_manager.get_bonus_count(),
+                (self.game_clock.time - self.game_start_time) / 1000.0,
+                current_theme, cause, self.snake.get_head_position())
+        except Exception as e:
+            print(f"Error archiving game: {e}")
         
         # Setup game over UI
         self.ui_manager.setup_game_over_menu(self.score_manager, current_theme)
@@ -297,68 +829,69 @@ class GameManager:
         # Clear screen
         self.screen.fill(BLACK)
         
-        if self.state == 'menu' or self.state == 'game_over':
+        if self.state == 'menu' or (self.state == 'game_over' and self.renderer.draws_menus):
             # Draw themed background for menus
             self.theme_manager.draw_background(self.screen, SCREEN_WIDTH, SCREEN_HEIGHT)
             self.ui_manager.draw(self.screen)
             
-        elif self.state == 'playing' or self.state == 'paused':
+        elif self.state in ('playing', 'paused', 'game_over'):
             self.draw_game()
             
-            if self.state == 'paused':
-                self.ui_manager.draw_pause_overlay(self.screen)
-                
+        elif self.state == 'classic':
+            self.classic.draw(self.screen, BOARD_X, BOARD_Y)
+            self.ui_manager.draw_classic_score(self.screen, self.classic.get_score(),
+                                               BOARD_X, BOARD_Y)
+                                               
+        elif self.state == 'classic_over':
+            self.ui_manager.draw_classic_lose_screen(self.screen, self.classic.get_score(),
+                                                     BOARD_X, BOARD_Y, BOARD_WIDTH, BOARD_HEIGHT)
+            
+        elif self.state == 'heatmap':
+            self.draw_heatmap()
+            
+        elif self.state == 'replay':
+            self.draw_replay()
+            
         pygame.display.flip()
         
     def draw_game(self):
-        """Draw game elements during gameplay."""
-        # Draw themed background
+        """Draw game elements during gameplay through the renderer."""
+        self.frame.update(self.theme_manager.current_theme, self.snake, self.food,
+                          self.obstacles, self.score_manager, self.particles,
+                          self.distance_field, self.state)
+        self.renderer.render(self.frame)
+        
+    def draw_heatmap(self):
+        """Draw the heatmap viewer over the board."""
         self.theme_manager.draw_background(self.screen, SCREEN_WIDTH, SCREEN_HEIGHT)
-        
-        # Draw game board border
-        theme = self.theme_manager.get_current_theme()
         pygame.draw.rect(self.screen, WHITE, 
                         (BOARD_X - 2, BOARD_Y - 2, BOARD_WIDTH + 4, BOARD_HEIGHT + 4), 2)
-        
-        # Fill game board
-        board_surface = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT))
-        board_surface.fill(theme['background_color'])
-        
-        # Draw grid lines
-        for x in range(0, BOARD_WIDTH, CELL_SIZE):
-            pygame.draw.line(board_surface, theme['accent_color'], 
-                           (x, 0), (x, BOARD_HEIGHT), 1)
-        for y in range(0, BOARD_HEIGHT, CELL_SIZE):
-            pygame.draw.line(board_surface, theme['accent_color'], 
-                           (0, y), (BOARD_WIDTH, y), 1)
-        
-        # Draw obstacles
-        for obstacle in self.obstacles:
-            x = obstacle[0] * CELL_SIZE
-            y = obstacle[1] * CELL_SIZE
-            pygame.draw.rect(board_surface, theme['obstacle_color'],
-                           (x, y, CELL_SIZE, CELL_SIZE))
-            pygame.draw.rect(board_surface, WHITE,
-                           (x, y, CELL_SIZE, CELL_SIZE), 1)
-        
-        # Draw food
-        if self.food:
-            self.food.draw(board_surface, 0, 0, theme)
-            
-        # Draw snake
-        if self.snake:
-            self.snake.draw(board_surface, 0, 0)
-            
-        # Blit board to main screen
-        self.screen.blit(board_surface, (BOARD_X, BOARD_Y))
-        
-        # Draw particles
-        self.theme_manager.draw_particles(self.screen, self.particles)
-        
-        # Draw HUD
-        self.ui_manager.draw_game_hud(self.screen, self.score_manager, 
-                                     self.theme_manager, self.food)
+        view = self.heatmap_view
+        self.screen.blit(self.heatmap_manager.render(**view), (BOARD_X, BOARD_Y))
+        total = int(self.heatmap_manager.get_counts(**view).sum())
+        self.ui_manager.draw_heatmap_caption(self.screen, view['kind'], view['theme'],
+                                             view['level'], total)
+                                             
+    def draw_replay(self, show_bar=True):
+        """Draw the replay viewer: the recorded board, its HUD and the progress bar."""
+        state = self.replay_player.state
+        self.theme_manager.draw_background(self.screen, SCREEN_WIDTH, SCREEN_HEIGHT)
+        pygame.draw.rect(self.screen, WHITE, 
+                        (BOARD_X - 2, BOARD_Y - 2, BOARD_WIDTH + 4, BOARD_HEIGHT + 4), 2)
+        self.board_renderer.draw(self.screen, BOARD_X, BOARD_Y, state.theme,
+                                 state.snake, state.food, state.obstacles)
+        self.ui_manager.draw_game_hud(self.screen, state.score_manager,
+                                     self.theme_manager, state.food)
+        if show_bar:
+            self.ui_manager.draw_replay_bar(self.screen, self.replay_player)
         
     def cleanup(self):
         """Cleanup resources."""
+        self.renderer.close()
+        if self.mcts:
+            self.mcts.shutdown()
+        self.sound_manager.shutdown()
+        self.leaderboard_manager.shutdown()
+        self.session_manager.shutdown(self.get_session_game())
+        self.gc_controller.shutdown()
         pygame.quit()
\ No newline at end of file
@@ -0,0 +1,277 @@
+"""
+Heatmap Manager for Snake Odyssey.
+Counts where snakes travel and die, per theme and difficulty level.
+"""
+
+import os
+import glob
+import time
+import numpy as np
+import pygame
+from config import (DATA_DIR, HEATMAP_DIR, THEMES, GRID_WIDTH, GRID_HEIGHT, CELL_SIZE,
+                   HEATMAP_LEVELS, HEATMAP_FLUSH_SIZE, HEATMAP_LOCK_TIMEOUT)
+
+# Heatmap colours from no activity to the most activity
+COLOR_STOPS = np.array([0.0, 0.35, 0.7, 1.0])
+COLOR_VALUES = np.array([[0, 0, 0], [120, 0, 40], [230, 60, 0], [255, 240, 80]])
+
+class HeatmapManager:
+    """Per-cell visit and death counts with mergeable on-disk shards.
+    
+    Counts live in arrays shaped (theme, level, y, x). Visits are buffered
+    as flat indices, so recording one costs a list append; the buffer is
+    folded into the arrays with one bincount. Each save writes only the
+    new counts as a small sparse shard file, so sessions and processes
+    never overwrite each other. Loading merges the shards into one base
+    file, whose size does not depend on how many games it holds; a lock
+    file keeps two processes from merging at once, and a lock left by a
+    process that died is broken.
+    """
+    
+    def __init__(self, path=None, themes=None):
+        """Initialize empty counts."""
+        self.path = path or os.path.join(DATA_DIR, HEATMAP_DIR)
+        self.themes = list(themes or THEMES)
+        self.shape = (len(self.themes), HEATMAP_LEVELS, GRID_HEIGHT, GRID_WIDTH)
+        self.size = int(np.prod(self.shape))
+        self.visits = np.zeros(self.shape, dtype=np.int64)
+        self.deaths = np.zeros(self.shape, dtype=np.int64)
+        
+        # Counts not yet written to disk
+        self.new_visits = np.zeros(self.size, dtype=np.int64)
+        self.new_deaths = np.zeros(self.size, dtype=np.int64)
+        self.visit_buffer = []
+        self.offset = 0
+        self.context_theme = None
+        self.context_level = None
+        self.shard_count = 0
+        self.version = 0
+        self.surface_cache = {}
+        
+    def set_context(self, theme, level):
+        """Select the theme and difficulty level that new counts go to."""
+        if theme == self.context_theme and level == self.context_level:
+            return  # Called every frame; the context rarely changes
+        self.context_theme = theme
+        self.context_level = level
+        level = min(level, HEATMAP_LEVELS - 1)
+        self.offset = (self.themes.index(theme) * HEATMAP_LEVELS + level) * GRID_HEIGHT * GRID_WIDTH
+        
+    def record_visit(self, cell):
+        """Count the head entering a board cell."""
+        self.visit_buffer.append(self.offset + cell[1] * GRID_WIDTH + cell[0])
+        if len(self.visit_buffer) >= HEATMAP_FLUSH_SIZE:
+            self.flush()
+            
+    def record_death(self, cell):
+        """Count a death; off-board cells count at the nearest edge cell."""
+        x = min(max(cell[0], 0), GRID_WIDTH - 1)
+        y = min(max(cell[1], 0), GRID_HEIGHT - 1)
+        self.new_deaths[self.offset + y * GRID_WIDTH + x] += 1
+        self.deaths.reshape(-1)[self.offset + y * GRID_WIDTH + x] += 1
+        self.version += 1
+        
+    def flush(self):
+        """Fold buffered visits into the count arrays."""
+        if self.visit_buffer:
+            counts = np.bincount(self.visit_buffer, minlength=self.size)
+            self.new_visits += counts
+            self.visits.reshape(-1)[:] += counts
+            self.visit_buffer.clear()
+            self.version += 1
+            
+    def merge(self, visits, deaths):
+        """Add counts from another process or session (same array shapes)."""
+        self.flush()
+        self.new_visits += visits.reshape(-1)
+        self.new_deaths += deaths.reshape(-1)
+        self.visits += visits
+        self.deaths += deaths
+        self.version += 1
+        
+    def save(self):
+        """Write counts recorded since the last save as a new shard."""
+        self.flush()
+        if not self.new_visits.any() and not self.new_deaths.any():
+            return
+        os.makedirs(self.path, exist_ok=True)
+        visit_idx = np.flatnonzero(self.new_visits)
+        death_idx = np.flatnonzero(self.new_deaths)
+        self.shard_count += 1
+        name = f"shard-{os.getpid()}-{id(self):x}-{self.shard_count}"
+        temp_path = os.path.join(self.path, name + '.tmp')
+        with open(temp_path, 'wb') as f:
+            np.savez(f, themes=np.array(self.themes),
+                     visit_idx=visit_idx, visit_cnt=self.new_visits[visit_idx],
+                     death_idx=death_idx, death_cnt=self.new_deaths[death_idx])
+        os.replace(temp_path, os.path.join(self.path, name + '.npz'))
+        self.new_visits[:] = 0
+        self.new_deaths[:] = 0
+        
+    def _read(self, file_path, visits, deaths):
+        """Add one base or shard file into flat count arrays."""
+        with np.load(file_path) as data:
+            themes = data['themes'].tolist()
+            visit_idx, visit_cnt = data['visit_idx'], data['visit_cnt']
+            death_idx, death_cnt = data['death_idx'], data['death_cnt']
+            
+        # Remap theme rows if the file was written with another theme list
+        if themes != self.themes:
+            plane = HEATMAP_LEVELS * GRID_HEIGHT * GRID_WIDTH
+            remap = np.array([self.themes.index(t) if t in self.themes else -1 for t in themes])
+            
+            def convert(idx, cnt):
+                rows = remap[idx // plane]
+                keep = rows >= 0
+                return rows[keep] * plane + idx[keep] % plane, cnt[keep]
+                
+            visit_idx, visit_cnt = convert(visit_idx, visit_cnt)
+            death_idx, death_cnt = convert(death_idx, death_cnt)
+        np.add.at(visits, visit_idx, visit_cnt)
+        np.add.at(deaths, death_idx, death_cnt)
+        
+    def load(self, compact=True):
+        """Load all saved counts, merging shards into the base file."""
+        lock_path = self._lock() if compact else None
+        try:
+            visits, deaths, shards = self._read_all()
+            if lock_path is not None and shards:
+                self._compact(visits, deaths, shards)
+        finally:
+            if lock_path is not None:
+                self._remove(lock_path)
+                
+        # Keep counts of this session that were not saved yet
+        self.flush()
+        self.visits = (visits + self.new_visits).reshape(self.shape)
+        self.deaths = (deaths + self.new_deaths).reshape(self.shape)
+        self.version += 1
+        
+    def _read_all(self):
+        """Read the base and every shard into flat arrays; returns them and the shards read."""
+        base_path = os.path.join(self.path, 'base.npz')
+        while True:
+            visits = np.zeros(self.size, dtype=np.int64)
+            deaths = np.zeros(self.size, dtype=np.int64)
+            shards = sorted(glob.glob(os.path.join(self.path, 'shard-*.npz')))
+            try:
+                if os.path.exists(base_path):
+                    self._read(base_path, visits, deaths)
+                for shard in shards:
+                    self._read(shard, visits, deaths)
+                return visits, deaths, shards
+            except FileNotFoundError:
+                pass  # Compacted by another process meanwhile; its base has the counts
+                
+    def _lock(self):
+        """Take the compaction lock; returns its path, or None if another process holds it."""
+        lock_path = os.path.join(self.path, 'compact.lock')
+        for _ in range(2):
+            try:
+                lock = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._is_stale(lock_path) or not self._break_lock(lock_path):
+                    return None
+                continue
+            except OSError:
+                return None  # No heatmap directory yet, so nothing to merge
+            with os.fdopen(lock, 'w') as f:
+                f.write(str(os.getpid()))
+            return lock_path
+        return None
+        
+    def _break_lock(self, lock_path):
+        """Remove a stale lock; returns False if it turned out to be live after all.
+        
+        The rename is atomic, so when several processes find the same stale
+        lock, only one moves it away. One that renames a lock another
+        process has just taken finds it live and puts it back.
+        """
+        stale_path = f"{lock_path}.stale-{os.getpid()}-{id(self):x}"
+        try:
+            os.rename(lock_path, stale_path)
+        except FileNotFoundError:
+            return True  # Broken or released by another process; try for a new one
+        if self._is_stale(stale_path):
+            self._remove(stale_path)
+            return True
+        try:
+            os.link(stale_path, lock_path)
+        except OSError:
+            pass  # Yet another process holds the lock now
+        self._remove(stale_path)
+        return False
+        
+    def _remove(self, file_path):
+        """Delete a file that another process may have deleted already."""
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+            
+    def _is_stale(self, lock_path):
+        """Check if a compaction lock was left by a dead process or is too old."""
+        try:
+            age = time.time() - os.path.getmtime(lock_path)
+            with open(lock_path, 'r') as f:
+                owner = f.read().strip()
+        except FileNotFoundError:
+            return True  # Released meanwhile
+        except OSError:
+            return False
+        if age > HEATMAP_LOCK_TIMEOUT:
+            return True
+        if not owner.isdigit() or os.name == 'nt':
+            return False  # Not written yet, or no safe liveness check; wait for the timeout
+        try:
+            os.kill(int(owner), 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass  # Alive, but owned by another user
+        return False
+        
+    def _compact(self, visits, deaths, shards):
+        """Replace the base and merged shards with one base file; the lock must be held."""
+        visit_idx = np.flatnonzero(visits)
+        death_idx = np.flatnonzero(deaths)
+        temp_path = os.path.join(self.path, 'base.tmp')
+        with open(temp_path, 'wb') as f:
+            np.savez(f, themes=np.array(self.themes),
+                     visit_idx=visit_idx, visit_cnt=visits[visit_idx],
+                     death_idx=death_idx, death_cnt=deaths[death_idx])
+        os.replace(temp_path, os.path.join(self.path, 'base.npz'))
+        for shard in shards:
+            self._remove(shard)
+            
+    def get_counts(self, kind='deaths', theme=None, level=None):
+        """Get a (height, width) count grid; None selects all themes or levels."""
+        self.flush()
+        counts = self.visits if kind == 'visits' else self.deaths
+        if theme is not None:
+            counts = counts[self.themes.index(theme):self.themes.index(theme) + 1]
+        if level is not None:
+            counts = counts[:, level:level + 1]
+        return counts.sum(axis=(0, 1))
+        
+    def render(self, kind='deaths', theme=None, level=None, cell_size=CELL_SIZE):
+        """Get a cached heatmap surface of the board for the selection."""
+        self.flush()
+        key = (kind, theme, level, cell_size)
+        cached = self.surface_cache.get(key)
+        if cached and cached[0] == self.version:
+            return cached[1]
+            
+        counts = self.get_counts(kind, theme, level)
+        peak = counts.max()
+        intensity = np.log1p(counts) / np.log1p(peak) if peak else np.zeros(counts.shape)
+        rgb = np.empty(counts.shape + (3,), dtype=np.uint8)
+        for channel in range(3):
+            rgb[..., channel] = np.interp(intensity, COLOR_STOPS, COLOR_VALUES[:, channel])
+            
+        # surfarray indexes pixels as [x, y]
+        surface = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+        surface = pygame.transform.scale(surface, (GRID_WIDTH * cell_size,
+                                                   GRID_HEIGHT * cell_size))
+        self.surface_cache[key] = (self.version, surface)
+        return surface
\ No newline at end of file
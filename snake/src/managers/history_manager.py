@@ -0,0 +1,173 @@
+"""
+History Manager for Snake Odyssey.
+Archives every finished game in columnar binary files for fast analytics.
+"""
+
+import json
+import os
+import time
+import numpy as np
+from config import DATA_DIR, HISTORY_DIR, THEMES
+
+# Column name -> numpy dtype. Each column is one raw little-endian file.
+COLUMNS = {
+    'timestamp': '<f8',  # seconds since the epoch at game over
+    'score': '<u4',
+    'length': '<u2',
+    'food': '<u2',
+    'bonus': '<u2',
+    'duration': '<f4',  # seconds of game time
+    'theme': 'u1',  # index into the archive's theme list
+    'cause': 'u1',  # index into DEATH_CAUSES
+    'death_x': '<i2',  # the cell the head moved into; may be off the board
+    'death_y': '<i2',
+}
+
+DEATH_CAUSES = ['wall', 'self', 'obstacle', 'full', 'other']
+ARCHIVE_VERSION = 1
+
+class HistoryManager:
+    """Append-only game archive with vectorized queries.
+    
+    Columns are read through numpy.memmap, so queries touch only the
+    columns they need and never build per-game Python objects. A crash
+    between column writes leaves some columns one row longer; the extra
+    rows are ignored and trimmed on the next append.
+    """
+    
+    def __init__(self, path=None):
+        """Initialize archive in path (created on first append)."""
+        self.path = path or os.path.join(DATA_DIR, HISTORY_DIR)
+        self.themes = list(THEMES)
+        self.maps = {}
+        self.map_rows = -1
+        self._load_meta()
+        
+    def _column_path(self, name):
+        """Get the file path of a column."""
+        return os.path.join(self.path, name + '.bin')
+        
+    def _load_meta(self):
+        """Load the theme list; themes added since keep their order after it."""
+        meta_path = os.path.join(self.path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            self.themes = meta['themes'] + [t for t in THEMES if t not in meta['themes']]
+            
+    def _save_meta(self):
+        """Write the archive description."""
+        meta = {'version': ARCHIVE_VERSION, 'themes': self.themes,
+                'causes': DEATH_CAUSES, 'columns': COLUMNS}
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+            
+    def get_count(self):
+        """Get the number of complete games in the archive."""
+        counts = []
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // np.dtype(dtype).itemsize)
+        return min(counts)
+        
+    def _repair(self, rows):
+        """Trim columns left longer than rows by an interrupted append."""
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            size = rows * np.dtype(dtype).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+                    
+    def append(self, score, length, food, bonus, duration, theme, cause,
+               death_cell, timestamp=None):
+        """Append one finished game."""
+        self.append_many({
+            'timestamp': [time.time() if timestamp is None else timestamp],
+            'score': [score], 'length': [length], 'food': [food], 'bonus': [bonus],
+            'duration': [duration],
+            'theme': [self.theme_code(theme)],
+            'cause': [self.cause_code(cause)],
+            'death_x': [death_cell[0]], 'death_y': [death_cell[1]],
+        })
+        
+    def append_many(self, columns):
+        """Append games given as equal-length arrays per column.
+        
+        The theme and cause columns hold codes (see theme_code and cause_code).
+        """
+        os.makedirs(self.path, exist_ok=True)
+        if not os.path.exists(os.path.join(self.path, 'meta.json')):
+            self._save_meta()
+        self._repair(self.get_count())
+        for name, dtype in COLUMNS.items():
+            data = np.asarray(columns[name]).astype(dtype)
+            with open(self._column_path(name), 'ab') as f:
+                f.write(data.tobytes())
+                
+    def theme_code(self, theme):
+        """Get the stored code of a theme name."""
+        if theme not in self.themes:
+            self.themes.append(theme)
+            if os.path.isdir(self.path):
+                self._save_meta()
+        return self.themes.index(theme)
+        
+    def cause_code(self, cause):
+        """Get the stored code of a death cause."""
+        return DEATH_CAUSES.index(cause) if cause in DEATH_CAUSES else DEATH_CAUSES.index('other')
+        
+    def columns(self, *names):
+        """Get memory-mapped columns (all if no names), trimmed to complete rows."""
+        rows = self.get_count()
+        if rows != self.map_rows:
+            self.maps = {}
+            self.map_rows = rows
+        result = {}
+        for name in names or COLUMNS:
+            if name not in self.maps:
+                if rows == 0:
+                    self.maps[name] = np.zeros(0, dtype=COLUMNS[name])
+                else:
+                    self.maps[name] = np.memmap(self._column_path(name), dtype=COLUMNS[name],
+                                                mode='r', shape=(rows,))
+            result[name] = self.maps[name]
+        return result
+        
+    def _select(self, column, theme=None):
+        """Get a column, optionally only the games of one theme."""
+        if theme is None:
+            return self.columns(column)[column]
+        data = self.columns(column, 'theme')
+        if theme not in self.themes:
+            return data[column][:0]
+        return data[column][data['theme'] == self.themes.index(theme)]
+        
+    def distribution(self, column='score', bins=20, theme=None):
+        """Get a histogram of a column; returns (counts, bin_edges)."""
+        values = self._select(column, theme)
+        if len(values) == 0:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1)
+        return np.histogram(values, bins=bins)
+        
+    def percentiles(self, column='score', q=(50, 90, 99), theme=None):
+        """Get percentiles of a column as {q: value}."""
+        values = self._select(column, theme)
+        if len(values) == 0:
+            return {p: 0.0 for p in q}
+        return dict(zip(q, np.percentile(values, q).tolist()))
+        
+    def theme_averages(self, column='score'):
+        """Get the mean of a column per theme, for themes with games."""
+        data = self.columns(column, 'theme')
+        codes = data['theme']
+        counts = np.bincount(codes, minlength=len(self.themes))
+        sums = np.bincount(codes, weights=data[column], minlength=len(self.themes))
+        return {theme: sums[i] / counts[i]
+                for i, theme in enumerate(self.themes) if counts[i]}
+                
+    def death_causes(self, theme=None):
+        """Count games per death cause."""
+        counts = np.bincount(self._select('cause', theme), minlength=len(DEATH_CAUSES))
+        return dict(zip(DEATH_CAUSES, counts.tolist()))
\ No newline at end of file
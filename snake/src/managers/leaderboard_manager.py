@@ -0,0 +1,262 @@
+"""
+Leaderboard Manager for Snake Odyssey.
+Uploads high scores to a shared leaderboard server, offline first.
+"""
+
+import http.client
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+from config import (DATA_DIR, LEADERBOARD_DIR, LEADERBOARD_URL, LEADERBOARD_BATCH_SIZE,
+                   LEADERBOARD_MIN_BACKOFF, LEADERBOARD_MAX_BACKOFF, LEADERBOARD_TIMEOUT)
+
+class LeaderboardManager:
+    """Queues score submissions on disk and uploads them in the background.
+    
+    submit() appends one JSON line to a journal file and returns at once.
+    A worker thread syncs the journal to disk, then uploads unsent lines
+    in batches over a keep-alive HTTP connection, backing off while the
+    server is unreachable, and records how far the server has acknowledged. Every entry carries an id that
+    the server uses to drop duplicates, so after a crash an entry may be
+    sent twice but is never lost.
+    """
+    
+    def __init__(self, url=LEADERBOARD_URL, path=None, batch_size=LEADERBOARD_BATCH_SIZE,
+                 min_backoff=LEADERBOARD_MIN_BACKOFF, max_backoff=LEADERBOARD_MAX_BACKOFF):
+        """Initialize the queue in path; uploads start only if a url is given."""
+        self.url = url
+        self.path = path or os.path.join(DATA_DIR, LEADERBOARD_DIR)
+        self.batch_size = batch_size
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        os.makedirs(self.path, exist_ok=True)
+        self.journal_path = os.path.join(self.path, 'queue.jsonl')
+        self.offset_path = os.path.join(self.path, 'sent_offset')
+        self.client_id = self._load_client_id()
+        
+        # The lock guards the journal, pending count and sent offset
+        self.lock = threading.Lock()
+        self.drained = threading.Condition(self.lock)
+        self.wake = threading.Event()
+        self.journal = self._open_journal()
+        self.unsynced = False  # Lines written since the worker last synced the journal
+        self.sent_offset = self._load_offset()
+        self.pending = self._count_pending()
+        
+        self.connection = None
+        self.backoff = 0.0
+        self.retry_at = 0.0
+        self.stopping = False
+        self.stats = {'submitted': 0, 'uploaded': 0, 'batches': 0, 'failures': 0,
+                      'connections': 0, 'rejected': 0}
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+            
+    def _load_client_id(self):
+        """Get this installation's id, creating it on first use."""
+        id_path = os.path.join(self.path, 'client_id')
+        if os.path.exists(id_path):
+            with open(id_path, 'r') as f:
+                return f.read().strip()
+        client_id = uuid.uuid4().hex
+        with open(id_path, 'w') as f:
+            f.write(client_id)
+        return client_id
+        
+    def _open_journal(self):
+        """Open the journal for appending, dropping a line cut off by a crash."""
+        journal = open(self.journal_path, 'a+b')
+        journal.seek(0)
+        data = journal.read()
+        if data and not data.endswith(b'\n'):
+            journal.truncate(data.rfind(b'\n') + 1)
+        return journal
+        
+    def _load_offset(self):
+        """Get the journal position up to which the server has acknowledged."""
+        try:
+            with open(self.offset_path, 'r') as f:
+                offset = int(f.read())
+        except (OSError, ValueError):
+            return 0
+        return offset if offset <= os.path.getsize(self.journal_path) else 0
+        
+    def _save_offset(self, offset):
+        """Store the acknowledged journal position atomically."""
+        temp_path = self.offset_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(str(offset))
+        os.replace(temp_path, self.offset_path)
+        self.sent_offset = offset
+        
+    def _count_pending(self):
+        """Count journal lines not yet acknowledged."""
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self.sent_offset)
+            return f.read().count(b'\n')
+            
+    def submit(self, theme, entry):
+        """Queue a score entry (as saved by ScoreManager) for upload."""
+        record = dict(entry, theme=theme, id=uuid.uuid4().hex, client=self.client_id)
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode()
+        with self.lock:
+            # Flushed to the OS, so a crash of the game cannot lose it; the
+            # worker syncs it to disk, as the game loop must never block
+            self.journal.write(line)
+            self.journal.flush()
+            self.unsynced = True
+            self.pending += 1
+            self.stats['submitted'] += 1
+        self.wake.set()
+        
+    def get_pending_count(self):
+        """Get the number of entries waiting for upload."""
+        return self.pending
+        
+    def _work(self):
+        """Sync and upload queued entries until shut down."""
+        while not self.stopping:
+            self._sync_journal()
+            uploading = self.url and self.pending
+            if uploading and time.monotonic() >= self.retry_at:
+                self._upload_pending()
+                continue
+            timeout = max(0.0, self.retry_at - time.monotonic()) if uploading else None
+            self.wake.wait(timeout)
+            self.wake.clear()
+        self._close_connection()
+        
+    def _sync_journal(self):
+        """Sync submitted lines to disk without holding the lock submit() takes."""
+        with self.lock:
+            if not self.unsynced or self.journal.closed:
+                return
+            self.unsynced = False
+            fd = os.dup(self.journal.fileno())  # Stays valid if shutdown() closes the journal
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+            
+    def _upload_pending(self):
+        """Upload batches until the queue is empty or the server fails."""
+        while self.pending and not self.stopping:
+            lines, end = self._read_batch()
+            if not lines:
+                self._recount_pending()
+                return
+            status = self._post(lines)
+            if status is None or status >= 500:
+                # Server down or overloaded: wait longer after each failure
+                self.stats['failures'] += 1
+                self.backoff = min(self.max_backoff, max(self.min_backoff, self.backoff * 2))
+                self.retry_at = time.monotonic() + self.backoff * random.uniform(0.5, 1.0)
+                return
+            if status != 200:
+                # The server will never take these; keep them for inspection
+                with open(os.path.join(self.path, 'rejected.jsonl'), 'ab') as f:
+                    f.writelines(lines)
+                self.stats['rejected'] += len(lines)
+            else:
+                self.stats['uploaded'] += len(lines)
+            self.stats['batches'] += 1
+            self.backoff = 0.0
+            self._acknowledge(end, len(lines))
+            
+    def _recount_pending(self):
+        """Trust the journal when it has no lines the pending count expects.
+        
+        The worker would otherwise retry at once, forever; if lines are
+        still counted, it waits a backoff before looking again.
+        """
+        with self.lock:
+            if self.journal.closed:
+                return
+            self.pending = self._count_pending()
+            if not self.pending:
+                self.drained.notify_all()
+        self.retry_at = time.monotonic() + self.min_backoff
+        
+    def _read_batch(self):
+        """Read up to batch_size complete lines after the sent offset."""
+        lines = []
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self.sent_offset)
+            while len(lines) < self.batch_size:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break  # Still being written
+                lines.append(line)
+            return lines, self.sent_offset + sum(len(line) for line in lines)
+            
+    def _acknowledge(self, end, count):
+        """Mark journal lines up to end as delivered; empty the journal once all are."""
+        with self.lock:
+            self.pending -= count
+            if self.pending or self.journal.closed:
+                self._save_offset(end)
+            else:
+                # Reset the offset first: a crash in between only causes resends
+                self._save_offset(0)
+                self.journal.truncate(0)
+                self.drained.notify_all()
+                
+    def _post(self, lines):
+        """Send one batch; returns the HTTP status, or None if unreachable."""
+        body = b'{"entries":[' + b','.join(line.rstrip(b'\n') for line in lines) + b']}'
+        headers = {'Content-Type': 'application/json'}
+        
+        # A kept-alive connection may have been closed by the server
+        # meanwhile, so a reused one gets a second try on a fresh one
+        for attempt in range(2):
+            reused = self.connection is not None
+            try:
+                connection = self._get_connection()
+                connection.request('POST', '/scores', body, headers)
+                response = connection.getresponse()
+                response.read()
+                if response.will_close:
+                    self._close_connection()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                self._close_connection()
+                if not reused:
+                    return None
+        return None
+        
+    def _get_connection(self):
+        """Get the kept-alive server connection, opening it if needed."""
+        if self.connection is None:
+            parts = urlsplit(self.url)
+            connection_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                                else http.client.HTTPConnection)
+            self.connection = connection_class(parts.hostname, parts.port,
+                                               timeout=LEADERBOARD_TIMEOUT)
+            self.stats['connections'] += 1
+        return self.connection
+        
+    def _close_connection(self):
+        """Drop the server connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            
+    def flush(self, timeout=None):
+        """Wait until every queued entry is uploaded; returns False on timeout."""
+        with self.lock:
+            return self.drained.wait_for(lambda: self.pending == 0, timeout)
+            
+    def shutdown(self, timeout=1.0):
+        """Stop uploading; unsent entries stay queued for the next start."""
+        self.stopping = True
+        self.wake.set()
+        if self.worker is not None:
+            self.worker.join(timeout)
+            self.worker = None
+        with self.lock:
+            os.fsync(self.journal.fileno())
+            self.journal.close()
\ No newline at end of file
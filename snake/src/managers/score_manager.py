@@ -11,12 +11,15 @@ from config import DATA_DIR, SCORES_FILE
 class ScoreManager:
     """Manages game scoring and high score persistence."""
     
-    def __init__(self):
-        """Initialize score manager."""
+    def __init__(self, persistent=True):
+        """Initialize score manager.
+        
+        With persistent=False no high score file is read or created.
+        """
         self.current_score = 0
         self.food_eaten = 0
         self.bonus_food_eaten = 0
-        self.high_scores = self.load_high_scores()
+        self.high_scores = self.load_high_scores() if persistent else {}
         
     def reset_score(self):
         """Reset current game score."""
@@ -69,7 +72,7 @@ class ScoreManager:
         return min(10, (self.current_score - 200) // 100 + 1)
         
     def save_high_score(self, theme, player_name="Player"):
-        """Save high score for theme."""
+        """Save high score for theme; returns the score entry."""
         if theme not in self.high_scores:
             self.high_scores[theme] = []
             
@@ -88,6 +91,7 @@ class ScoreManager:
         self.high_scores[theme] = self.high_scores[theme][:10]
         
         self.save_high_scores()
+        return score_entry
         
     def is_high_score(self, theme):
         """Check if current score is a high score."""
@@ -0,0 +1,230 @@
+"""
+Session Manager for Snake Odyssey.
+Saves the game in progress to a compact binary file and restores it.
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from config import (DATA_DIR, SESSION_FILE, SESSION_CHECKPOINT_MS, GRID_WIDTH, GRID_HEIGHT,
+                   DIRECTIONS, THEMES)
+
+SESSION_MAGIC = b'SNKS'
+SESSION_VERSION = 1
+DIRECTION_LIST = list(DIRECTIONS.values())
+
+# Fixed part of a save; body and obstacle cells follow as uint16 board indices,
+# then a CRC-32 of everything before it
+SESSION_HEADER = struct.Struct(
+    '<4sB'    # magic, version
+    'BB'      # grid width and height
+    '16sB'    # theme name, flags (mix mode, pending growth)
+    'B'       # direction index
+    'hhhh'    # food and bonus cells, -1 when absent
+    'f'       # bonus time remaining (seconds)
+    'dd'      # game time since the last move and since the start (ms)
+    'iii'     # score, food eaten, bonus food eaten
+    'HH'      # body length, obstacle count
+)
+SESSION_CHECKSUM = struct.Struct('<I')
+MIX_MODE = 1
+GROW_NEXT = 2
+
+class SessionManager:
+    """Keeps the game in progress on disk so it survives reboots and sleep.
+    
+    A save is a fixed header followed by the body and obstacle cells as
+    two-byte board indices, about 2.5 KB for a full board, and packs in
+    tens of microseconds. Timers are stored relative to the game time of
+    the save, so a restored game resumes with the same move phase and
+    bonus time left. Checkpoints are packed on the game thread, which
+    owns the game objects, and handed to a worker thread that writes
+    them; the worker only ever writes the newest one. Files are replaced
+    atomically, and a damaged file is ignored.
+    """
+    
+    def __init__(self, path=None, interval_ms=SESSION_CHECKPOINT_MS):
+        """Initialize manager; checkpoints are taken every interval_ms of real time."""
+        self.path = path or os.path.join(DATA_DIR, SESSION_FILE)
+        self.interval = interval_ms / 1000.0
+        self.last_checkpoint = None
+        
+        # The newest packed save the worker has not written yet. The game
+        # thread only ever holds the lock for a swap; writes (and their
+        # fsync) run under write_lock, which only writers take
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.latest = None
+        self.generation = 0  # Bumped by discard(), so in-flight writes of old saves are undone
+        self.stopping = False
+        self.worker = None
+        self.stats = {'checkpoints': 0, 'writes': 0, 'failures': 0, 'pack_ms': 0.0}
+        
+    def pack(self, game):
+        """Pack the session of a game (snake, food, obstacles, managers, clock) into bytes."""
+        snake = game.snake
+        food = game.food
+        score_manager = game.score_manager
+        theme_manager = game.theme_manager
+        now = game.game_clock.time
+        width = GRID_WIDTH
+        
+        regular = food.regular_food or (-1, -1)
+        bonus = food.bonus_food or (-1, -1)
+        flags = (MIX_MODE if theme_manager.mix_mode else 0) | (GROW_NEXT if snake.grow_next else 0)
+        header = SESSION_HEADER.pack(
+            SESSION_MAGIC, SESSION_VERSION, GRID_WIDTH, GRID_HEIGHT,
+            theme_manager.current_theme.encode(), flags,
+            DIRECTION_LIST.index(snake.direction),
+            regular[0], regular[1], bonus[0], bonus[1],
+            food.get_bonus_time_remaining(now / 1000.0),
+            now - game.last_move_time, now - game.game_start_time,
+            score_manager.current_score, score_manager.food_eaten,
+            score_manager.bonus_food_eaten,
+            len(snake.body), len(game.obstacles))
+        cells = array('H', [y * width + x for x, y in snake.body])
+        cells.extend([y * width + x for x, y in game.obstacles])
+        if sys.byteorder != 'little':
+            cells.byteswap()  # Stored little-endian
+        data = header + cells.tobytes()
+        return data + SESSION_CHECKSUM.pack(zlib.crc32(data))
+        
+    def unpack(self, data):
+        """Unpack a save into a dict; raises ValueError if it is damaged or from another board."""
+        if len(data) < SESSION_HEADER.size + SESSION_CHECKSUM.size:
+            raise ValueError("Session file is truncated")
+        body, checksum = data[:-SESSION_CHECKSUM.size], data[-SESSION_CHECKSUM.size:]
+        if SESSION_CHECKSUM.unpack(checksum)[0] != zlib.crc32(body):
+            raise ValueError("Session file is damaged")
+        (magic, version, width, height, theme, flags, direction, food_x, food_y,
+         bonus_x, bonus_y, bonus_remaining, move_phase, elapsed, score, food_eaten,
+         bonus_eaten, length, obstacle_count) = SESSION_HEADER.unpack_from(body)
+        if magic != SESSION_MAGIC or version != SESSION_VERSION:
+            raise ValueError("Not a session file of this version")
+        if (width, height) != (GRID_WIDTH, GRID_HEIGHT):
+            raise ValueError("Session was saved on another board size")
+        theme = theme.rstrip(b'\0').decode()
+        if theme not in THEMES:
+            raise ValueError(f"Unknown theme {theme!r}")
+            
+        cells = array('H')
+        cells.frombytes(body[SESSION_HEADER.size:])
+        if sys.byteorder != 'little':
+            cells.byteswap()
+        if len(cells) != length + obstacle_count:
+            raise ValueError("Session cell count does not match its header")
+        cells = [(index % width, index // width) for index in cells]
+        return {
+            'theme': theme,
+            'mix_mode': bool(flags & MIX_MODE),
+            'grow_next': bool(flags & GROW_NEXT),
+            'direction': DIRECTION_LIST[direction],
+            'food': (food_x, food_y) if food_x >= 0 else None,
+            'bonus_food': (bonus_x, bonus_y) if bonus_x >= 0 else None,
+            'bonus_remaining': bonus_remaining,
+            'move_phase': move_phase,
+            'elapsed': elapsed,
+            'score': score,
+            'food_eaten': food_eaten,
+            'bonus_eaten': bonus_eaten,
+            'body': cells[:length],
+            'obstacles': cells[length:],
+        }
+        
+    def save(self, data):
+        """Write packed session bytes, replacing the previous save atomically."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            
+            # On disk before the rename, so a power cut cannot leave an empty save
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        
+    def load(self):
+        """Get the saved session as a dict, or None if there is no usable save."""
+        try:
+            with open(self.path, 'rb') as f:
+                return self.unpack(f.read())
+        except (OSError, ValueError) as e:
+            if os.path.exists(self.path):
+                print(f"Ignoring saved session: {e}")
+            return None
+            
+    def discard(self):
+        """Delete the save, e.g. when its game has ended."""
+        with self.lock:
+            self.latest = None
+            self.generation += 1
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+                
+    def checkpoint(self, game, force=False):
+        """Queue a save of the game if the checkpoint interval has passed (or force)."""
+        now = time.monotonic()
+        if not force and self.last_checkpoint is not None and now - self.last_checkpoint < self.interval:
+            return False
+        start = time.perf_counter()
+        data = self.pack(game)
+        self.stats['pack_ms'] = (time.perf_counter() - start) * 1000
+        self.stats['checkpoints'] += 1
+        self.last_checkpoint = now
+        with self.lock:
+            self.latest = data
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+        self.wake.set()
+        return True
+        
+    def _work(self):
+        """Write the newest queued checkpoint until shut down."""
+        while not self.stopping:
+            self.wake.wait()
+            self.wake.clear()
+            self._write_latest()
+            
+    def _write_latest(self):
+        """Write the queued checkpoint, if any."""
+        with self.write_lock:
+            with self.lock:
+                data, self.latest = self.latest, None
+                generation = self.generation
+            if data is None:
+                return
+            try:
+                self.save(data)
+                self.stats['writes'] += 1
+            except OSError as e:
+                self.stats['failures'] += 1
+                print(f"Error saving session: {e}")
+                return
+                
+            # A discard() during the write was meant to delete this save too
+            with self.lock:
+                if self.generation != generation:
+                    try:
+                        os.remove(self.path)
+                    except FileNotFoundError:
+                        pass
+                
+    def shutdown(self, game=None):
+        """Stop the worker after writing pending checkpoints; game, if given, is saved last."""
+        self.stopping = True
+        self.wake.set()
+        if self.worker is not None:
+            self.worker.join(1.0)
+            self.worker = None
+        if game is not None:
+            with self.lock:
+                self.latest = self.pack(game)
+        self._write_latest()
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""
+Sound Manager for Snake Odyssey.
+Synthesizes per-theme sound effects and ambience in the background.
+"""
+
+import threading
+import queue
+import time
+from collections import OrderedDict
+import numpy as np
+import pygame
+from config import (THEMES, SOUND_VOLUME, AMBIENT_VOLUME, AMBIENT_FADE_MS,
+                   SOUND_MEMORY_BUDGET)
+
+SAMPLE_RATE = 44100
+AMBIENT_SECONDS = 4.0
+LOOP_CROSSFADE = 0.25  # seconds blended across the ambient loop point
+
+# Voice of each sound theme: root pitch (Hz), waveform, noise level, swell rate (Hz)
+THEME_VOICES = {
+    'forest': {'root': 392.0, 'wave': 'triangle', 'noise': 0.15, 'swell': 0.25},
+    'sea': {'root': 261.6, 'wave': 'sine', 'noise': 0.5, 'swell': 0.125},
+    'snow': {'root': 523.3, 'wave': 'sine', 'noise': 0.08, 'swell': 0.5},
+    'desert': {'root': 293.7, 'wave': 'saw', 'noise': 0.25, 'swell': 0.25},
+    'hill': {'root': 329.6, 'wave': 'square', 'noise': 0.1, 'swell': 0.25},
+}
+
+SAMPLE_DTYPES = {-8: np.int8, 8: np.uint8, -16: np.int16, 16: np.uint16, 32: np.float32}
+
+def oscillator(frequency, wave, sample_rate=SAMPLE_RATE):
+    """Render a waveform from a per-sample frequency array."""
+    phase = np.cumsum(frequency / sample_rate)
+    if wave == 'sine':
+        return np.sin(2 * np.pi * phase)
+    cycle = phase % 1.0
+    if wave == 'triangle':
+        return 4 * np.abs(cycle - 0.5) - 1
+    if wave == 'saw':
+        return 2 * cycle - 1
+    # Soft square: a hard square is harsh at game volumes
+    return np.tanh(4 * np.sin(2 * np.pi * phase))
+
+def envelope(count, attack, decay, sample_rate=SAMPLE_RATE):
+    """Linear attack followed by an exponential decay."""
+    t = np.arange(count) / sample_rate
+    shape = np.exp(-t / decay)
+    attack_count = min(count, int(attack * sample_rate))
+    shape[:attack_count] *= np.linspace(0.0, 1.0, attack_count)
+    return shape
+
+def glide(start, end, seconds, sample_rate=SAMPLE_RATE):
+    """Get a per-sample frequency sweeping geometrically from start to end."""
+    return np.geomspace(start, end, int(seconds * sample_rate))
+
+def smoothed_noise(count, rng, width=32):
+    """Low-passed white noise, like wind or surf."""
+    noise = rng.standard_normal(count + width)
+    kernel = np.ones(width) / width
+    noise = np.convolve(noise, kernel, mode='valid')[:count]
+    return noise / (np.abs(noise).max() or 1.0)
+
+def synthesize_theme(sound_theme, seed=0, sample_rate=SAMPLE_RATE):
+    """Synthesize a theme's eat, bonus, game-over and ambient samples.
+    
+    Returns float32 mono arrays in [-1, 1], keyed by event name.
+    """
+    voice = THEME_VOICES[sound_theme]
+    root = voice['root']
+    wave = voice['wave']
+    rng = np.random.default_rng(seed)
+    sounds = {}
+    
+    # Eat: a short upward chirp
+    frequency = glide(root * 2, root * 3, 0.12, sample_rate)
+    sounds['eat'] = oscillator(frequency, wave, sample_rate) * envelope(
+        len(frequency), 0.005, 0.05, sample_rate)
+        
+    # Bonus: a rising major arpeggio with a sine sparkle an octave up
+    notes = []
+    for ratio in (1.0, 1.25, 1.5, 2.0):
+        frequency = np.full(int(0.09 * sample_rate), root * 2 * ratio)
+        tone = (oscillator(frequency, wave, sample_rate) +
+                0.3 * oscillator(frequency * 2, 'sine', sample_rate))
+        notes.append(tone * envelope(len(frequency), 0.004, 0.06, sample_rate))
+    sounds['bonus'] = np.concatenate(notes) / 1.3
+    
+    # Game over: a falling tone with tremolo
+    frequency = glide(root, root / 2, 0.8, sample_rate)
+    t = np.arange(len(frequency)) / sample_rate
+    tremolo = 0.75 + 0.25 * np.sin(2 * np.pi * 6 * t)
+    sounds['game_over'] = (oscillator(frequency, wave, sample_rate) * tremolo *
+                           envelope(len(frequency), 0.01, 0.35, sample_rate))
+                           
+    # Ambient: a swelling drone (root and fifth) over noise, looping seamlessly
+    count = int(AMBIENT_SECONDS * sample_rate)
+    fade = int(LOOP_CROSSFADE * sample_rate)
+    t = np.arange(count + fade) / sample_rate
+    
+    # Whole cycles per loop keep the drone and swell continuous at the seam
+    def looped(hz):
+        return max(1, round(hz * AMBIENT_SECONDS)) / AMBIENT_SECONDS
+        
+    drone = (np.sin(2 * np.pi * looped(root / 2) * t) +
+             0.5 * np.sin(2 * np.pi * looped(root * 0.75) * t))
+    swell = 0.6 + 0.4 * np.sin(2 * np.pi * looped(voice['swell']) * t)
+    ambient = (drone / 1.5 * (1.0 - voice['noise']) +
+               smoothed_noise(count + fade, rng) * voice['noise']) * swell
+    ramp = np.linspace(0.0, 1.0, fade)
+    ambient[:fade] = ambient[:fade] * ramp + ambient[count:] * (1.0 - ramp)
+    sounds['ambient'] = ambient[:count]
+    
+    return {name: np.clip(samples, -1.0, 1.0).astype(np.float32)
+            for name, samples in sounds.items()}
+
+class SoundManager:
+    """Caches synthesized theme sounds and plays them on game events.
+    
+    Synthesis runs on a background thread, so startup and theme changes
+    never wait for audio. A sound that is not ready yet is skipped. Cached
+    themes are evicted least-recently-used once their total size exceeds
+    the memory budget.
+    """
+    
+    def __init__(self, memory_budget=SOUND_MEMORY_BUDGET):
+        """Initialize sound manager; sound is disabled without a mixer."""
+        self.mixer_format = pygame.mixer.get_init()
+        self.enabled = self.mixer_format is not None
+        self.memory_budget = memory_budget
+        
+        self.cache = OrderedDict()  # sound_theme -> {event: Sound}
+        self.cache_bytes = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.worker = None
+        
+        # Measurements
+        self.synth_times = {}
+        self.warm_up_start = None
+        self.warm_up_time = None
+        self.warm_up_themes = set()
+        self.ready = threading.Event()
+        
+        self.ambient_channel = None
+        self.ambient_theme = None
+        if self.enabled:
+            pygame.mixer.set_reserved(1)
+            self.ambient_channel = pygame.mixer.Channel(0)
+            
+    def warm_up(self, first_theme=None):
+        """Start synthesizing every theme in the background, first_theme first."""
+        if not self.enabled:
+            self.ready.set()
+            return
+        sound_themes = [THEMES[name]['sound_theme'] for name in THEMES]
+        if first_theme:
+            first = THEMES[first_theme]['sound_theme']
+            sound_themes.remove(first)
+            sound_themes.insert(0, first)
+        self.warm_up_start = time.perf_counter()
+        self.warm_up_themes = set(sound_themes)
+        for sound_theme in sound_themes:
+            self.request(sound_theme)
+            
+    def request(self, sound_theme):
+        """Queue a theme for synthesis unless it is cached or queued."""
+        with self.lock:
+            if sound_theme in self.cache or sound_theme in self.pending:
+                return
+            self.pending.add(sound_theme)
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+        self.requests.put(sound_theme)
+        
+    def _work(self):
+        """Synthesize queued themes until told to stop."""
+        frequency = self.mixer_format[0]
+        while True:
+            sound_theme = self.requests.get()
+            if sound_theme is None:
+                return
+            start = time.perf_counter()
+            samples = synthesize_theme(sound_theme, sample_rate=frequency)
+            sounds = {}
+            size = 0
+            for name, data in samples.items():
+                sounds[name], nbytes = self._to_sound(data)
+                sounds[name].set_volume(AMBIENT_VOLUME if name == 'ambient' else SOUND_VOLUME)
+                size += nbytes
+            self.synth_times[sound_theme] = time.perf_counter() - start
+            
+            with self.lock:
+                self.pending.discard(sound_theme)
+                self.cache[sound_theme] = sounds
+                self.cache_bytes[sound_theme] = size
+                self._evict(keep=sound_theme)
+                if self.warm_up_time is None and self.warm_up_themes <= set(self.synth_times):
+                    self.warm_up_time = time.perf_counter() - self.warm_up_start
+                    self.ready.set()
+                    
+    def _to_sound(self, samples):
+        """Convert float samples to a Sound in the mixer's format.
+        
+        Returns the sound and its buffer size in bytes.
+        """
+        _, size, channels = self.mixer_format
+        if size == 32:
+            data = samples
+        else:
+            peak = 2 ** (abs(size) - 1) - 1
+            data = samples * peak
+            if size > 0:
+                data += peak + 1
+            data = data.astype(SAMPLE_DTYPES[size])
+        if channels > 1:
+            data = np.repeat(data[:, None], channels, axis=1)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(data)), data.nbytes
+        
+    def _evict(self, keep):
+        """Drop least recently used themes until the cache fits the budget."""
+        while self.get_memory_usage() > self.memory_budget and len(self.cache) > 1:
+            oldest = next(iter(self.cache))
+            if oldest == keep:
+                self.cache.move_to_end(oldest)
+                oldest = next(iter(self.cache))
+            del self.cache[oldest]
+            del self.cache_bytes[oldest]
+            
+    def get_sounds(self, theme_name):
+        """Get a theme's sounds if ready; otherwise queue them and return None."""
+        sound_theme = THEMES[theme_name]['sound_theme']
+        with self.lock:
+            sounds = self.cache.get(sound_theme)
+            if sounds is not None:
+                self.cache.move_to_end(sound_theme)
+                return sounds
+        self.request(sound_theme)
+        return None
+        
+    def play(self, event, theme_name):
+        """Play an event sound ('eat', 'bonus', 'game_over') without waiting."""
+        if not self.enabled:
+            return
+        sounds = self.get_sounds(theme_name)
+        if sounds is not None:
+            sounds[event].play()
+            
+    def update_ambient(self, theme_name):
+        """Keep the ambient loop of the given theme playing."""
+        if not self.enabled or theme_name == self.ambient_theme:
+            return
+        sounds = self.get_sounds(theme_name)
+        if sounds is not None:
+            self.ambient_channel.play(sounds['ambient'], loops=-1, fade_ms=AMBIENT_FADE_MS)
+            self.ambient_theme = theme_name
+            
+    def stop_ambient(self):
+        """Fade out the ambient loop."""
+        if self.enabled and self.ambient_theme is not None:
+            self.ambient_channel.fadeout(AMBIENT_FADE_MS)
+            self.ambient_theme = None
+            
+    def get_memory_usage(self):
+        """Get bytes of cached sound data."""
+        return sum(self.cache_bytes.values())
+        
+    def get_stats(self):
+        """Get warm-up and cache measurements."""
+        with self.lock:
+            return {
+                'warm_up_time': self.warm_up_time,
+                'synth_times': dict(self.synth_times),
+                'cached_themes': list(self.cache),
+                'memory_bytes': self.get_memory_usage(),
+                'memory_budget': self.memory_budget,
+            }
+            
+    def shutdown(self):
+        """Stop the synthesis thread."""
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker = None
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Sprite Manager for Snake Odyssey.
+Pre-renders each theme's cell art into a display-format atlas.
+"""
+
+import pygame
+from config import CELL_SIZE, THEMES, DIRECTIONS, WHITE
+
+BONUS_FRAMES = 5  # pulse offsets 0..4 px, as drawn by Food.draw
+BONUS_MARGIN = BONUS_FRAMES - 1
+
+class SpriteManager:
+    """Builds and caches the sprite atlas of the current theme."""
+    
+    def __init__(self, cell_size=CELL_SIZE):
+        """Initialize sprite manager."""
+        self.cell_size = cell_size
+        self.atlas = None
+        self.atlas_key = None
+        self.sprites = None
+        self.build_count = 0
+        
+    def get_sprites(self, theme_name, snake_color=None):
+        """Get sprites for a theme, rebuilding only when theme or color changed."""
+        theme = THEMES[theme_name]
+        snake_color = snake_color or theme['snake_color']
+        key = self.atlas_key
+        if key is None or key[0] != theme_name or key[1] != tuple(snake_color):
+            self.atlas_key = (theme_name, tuple(snake_color))
+            self.sprites = self._build(theme, snake_color)
+            self.build_count += 1
+        return self.sprites
+        
+    def _build(self, theme, snake_color):
+        """Render all cell art into one atlas and slice it into sprites."""
+        cell = self.cell_size
+        bonus_size = cell + 2 * BONUS_MARGIN
+        
+        # Layout: 4 heads, body, food, obstacle, then the bonus frames
+        plain_count = 7
+        width = plain_count * cell + BONUS_FRAMES * bonus_size
+        atlas = pygame.Surface((width, bonus_size), pygame.SRCALPHA)
+        
+        head_up = self._draw_head(snake_color)
+        heads = {
+            DIRECTIONS['UP']: head_up,
+            DIRECTIONS['RIGHT']: pygame.transform.rotate(head_up, -90),
+            DIRECTIONS['DOWN']: pygame.transform.rotate(head_up, 180),
+            DIRECTIONS['LEFT']: pygame.transform.rotate(head_up, 90),
+        }
+        rects = {}
+        for i, direction in enumerate(heads):
+            atlas.blit(heads[direction], (i * cell, 0))
+            rects[direction] = (i * cell, 0, cell, cell)
+            
+        # Body segment
+        x = 4 * cell
+        pygame.draw.rect(atlas, snake_color, (x, 0, cell, cell))
+        pygame.draw.rect(atlas, WHITE, (x, 0, cell, cell), 1)
+        
+        # Regular food
+        x = 5 * cell
+        pygame.draw.ellipse(atlas, theme['food_color'], (x + 2, 2, cell - 4, cell - 4))
+        pygame.draw.ellipse(atlas, WHITE, (x + 2, 2, cell - 4, cell - 4), 2)
+        
+        # Obstacle
+        x = 6 * cell
+        pygame.draw.rect(atlas, theme['obstacle_color'], (x, 0, cell, cell))
+        pygame.draw.rect(atlas, WHITE, (x, 0, cell, cell), 1)
+        
+        # Golden bonus food, one frame per pulse offset
+        for offset in range(BONUS_FRAMES):
+            x = plain_count * cell + offset * bonus_size + BONUS_MARGIN
+            oval = (x + 2 - offset, BONUS_MARGIN + 2 - offset,
+                    cell - 4 + offset * 2, cell - 4 + offset * 2)
+            pygame.draw.ellipse(atlas, (255, 215, 0), oval)
+            pygame.draw.ellipse(atlas, WHITE, oval, 2)
+            
+        # Convert once to the display format for fast blits
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.atlas = atlas
+        
+        return {
+            'head': {direction: atlas.subsurface(rect) for direction, rect in rects.items()},
+            'body': atlas.subsurface((4 * cell, 0, cell, cell)),
+            'food': atlas.subsurface((5 * cell, 0, cell, cell)),
+            'obstacle': atlas.subsurface((6 * cell, 0, cell, cell)),
+            'bonus': [atlas.subsurface((plain_count * cell + i * bonus_size, 0,
+                                        bonus_size, bonus_size))
+                      for i in range(BONUS_FRAMES)],
+            'bonus_margin': BONUS_MARGIN,
+        }
+        
+    def _draw_head(self, snake_color):
+        """Draw the head facing up (eyes on the top edge)."""
+        cell = self.cell_size
+        head = pygame.Surface((cell, cell), pygame.SRCALPHA)
+        pygame.draw.rect(head, snake_color, (0, 0, cell, cell))
+        pygame.draw.rect(head, WHITE, (0, 0, cell, cell), 2)
+        pygame.draw.circle(head, WHITE, (5, 5), 3)
+        pygame.draw.circle(head, WHITE, (cell - 5, 5), 3)
+        return head
\ No newline at end of file
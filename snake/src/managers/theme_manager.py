@@ -6,19 +6,41 @@ Handles theme switching, visual effects, and theme-based progression.
 import pygame
 import random
 import math
-from config import THEMES
+from config import THEMES, QUALITY_TIERS
+
+TRANSITION_MS = 530  # about 32 frames at 60 FPS, as the per-frame fade was
+ANIMATED_PATTERNS = ('sea', 'snow')  # backgrounds that move with time
+THEME_NAMES = tuple(THEMES)  # mix mode order
+PARTICLE_ALPHA_LEVELS = 16  # fade steps of the cached particle sprites
 
 class ThemeManager:
     """Manages game themes and visual effects."""
     
-    def __init__(self):
+    def __init__(self, clock=None):
         """Initialize theme manager."""
+        self.clock = clock  # GameClock; None uses pygame ticks
         self.current_theme = 'forest'
         self.mix_mode = False
         self.theme_transition_alpha = 0
+        self.transition_start = 0
         self.transitioning = False
         self.previous_theme_surface = None
         
+        # Visual quality tier, lowered by the governor under load
+        self.quality = QUALITY_TIERS[0]
+        self.static_background = None
+        self.static_background_key = None
+        self.overlay = None
+        
+        # Reused drawing state, so a steady frame allocates next to nothing
+        self.wave_points = []
+        self.particle_sprites = {}  # color -> sprite per alpha level
+        
+    def set_quality(self, quality):
+        """Apply a quality tier's settings from QUALITY_TIERS."""
+        self.quality = quality
+        self.static_background = None
+        
     def set_theme(self, theme_name):
         """Set the current theme."""
         if theme_name in THEMES:
@@ -45,42 +67,74 @@ class ThemeManager:
     def change_theme_on_milestone(self, score):
         """Change theme automatically in mix mode."""
         if self.mix_mode:
-            theme_names = list(THEMES.keys())
             # Change theme every 100 points
-            theme_index = (score // 100) % len(theme_names)
-            new_theme = theme_names[theme_index]
+            new_theme = THEME_NAMES[(score // 100) % len(THEME_NAMES)]
             if new_theme != self.current_theme:
                 self.set_theme(new_theme)
                 
+    def get_ticks(self):
+        """Get the current time in milliseconds for animations."""
+        if self.clock:
+            return self.clock.get_ticks()
+        return pygame.time.get_ticks()
+        
     def start_transition(self):
         """Start theme transition effect."""
         self.transitioning = True
         self.theme_transition_alpha = 255
+        self.transition_start = self.get_ticks()
         
     def update_transition(self):
         """Update theme transition animation."""
         if self.transitioning:
-            self.theme_transition_alpha -= 8
+            # Fade out over TRANSITION_MS of game time
+            elapsed = self.get_ticks() - self.transition_start
+            self.theme_transition_alpha = int(255 * (1 - elapsed / TRANSITION_MS))
             if self.theme_transition_alpha <= 0:
                 self.transitioning = False
                 self.theme_transition_alpha = 0
                 
+    def is_animated(self):
+        """Check whether the background moves with time at this quality."""
+        return self.quality['animated'] and self.current_theme in ANIMATED_PATTERNS
+        
     def draw_background(self, surface, width, height):
         """Draw themed background."""
         theme = self.get_current_theme()
         
-        # Base background
-        surface.fill(theme['background_color'])
-        
-        # Add pattern based on theme
-        self._draw_theme_pattern(surface, width, height, theme)
-        
+        if self.is_animated():
+            # Base background
+            surface.fill(theme['background_color'])
+            
+            # Add pattern based on theme
+            self._draw_theme_pattern(surface, width, height, theme)
+        else:
+            # Still patterns, or any pattern at low quality, are drawn once
+            # into a cached surface and redrawn on theme change
+            key = (self.current_theme, width, height)
+            if self.static_background is None or self.static_background_key != key:
+                self.static_background = pygame.Surface((width, height))
+                self.static_background.fill(theme['background_color'])
+                self._draw_theme_pattern(self.static_background, width, height, theme)
+                self.static_background_key = key
+            surface.blit(self.static_background, (0, 0))
+            
         # Apply transition effect
         if self.transitioning:
-            overlay = pygame.Surface((width, height))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(self.theme_transition_alpha)
-            surface.blit(overlay, (0, 0))
+            self.draw_overlay(surface, self.theme_transition_alpha)
+            
+    def draw_overlay(self, surface, alpha):
+        """Darken the surface, with alpha rounded to the quality tier's step."""
+        step = self.quality['alpha_step']
+        alpha = alpha // step * step
+        if alpha <= 0:
+            return
+        if self.overlay is None or self.overlay.get_size() != surface.get_size():
+            self.overlay = pygame.Surface(surface.get_size())
+            self.overlay.fill((0, 0, 0))
+        if self.overlay.get_alpha() != alpha:
+            self.overlay.set_alpha(alpha)
+        surface.blit(self.overlay, (0, 0))
             
     def _draw_theme_pattern(self, surface, width, height, theme):
         """Draw theme-specific background patterns."""
@@ -106,20 +160,22 @@ class ThemeManager:
                                    
     def _draw_sea_pattern(self, surface, width, height, theme):
         """Draw sea-themed pattern."""
-        # Draw wave-like curves
-        time_offset = pygame.time.get_ticks() * 0.002
-        for y in range(0, height, 60):
-            points = []
-            for x in range(0, width + 20, 20):
-                wave_y = y + 10 * math.cos(x * 0.02 + time_offset)
-                points.append((x, wave_y))
+        # Draw wave-like curves; the point lists are kept and moved in place
+        time_offset = self.get_ticks() * 0.002
+        rows = range(0, height, 60)
+        columns = range(0, width + 20, 20)
+        if len(self.wave_points) != len(rows) or len(self.wave_points[0]) != len(columns):
+            self.wave_points = [[[x, y] for x in columns] for y in rows]
+        for y, points in zip(rows, self.wave_points):
+            for point in points:
+                point[1] = y + 10 * math.cos(point[0] * 0.02 + time_offset)
             if len(points) > 1:
                 pygame.draw.lines(surface, theme['accent_color'], False, points, 2)
                 
     def _draw_snow_pattern(self, surface, width, height, theme):
         """Draw snow-themed pattern."""
         # Draw falling snowflakes
-        time_offset = pygame.time.get_ticks()
+        time_offset = self.get_ticks()
         for i in range(20):
             x = (i * 67 + time_offset * 0.1) % width
             y = (i * 43 + time_offset * 0.05) % height
@@ -148,7 +204,8 @@ class ThemeManager:
         """Get display name for theme."""
         if theme_key is None:
             theme_key = self.current_theme
-        return THEMES.get(theme_key, {}).get('name', theme_key.title())
+        theme = THEMES.get(theme_key)
+        return theme['name'] if theme else theme_key.title()
         
     def create_particle_effect(self, pos, effect_type='eat'):
         """Create particle effects for game events."""
@@ -157,8 +214,9 @@ class ThemeManager:
         
         if effect_type == 'eat':
             # Food eating particles
-            for i in range(8):
-                angle = i * 45
+            count = round(8 * self.quality['particles'])
+            for i in range(count):
+                angle = i * 360 / count
                 velocity = random.uniform(2, 5)
                 particles.append({
                     'pos': list(pos),
@@ -170,8 +228,9 @@ class ThemeManager:
                 })
         elif effect_type == 'bonus':
             # Bonus food particles
-            for i in range(12):
-                angle = i * 30
+            count = round(12 * self.quality['particles'])
+            for i in range(count):
+                angle = i * 360 / count
                 velocity = random.uniform(3, 7)
                 particles.append({
                     'pos': list(pos),
@@ -186,24 +245,39 @@ class ThemeManager:
         
     def update_particles(self, particles):
         """Update particle system."""
-        for particle in particles[:]:
+        # Live particles are compacted to the front in place, without a copy
+        alive = 0
+        for particle in particles:
             particle['pos'][0] += particle['vel'][0]
             particle['pos'][1] += particle['vel'][1]
             particle['vel'][0] *= 0.95  # Air resistance
             particle['vel'][1] *= 0.95
             particle['life'] -= 1
             
-            if particle['life'] <= 0:
-                particles.remove(particle)
+            if particle['life'] > 0:
+                particles[alive] = particle
+                alive += 1
+        del particles[alive:]
                 
     def draw_particles(self, surface, particles):
-        """Draw particle effects."""
+        """Draw particle effects; returns the rects drawn."""
+        rects = []
         for particle in particles:
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-            color = (*particle['color'], alpha)
-            
-            # Create surface for alpha blending
-            particle_surf = pygame.Surface((6, 6), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surf, color, (3, 3), 3)
-            surface.blit(particle_surf, 
-                        (int(particle['pos'][0] - 3), int(particle['pos'][1] - 3)))
\ No newline at end of file
+            sprites = self.particle_sprites.get(particle['color'])
+            if sprites is None:
+                sprites = self._build_particle_sprites(particle['color'])
+            level = PARTICLE_ALPHA_LEVELS * particle['life'] // particle['max_life']
+            rects.append(surface.blit(sprites[min(level, PARTICLE_ALPHA_LEVELS - 1)],
+                                      (int(particle['pos'][0] - 3), int(particle['pos'][1] - 3))))
+        return rects
+                         
+    def _build_particle_sprites(self, color):
+        """Render a particle of one color at every alpha level."""
+        sprites = []
+        for level in range(PARTICLE_ALPHA_LEVELS):
+            sprite = pygame.Surface((6, 6), pygame.SRCALPHA)
+            alpha = 255 * (level + 1) // PARTICLE_ALPHA_LEVELS
+            pygame.draw.circle(sprite, (*color, alpha), (3, 3), 3)
+            sprites.append(sprite)
+        self.particle_sprites[color] = sprites
+        return sprites
\ No newline at end of file
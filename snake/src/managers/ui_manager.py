@@ -5,7 +5,17 @@ Handles menus, HUD, and user interface elements.
 
 import pygame
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, 
-                   GRAY, DARK_GRAY, THEMES)
+                   GRAY, DARK_GRAY, THEMES, CLASSIC_SPEED_LEVELS,
+                   BOARD_X, BOARD_Y, BOARD_WIDTH, BOARD_HEIGHT,
+                   CLASSIC_BACKGROUND, CLASSIC_MESSAGE_COLOR)
+
+# HUD positions in the right column and along the bottom
+BONUS_POS = (SCREEN_WIDTH - 150, 20)
+SPEED_POS = (SCREEN_WIDTH - 150, 50)
+HINT_X, HINT_Y = SCREEN_WIDTH - 150, 80
+HINT_POS = (HINT_X, HINT_Y)
+CLOCK_POS = (SCREEN_WIDTH - 200, SCREEN_HEIGHT - 40)
+QUALITY_POS = (20, SCREEN_HEIGHT - 40)
 
 class Button:
     """Simple button class."""
@@ -45,6 +55,7 @@ class UIManager:
         self.font_small = pygame.font.Font(None, 24)
         self.current_menu = 'main'
         self.buttons = []
+        self.hover_changed = False  # A button's hover state changed since the last draw
         self.selected_theme_filter = 'All'
         self.score_manager = None
         self.theme_manager = None
@@ -52,6 +63,14 @@ class UIManager:
         self.game_over_stats = {}
         self.game_over_theme = None
         self.is_high_score = False
+        self.replay_bar_rect = pygame.Rect(BOARD_X, BOARD_Y + BOARD_HEIGHT + 16, BOARD_WIDTH, 12)
+        
+        # HUD text is rendered again only when its value changes
+        self.text_cache = {}  # slot -> (value, surface)
+        self.hint_version = None  # DistanceField version the food hint was made for
+        self.hint_text = None
+        self.hint_arrow = None  # Polygon points, or None without a direction
+        self.pause_overlay = None
         self.setup_main_menu()
         
     def setup_main_menu(self):
@@ -61,9 +80,22 @@ class UIManager:
         
         # Create buttons
         self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 250, 200, 50, 'Start Game', self.font_medium))
-        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 320, 200, 50, 'Select Theme', self.font_medium))
-        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 390, 200, 50, 'High Scores', self.font_medium))
-        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 460, 200, 50, 'Quit', self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 320, 200, 50, 'Classic Mode', self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 390, 200, 50, 'Select Theme', self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 460, 200, 50, 'High Scores', self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 530, 200, 50, 'Heatmaps', self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 600, 200, 50, 'Quit', self.font_medium))
+        
+    def setup_classic_menu(self):
+        """Setup classic mode speed level menu."""
+        self.current_menu = 'classic'
+        self.buttons = []
+        
+        for i, level in enumerate(CLASSIC_SPEED_LEVELS):
+            self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 250 + i * 70, 200, 50,
+                                     level, self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 100, 250 + len(CLASSIC_SPEED_LEVELS) * 70 + 10,
+                                 200, 50, 'Back', self.font_medium))
         
     def setup_theme_menu(self, theme_manager):
         """Setup theme selection menu."""
@@ -111,52 +143,152 @@ class UIManager:
                                  'Play Again', self.font_medium))
         self.buttons.append(Button(SCREEN_WIDTH//2 + 30, 450, 120, 50, 
                                  'Main Menu', self.font_medium))
+        self.buttons.append(Button(SCREEN_WIDTH//2 - 60, 520, 120, 50, 
+                                 'Replay', self.font_medium))
         
     def clear_menu(self):
         """Clear current menu elements."""
         self.buttons = []
         
-    def draw_game_hud(self, surface, score_manager, theme_manager, food_manager):
-        """Draw game HUD during gameplay."""
+    def render_cached(self, slot, value, font, text, color=WHITE):
+        """Render text.format(value), reusing the slot's surface while value is unchanged."""
+        cached = self.text_cache.get(slot)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        text_surface = font.render(text.format(value), True, color)
+        self.text_cache[slot] = (value, text_surface)
+        return text_surface
+        
+    def draw_game_hud(self, surface, score_manager, theme_manager, food_manager,
+                      distance_field=None):
+        """Draw game HUD during gameplay; returns the rects drawn."""
         # Score
-        score_text = self.font_medium.render(
-            f"Score: {score_manager.format_score(score_manager.get_current_score())}", 
-            True, WHITE)
-        surface.blit(score_text, (20, 20))
+        score_text = self.render_cached('score', score_manager.get_current_score(),
+                                        self.font_medium, "Score: {:,}")
+        rects = [surface.blit(score_text, (20, 20))]
         
         # Food count
-        food_text = self.font_small.render(
-            f"Food: {score_manager.get_food_count()}", True, WHITE)
-        surface.blit(food_text, (20, 60))
+        food_text = self.render_cached('food', score_manager.get_food_count(),
+                                       self.font_small, "Food: {}")
+        rects.append(surface.blit(food_text, (20, 60)))
         
         # Current theme
-        theme_name = theme_manager.get_theme_display_name()
-        theme_text = self.font_small.render(f"Theme: {theme_name}", True, WHITE)
-        surface.blit(theme_text, (20, 90))
+        theme_text = self.render_cached('theme', theme_manager.get_theme_display_name(),
+                                        self.font_small, "Theme: {}")
+        rects.append(surface.blit(theme_text, (20, 90)))
         
         # Difficulty level
-        level = score_manager.get_difficulty_level()
-        level_text = self.font_small.render(f"Level: {level}", True, WHITE)
-        surface.blit(level_text, (20, 120))
+        level_text = self.render_cached('level', score_manager.get_difficulty_level(),
+                                        self.font_small, "Level: {}")
+        rects.append(surface.blit(level_text, (20, 120)))
         
-        # Bonus timer
+        # Bonus timer, shown to a tenth of a second
         if food_manager.has_bonus_food():
-            time_left = food_manager.get_bonus_time_remaining()
-            timer_text = self.font_small.render(
-                f"Bonus: {time_left:.1f}s", True, (255, 215, 0))
-            surface.blit(timer_text, (SCREEN_WIDTH - 150, 20))
+            time_left = round(food_manager.get_bonus_time_remaining(), 1)
+            timer_text = self.render_cached('bonus', time_left, self.font_small,
+                                            "Bonus: {:.1f}s", (255, 215, 0))
+            rects.append(surface.blit(timer_text, BONUS_POS))
             
         # Speed indicator
-        speed_mult = score_manager.get_speed_multiplier()
-        speed_text = self.font_small.render(f"Speed: {speed_mult:.1f}x", True, WHITE)
-        surface.blit(speed_text, (SCREEN_WIDTH - 150, 50))
+        speed_text = self.render_cached('speed', round(score_manager.get_speed_multiplier(), 1),
+                                        self.font_small, "Speed: {:.1f}x")
+        rects.append(surface.blit(speed_text, SPEED_POS))
+        
+        # Hint arrow towards the food
+        if distance_field and distance_field.head:
+            rects.extend(self.draw_food_hint(surface, distance_field))
+        return rects
+            
+    def draw_food_hint(self, surface, distance_field):
+        """Draw steps to food with an arrow along the shortest path; returns the rects drawn."""
+        # The hint changes only with the distance field, i.e. per move
+        if distance_field.version != self.hint_version:
+            self.hint_version = distance_field.version
+            self.hint_arrow = None
+            steps = distance_field.food_distance(distance_field.head)
+            if steps >= distance_field.unreachable:
+                self.hint_text = self.render_cached('hint', None, self.font_small, "Food: no path")
+            else:
+                self.hint_text = self.render_cached('hint', steps, self.font_small, "Food: {}")
+                direction = distance_field.next_step_to_food()
+                if direction:
+                    cx = HINT_X + self.hint_text.get_width() + 16
+                    cy = HINT_Y + self.hint_text.get_height() // 2
+                    dx, dy = direction
+                    tip = (cx + dx * 7, cy + dy * 7)
+                    left = (cx - dx * 5 + dy * 5, cy - dy * 5 - dx * 5)
+                    right = (cx - dx * 5 - dy * 5, cy - dy * 5 + dx * 5)
+                    self.hint_arrow = [tip, left, right]
+                    
+        rects = [surface.blit(self.hint_text, HINT_POS)]
+        if self.hint_arrow:
+            rects.append(pygame.draw.polygon(surface, (255, 215, 0), self.hint_arrow))
+        return rects
+        
+    def draw_clock_status(self, surface, game_clock):
+        """Show the game speed when it differs from real time; returns the rect drawn, or None."""
+        if game_clock.unthrottled:
+            speed_text = self.render_cached('clock', None, self.font_small, "Speed: unthrottled")
+        elif game_clock.scale != 1.0:
+            speed_text = self.render_cached('clock', game_clock.scale, self.font_small,
+                                            "Speed: {:g}x")
+        else:
+            return None
+        return surface.blit(speed_text, CLOCK_POS)
+        
+    def draw_quality_status(self, surface, quality_governor):
+        """Show the visual quality tier and whether it is automatic; returns the rect drawn."""
+        # Every tier or mode change counts in changes, so it keys the label
+        cached = self.text_cache.get('quality')
+        if cached is None or cached[0] != quality_governor.changes:
+            cached = (quality_governor.changes, self.font_small.render(
+                f"{quality_governor.get_label()} | G: change", True, WHITE))
+            self.text_cache['quality'] = cached
+        return surface.blit(cached[1], QUALITY_POS)
+        
+    def draw_heatmap_caption(self, surface, kind, theme, level, total):
+        """Draw the heatmap viewer's title, selection and key help."""
+        theme_name = THEMES[theme]['name'] if theme else 'All Themes'
+        level_name = f"Level {level}" if level is not None else 'All Levels'
+        title_text = self.font_large.render(f"{kind.title()} Heatmap", True, WHITE)
+        surface.blit(title_text, title_text.get_rect(center=(SCREEN_WIDTH//2, 40)))
+        
+        info_text = self.font_small.render(
+            f"{theme_name} | {level_name} | {total:,} {kind}", True, WHITE)
+        surface.blit(info_text, info_text.get_rect(center=(SCREEN_WIDTH//2, 80)))
+        
+        help_text = self.font_small.render(
+            "Tab: visits/deaths | Left/Right: theme | Up/Down: level | Esc: back", True, WHITE)
+        surface.blit(help_text, help_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 40)))
+        
+    def draw_replay_bar(self, surface, player):
+        """Draw the replay progress bar, playback status and key help."""
+        bar = self.replay_bar_rect
+        pygame.draw.rect(surface, DARK_GRAY, bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * player.get_progress())
+        pygame.draw.rect(surface, (255, 215, 0), filled)
+        pygame.draw.rect(surface, WHITE, bar, 1)
+        
+        status = 'Playing' if player.playing else 'Paused'
+        status_text = self.font_small.render(
+            f"{status} {player.speed:g}x | Tick {player.state.tick}/"
+            f"{player.replay.get_tick_count()} | {player.position / 1000:.1f}s / "
+            f"{player.replay.get_duration() / 1000:.1f}s", True, WHITE)
+        surface.blit(status_text, status_text.get_rect(center=(SCREEN_WIDTH//2, bar.bottom + 20)))
+        
+        help_text = self.font_small.render(
+            "Space: play/pause | Left/Right: -/+5s | , .: step | [ ]: speed | Esc: back",
+            True, WHITE)
+        surface.blit(help_text, help_text.get_rect(center=(SCREEN_WIDTH//2, bar.bottom + 48)))
         
     def draw_pause_overlay(self, surface):
         """Draw pause overlay."""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        surface.blit(overlay, (0, 0))
+        if self.pause_overlay is None:
+            self.pause_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.pause_overlay.fill((0, 0, 0))
+            self.pause_overlay.set_alpha(128)
+        surface.blit(self.pause_overlay, (0, 0))
         
         pause_text = self.font_large.render("PAUSED", True, WHITE)
         text_rect = pause_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
@@ -169,8 +301,11 @@ class UIManager:
     def handle_event(self, event):
         """Handle UI events."""
         for button in self.buttons:
+            hovered = button.is_hovered
             if button.handle_event(event):
                 return button
+            if button.is_hovered != hovered:
+                self.hover_changed = True
         return None
         
     def update(self, time_delta):
@@ -183,6 +318,8 @@ class UIManager:
             self.draw_main_menu(surface)
         elif self.current_menu == 'themes':
             self.draw_theme_menu(surface)
+        elif self.current_menu == 'classic':
+            self.draw_classic_menu(surface)
         elif self.current_menu == 'scores':
             self.draw_scores_menu(surface)
         elif self.current_menu == 'game_over':
@@ -206,6 +343,25 @@ class UIManager:
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 150))
         surface.blit(title_text, title_rect)
         
+    def draw_classic_menu(self, surface):
+        """Draw classic mode speed level menu."""
+        title_text = self.font_large.render('Classic Mode: Select Speed Level', True, WHITE)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 150))
+        surface.blit(title_text, title_rect)
+        
+    def draw_classic_score(self, surface, score, x, y):
+        """Draw the classic mode score in the board's top-left corner."""
+        value = self.font_medium.render(f"Your Score: {score}", True, WHITE)
+        surface.blit(value, (x, y))
+        
+    def draw_classic_lose_screen(self, surface, score, x, y, width, height):
+        """Draw the classic mode lose screen over the board."""
+        surface.fill(CLASSIC_BACKGROUND, (x, y, width, height))
+        message = self.font_large.render("You lost! Press Q-Quit or C-Play Again", True,
+                                         CLASSIC_MESSAGE_COLOR)
+        surface.blit(message, (x + width // 6, y + height // 3))
+        self.draw_classic_score(surface, score, x, y)
+        
     def draw_scores_menu(self, surface):
         """Draw high scores menu."""
         # Title
@@ -271,7 +427,7 @@ class UIManager:
                 hs_text = self.font_medium.render('New High Score!', True, (255, 215, 0))
                 hs_rect = hs_text.get_rect(center=(SCREEN_WIDTH//2, 390))
                 surface.blit(hs_text, hs_rect)
-
+                
         
     def get_current_menu(self):
         """Get current menu state."""
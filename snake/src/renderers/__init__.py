@@ -0,0 +1,2 @@
+# Snake Odyssey: Themed Evolution
+# Renderer modules
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Pygame renderer for the Snake Odyssey game.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from config import (SCREEN_WIDTH, SCREEN_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, BOARD_X, BOARD_Y,
+                   WHITE, RENDER_THREADS)
+from renderers.renderer import Renderer
+
+BOARD_BORDER = pygame.Rect(BOARD_X - 2, BOARD_Y - 2, BOARD_WIDTH + 4, BOARD_HEIGHT + 4)
+BOARD_RECT = pygame.Rect(BOARD_X, BOARD_Y, BOARD_WIDTH, BOARD_HEIGHT)
+CLEAR = (0, 0, 0, 0)
+
+def merge_rects(rects):
+    """Merge overlapping rects, so every pixel is covered by exactly one of them."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        while True:
+            index = rect.collidelist(merged)
+            if index < 0:
+                break
+            rect.union_ip(merged.pop(index))
+        merged.append(rect)
+    return merged
+
+class PygameRenderer(Renderer):
+    """Draws frames into the game window with the theme and board renderers.
+    
+    The display is flipped by the game after every state has drawn, so
+    render() only paints the screen surface. Every flip sends the whole
+    window, which is what bytes_written counts.
+    
+    With threads > 0 the frame is composed from layers drawn at the same
+    time: the background straight onto the screen on the calling thread,
+    and the board (with snake and food), particles and HUD into their own
+    surfaces on a thread pool. pygame releases the GIL in its blits and
+    fills, so the layers overlap on several cores. The particle and HUD
+    layers are transparent; only the rects drawn on them are cleared and
+    blended onto the screen, as a full-screen alpha blend would cost more
+    than the drawing itself.
+    """
+    
+    draws_menus = True
+    
+    def __init__(self, screen, theme_manager, board_renderer, ui_manager,
+                 game_clock=None, quality_governor=None, threads=RENDER_THREADS):
+        """Initialize renderer for the given screen and managers."""
+        super().__init__()
+        self.screen = screen
+        self.theme_manager = theme_manager
+        self.board_renderer = board_renderer
+        self.ui_manager = ui_manager
+        self.game_clock = game_clock
+        self.quality_governor = quality_governor
+        
+        # Layer compositing, set up on the first layered frame
+        self.threads = threads
+        self.pool = None
+        self.board_layer = None
+        self.particle_layer = None
+        self.hud_layer = None
+        self.particle_rects = []
+        self.hud_rects = []
+        
+    def render(self, frame):
+        """Draw the board, effects and HUD of a frame."""
+        screen = self.screen
+        if self.threads:
+            self.render_layers(frame)
+        else:
+            # Draw themed background
+            self.draw_background(screen)
+            
+            # Draw board, obstacles, snake and food from the persistent layer
+            if frame.snake:
+                self.board_renderer.draw(screen, BOARD_X, BOARD_Y, frame.theme,
+                                         frame.snake, frame.food, frame.obstacles)
+            
+            # Draw particles
+            self.theme_manager.draw_particles(screen, frame.particles)
+            
+            # Draw HUD
+            self.draw_hud(screen, frame)
+            
+        if frame.status == 'paused':
+            self.ui_manager.draw_pause_overlay(screen)
+            
+        self.frames += 1
+        self.bytes_written += screen.get_pitch() * screen.get_height()
+        
+    def draw_background(self, surface):
+        """Draw the themed background and the board border."""
+        self.theme_manager.draw_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        pygame.draw.rect(surface, WHITE, BOARD_BORDER, 2)
+        
+    def draw_hud(self, surface, frame):
+        """Draw the HUD; returns the rects drawn."""
+        rects = self.ui_manager.draw_game_hud(surface, frame.score_manager,
+                                              self.theme_manager, frame.food,
+                                              frame.distance_field)
+        if self.game_clock:
+            rect = self.ui_manager.draw_clock_status(surface, self.game_clock)
+            if rect:
+                rects.append(rect)
+        if self.quality_governor:
+            rects.append(self.ui_manager.draw_quality_status(surface, self.quality_governor))
+        return rects
+        
+    def render_layers(self, frame):
+        """Draw the layers of a frame in parallel and blend them onto the screen in order."""
+        screen = self.screen
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.threads,
+                                           thread_name_prefix='layer')
+            self.board_layer = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT), 0, screen)
+            self.particle_layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.hud_layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            
+        board = None
+        if frame.snake:
+            board = self.pool.submit(self.board_renderer.draw, self.board_layer, 0, 0,
+                                     frame.theme, frame.snake, frame.food, frame.obstacles)
+        particles = None
+        if frame.particles or self.particle_rects:
+            particles = self.pool.submit(self.draw_particle_layer, frame.particles)
+        hud = self.pool.submit(self.draw_hud_layer, frame)
+        self.draw_background(screen)
+        
+        if board is not None:
+            board.result()
+            screen.blit(self.board_layer, BOARD_RECT)
+        if particles is not None:
+            self.particle_rects = particles.result()
+            self.blend_layer(self.particle_layer, self.particle_rects)
+        self.hud_rects = hud.result()
+        self.blend_layer(self.hud_layer, self.hud_rects)
+        
+    def draw_particle_layer(self, particles):
+        """Redraw the particle layer; returns its drawn rects, merged."""
+        layer = self.particle_layer
+        for rect in self.particle_rects:
+            layer.fill(CLEAR, rect)
+        return merge_rects(self.theme_manager.draw_particles(layer, particles))
+        
+    def draw_hud_layer(self, frame):
+        """Redraw the HUD layer; returns its drawn rects, merged."""
+        layer = self.hud_layer
+        for rect in self.hud_rects:
+            layer.fill(CLEAR, rect)
+        return merge_rects(self.draw_hud(layer, frame))
+        
+    def blend_layer(self, layer, rects):
+        """Blend the given rects of a transparent layer onto the screen."""
+        if rects:
+            self.screen.blits([(layer, rect, rect) for rect in rects], False)
+            
+    def close(self):
+        """Stop the layer threads."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
\ No newline at end of file
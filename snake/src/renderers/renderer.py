@@ -0,0 +1,73 @@
+"""
+Renderer interface for the Snake Odyssey game.
+"""
+
+class Frame:
+    """Board state handed to a renderer for one frame.
+    
+    It refers to the live game objects instead of copying them, so the
+    game keeps one Frame and only updates it; renderers must read it
+    during render() and not hold on to it.
+    """
+    
+    def __init__(self):
+        """Initialize an empty frame."""
+        self.theme = None  # Key into THEMES
+        self.snake = None
+        self.food = None
+        self.obstacles = ()
+        self.particles = ()
+        self.score_manager = None
+        self.distance_field = None
+        self.status = 'playing'  # 'playing', 'paused' or 'game_over'
+        
+    def update(self, theme, snake, food, obstacles, score_manager, particles=(),
+               distance_field=None, status='playing'):
+        """Point the frame at the current game state."""
+        self.theme = theme
+        self.snake = snake
+        self.food = food
+        self.obstacles = obstacles
+        self.score_manager = score_manager
+        self.particles = particles
+        self.distance_field = distance_field
+        self.status = status
+        return self
+
+class Renderer:
+    """Output backend that draws game frames.
+    
+    Subclasses implement render(). Backends that take over the screen
+    also report the keys pressed there through poll_keys(), as pygame key
+    codes, so the game can be played through them.
+    """
+    
+    draws_menus = False  # True if the menus are shown by this backend
+    input_poll_ms = 0  # How often idle screens must call poll_keys; 0 if never
+    
+    def __init__(self):
+        """Initialize frame and output counters."""
+        self.frames = 0
+        self.bytes_written = 0
+        
+    def render(self, frame):
+        """Draw one frame."""
+        raise NotImplementedError
+        
+    def poll_keys(self):
+        """Get the keys pressed since the last call."""
+        return ()
+        
+    def get_bytes_per_frame(self):
+        """Get the average output size of a frame."""
+        return self.bytes_written / self.frames if self.frames else 0.0
+        
+    def close(self):
+        """Release the output."""
+
+class NullRenderer(Renderer):
+    """Renderer that draws nothing, for benchmarks and servers."""
+    
+    def render(self, frame):
+        """Count the frame and discard it."""
+        self.frames += 1
\ No newline at end of file
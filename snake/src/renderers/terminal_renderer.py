@@ -0,0 +1,195 @@
+"""
+ANSI terminal renderer for the Snake Odyssey game.
+"""
+
+import os
+import select
+import sys
+import numpy as np
+import pygame
+from config import GRID_WIDTH, GRID_HEIGHT, THEMES
+from renderers.renderer import Renderer
+
+# Cell codes of the character grid
+EMPTY, BODY, HEAD, FOOD, BONUS, OBSTACLE = range(6)
+HEAD_COLOR = (255, 255, 255)
+BONUS_COLOR = (255, 215, 0)
+
+# Arrow key escape sequences; any other byte is its own pygame key code
+KEY_SEQUENCES = {
+    b'\x1b[A': pygame.K_UP,
+    b'\x1b[B': pygame.K_DOWN,
+    b'\x1b[C': pygame.K_RIGHT,
+    b'\x1b[D': pygame.K_LEFT,
+}
+
+class TerminalRenderer(Renderer):
+    """Draws the board as colored blocks in an ANSI terminal.
+    
+    Each cell is two character columns with a 24-bit background color.
+    The renderer remembers what the terminal shows and writes only the
+    cells that differ from it, skipping cursor moves between neighbouring
+    cells and color codes between cells of one color, so a typical move
+    costs a few dozen bytes. That keeps play and monitoring over SSH
+    cheap. Keys typed into the terminal are read without echo.
+    """
+    
+    input_poll_ms = 50
+    
+    def __init__(self, stream=None, input_stream=None, width=GRID_WIDTH, height=GRID_HEIGHT):
+        """Initialize renderer; stream defaults to stdout and input to stdin."""
+        super().__init__()
+        self.stream = stream or sys.stdout.buffer
+        self.width = width
+        self.height = height
+        
+        # The grid being drawn and the grid the terminal shows
+        self.cells = bytearray(width * height)
+        self.blank = bytes(width * height)
+        self.shown = bytearray(width * height)
+        self.cells_view = np.frombuffer(self.cells, dtype=np.uint8)
+        self.shown_view = np.frombuffer(self.shown, dtype=np.uint8)
+        self.cleared = False
+        self.theme = None
+        self.palette = None
+        self.status_shown = None
+        
+        self.input_fd = None
+        self.saved_mode = None
+        self._open_input(sys.stdin if input_stream is None else input_stream)
+        
+    def _open_input(self, input_stream):
+        """Read keys one at a time without echo if the input is a terminal."""
+        if not input_stream or not input_stream.isatty():
+            return
+        try:
+            import termios
+            import tty
+        except ImportError:
+            return  # No terminal control on this platform
+        self.input_fd = input_stream.fileno()
+        self.saved_mode = termios.tcgetattr(self.input_fd)
+        tty.setcbreak(self.input_fd)
+        
+    def _set_theme(self, theme_name):
+        """Build the color codes of a theme; the screen is redrawn in full."""
+        theme = THEMES[theme_name]
+        colors = (theme['background_color'], theme['snake_color'], HEAD_COLOR,
+                  theme['food_color'], BONUS_COLOR, theme['obstacle_color'])
+        self.palette = [b'\x1b[48;2;%d;%d;%dm' % color for color in colors]
+        self.theme = theme_name
+        self.cleared = False
+        
+    def render(self, frame):
+        """Write the cells and status text that changed since the last frame."""
+        if frame.theme != self.theme:
+            self._set_theme(frame.theme)
+        out = bytearray()
+        if not self.cleared:
+            # Hide the cursor, clear the screen and mark every cell as stale
+            out += b'\x1b[?25l\x1b[0m\x1b[2J'
+            self.shown[:] = b'\xff' * len(self.shown)
+            self.status_shown = None
+            self.cleared = True
+            
+        self._fill_cells(frame)
+        
+        palette = self.palette
+        cells = self.cells
+        width = self.width
+        color = None
+        cursor = -1
+        for index in np.flatnonzero(self.cells_view != self.shown_view).tolist():
+            if index != cursor:
+                row, column = divmod(index, width)
+                out += b'\x1b[%d;%dH' % (row + 2, column * 2 + 1)
+            code = cells[index]
+            if code != color:
+                out += palette[code]
+                color = code
+            out += b'  '
+            # At the end of a row the cursor does not move on to the next one
+            cursor = index + 1 if (index + 1) % width else -1
+        self.shown[:] = cells
+        
+        status = self._get_status(frame)
+        if status != self.status_shown:
+            out += b'\x1b[0m\x1b[1;1H' + status.encode() + b'\x1b[K'
+            self.status_shown = status
+            color = None
+        if color is not None:
+            out += b'\x1b[0m'
+            
+        self.frames += 1
+        if out:
+            self.stream.write(out)
+            self.stream.flush()
+            self.bytes_written += len(out)
+            
+    def _fill_cells(self, frame):
+        """Rasterize the frame's board into the cell grid."""
+        cells = self.cells
+        width = self.width
+        cells[:] = self.blank
+        for x, y in frame.obstacles:
+            cells[y * width + x] = OBSTACLE
+        if frame.food:
+            if frame.food.regular_food:
+                x, y = frame.food.regular_food
+                cells[y * width + x] = FOOD
+            if frame.food.bonus_food:
+                x, y = frame.food.bonus_food
+                cells[y * width + x] = BONUS
+        if frame.snake:
+            for x, y in frame.snake.body:
+                if 0 <= x < width and 0 <= y < self.height:
+                    cells[y * width + x] = BODY
+            x, y = frame.snake.body[0]
+            if 0 <= x < width and 0 <= y < self.height:
+                cells[y * width + x] = HEAD
+                
+    def _get_status(self, frame):
+        """Get the status line text of a frame."""
+        score_manager = frame.score_manager
+        parts = [f"Score: {score_manager.format_score(score_manager.get_current_score())}",
+                 f"Food: {score_manager.get_food_count()}",
+                 THEMES[frame.theme]['name'],
+                 f"Level {score_manager.get_difficulty_level()}"]
+        if frame.food and frame.food.has_bonus_food():
+            parts.append(f"Bonus: {frame.food.get_bonus_time_remaining():.1f}s")
+        if frame.status == 'paused':
+            parts.append("PAUSED (P: resume)")
+        elif frame.status == 'game_over':
+            parts.append("GAME OVER (R: restart, Q: quit)")
+        return ' | '.join(parts)
+        
+    def poll_keys(self):
+        """Get the keys typed into the terminal since the last call."""
+        if self.input_fd is None:
+            return ()
+        readable, _, _ = select.select([self.input_fd], [], [], 0)
+        if not readable:
+            return ()
+        data = os.read(self.input_fd, 64)
+        keys = []
+        i = 0
+        while i < len(data):
+            key = KEY_SEQUENCES.get(data[i:i + 3])
+            if key is not None:
+                i += 3
+            else:
+                key = ord(chr(data[i]).lower())
+                i += 1
+            keys.append(key)
+        return keys
+        
+    def close(self):
+        """Restore the cursor, colors and input mode of the terminal."""
+        if self.cleared:
+            self.stream.write(b'\x1b[0m\x1b[?25h\x1b[%d;1H\n' % (self.height + 2))
+            self.stream.flush()
+            self.cleared = False
+        if self.saved_mode is not None:
+            import termios
+            termios.tcsetattr(self.input_fd, termios.TCSADRAIN, self.saved_mode)
+            self.saved_mode = None
\ No newline at end of file
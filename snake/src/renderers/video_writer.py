@@ -0,0 +1,191 @@
+"""
+Video export for the Snake Odyssey game.
+Streams captured frames to an encoder process or a PNG sequence.
+"""
+
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import zlib
+import numpy as np
+import pygame
+from config import (EXPORT_FPS, EXPORT_QUEUE_FRAMES, EXPORT_ENCODER, EXPORT_VIDEO_EXTENSIONS,
+                   EXPORT_PNG_LEVEL, EXPORT_PNG_WORKERS)
+
+def get_pixel_layout(surface):
+    """Get (pixel format name, bytes per pixel, RGB byte offsets) for capturing a surface.
+    
+    32-bit surfaces are captured as their raw bytes, named in the
+    encoder's terms (e.g. 'bgr0'); other depths are captured as 'rgb24'.
+    """
+    if surface.get_bytesize() != 4 or surface.get_pitch() != surface.get_width() * 4:
+        return 'rgb24', 3, (0, 1, 2)
+    offsets = []
+    for shift in surface.get_shifts()[:3]:
+        offset = shift // 8
+        offsets.append(offset if sys.byteorder == 'little' else 3 - offset)
+    name = ['0'] * 4
+    for channel, offset in zip('rgb', offsets):
+        name[offset] = channel
+    return ''.join(name), 4, tuple(offsets)
+
+def png_chunk(kind, data):
+    """Wrap data in a PNG chunk with its length and checksum."""
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def encode_png(frame, offsets, level=EXPORT_PNG_LEVEL):
+    """Encode a (height, width, bytes per pixel) frame as an RGB PNG.
+    
+    Fast compression suits the large flat areas of game frames, and zlib
+    runs without the GIL, so several threads can encode at once.
+    """
+    height, width = frame.shape[:2]
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # Leading 0: no row filter
+    pixels = rows[:, 1:].reshape(height, width, 3)
+    for channel, offset in enumerate(offsets):
+        pixels[:, :, channel] = frame[:, :, offset]
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) +
+            png_chunk(b'IDAT', zlib.compress(rows, level)) + png_chunk(b'IEND', b''))
+
+class FrameWriter:
+    """Captures frames from a surface and writes them on a worker thread.
+    
+    capture() copies the surface pixels, taken zero-copy through
+    get_view() or surfarray.pixels3d(), into a buffer from a small pool
+    and queues it, so the game can render the next frame while the worker
+    converts and writes this one. When the worker falls behind, capture()
+    waits for a free buffer instead of queueing without bound.
+    Subclasses implement write_frame() for one output format.
+    """
+    
+    def __init__(self, width, height, layout, fps=EXPORT_FPS, workers=1,
+                 queue_frames=EXPORT_QUEUE_FRAMES):
+        """Initialize writer for frames of the given size and pixel layout."""
+        self.width = width
+        self.height = height
+        self.pixel_format, self.pixel_bytes, self.offsets = layout
+        self.fps = fps
+        self.frames = 0
+        self.error = None
+        
+        frame_bytes = width * height * self.pixel_bytes
+        self.free = queue.Queue()
+        for _ in range(queue_frames + workers):
+            self.free.put(bytearray(frame_bytes))
+        self.pending = queue.Queue()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+            
+    def capture(self, surface):
+        """Queue the surface's current pixels as the next frame."""
+        if self.error is not None:
+            raise self.error
+        buffer = self.free.get()
+        if self.pixel_bytes == 4:
+            buffer[:] = surface.get_view('0')
+        else:
+            # surfarray is indexed [x, y]; frames are stored row by row
+            pixels = pygame.surfarray.pixels3d(surface)
+            np.copyto(self.get_frame(buffer), pixels.transpose(1, 0, 2))
+            del pixels  # Unlocks the surface
+        self.pending.put((self.frames, buffer))
+        self.frames += 1
+        
+    def _work(self):
+        """Write queued frames until the end marker."""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            index, buffer = item
+            if self.error is None:
+                try:
+                    self.write_frame(index, buffer)
+                except (OSError, ValueError, pygame.error) as e:
+                    self.error = e
+            self.free.put(buffer)
+            
+    def get_frame(self, buffer):
+        """View a frame buffer as an array of shape (height, width, bytes per pixel)."""
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(self.height, self.width,
+                                                             self.pixel_bytes)
+        
+    def write_frame(self, index, buffer):
+        """Write the frame buffer with the given frame number."""
+        raise NotImplementedError
+        
+    def close(self):
+        """Write the remaining frames and finish the output."""
+        for worker in self.workers:
+            self.pending.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.finish()
+        if self.error is not None:
+            raise self.error
+            
+    def finish(self):
+        """Finish the output after the last frame."""
+
+class EncoderWriter(FrameWriter):
+    """Streams raw frames to an encoder process (ffmpeg) through its stdin."""
+    
+    def __init__(self, path, width, height, layout, fps=EXPORT_FPS, encoder=EXPORT_ENCODER):
+        """Start the encoder writing the video to path."""
+        command = [encoder, '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', layout[0], '-s', f'{width}x{height}',
+                   '-r', str(fps), '-i', '-',
+                   '-pix_fmt', 'yuv420p', path]
+        self.path = path
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        super().__init__(width, height, layout, fps)
+        
+    def write_frame(self, index, buffer):
+        """Pipe one raw frame to the encoder; a single worker keeps them in order."""
+        self.process.stdin.write(buffer)
+        
+    def finish(self):
+        """Close the pipe and wait for the encoder to finish the file."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass  # The encoder already quit; its exit status says why
+        if self.process.wait() != 0 and self.error is None:
+            self.error = OSError(f"Encoder exited with status {self.process.returncode}")
+
+class PngSequenceWriter(FrameWriter):
+    """Writes frames as numbered PNG files into a directory, on several threads."""
+    
+    def __init__(self, directory, width, height, layout, fps=EXPORT_FPS,
+                 workers=EXPORT_PNG_WORKERS):
+        """Initialize writer; the directory is created if needed."""
+        self.path = directory
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(width, height, layout, fps, workers)
+        
+    def write_frame(self, index, buffer):
+        """Save one frame as its numbered PNG."""
+        data = encode_png(self.get_frame(buffer), self.offsets)
+        with open(os.path.join(self.path, f'frame_{index:06d}.png'), 'wb') as f:
+            f.write(data)
+            
+def open_writer(path, surface, fps=EXPORT_FPS, encoder=EXPORT_ENCODER):
+    """Open a writer for frames of surface: a video file if the encoder is installed.
+    
+    Paths with a video extension are encoded when the encoder is found;
+    otherwise frames go to a PNG sequence in a directory named after path.
+    """
+    width, height = surface.get_size()
+    layout = get_pixel_layout(surface)
+    root, extension = os.path.splitext(path)
+    if extension.lower() in EXPORT_VIDEO_EXTENSIONS:
+        if shutil.which(encoder):
+            return EncoderWriter(path, width, height, layout, fps, encoder)
+        path = root + '_frames'
+    return PngSequenceWriter(path, width, height, layout, fps)
\ No newline at end of file
@@ -98,6 +98,1360 @@ def test_game_logic():
         print(f"❌ Game logic test error: {e}")
         return False
 
+def test_obstacle_placement():
+    """Test that obstacles never split the board."""
+    try:
+        import random
+        from collections import deque
+        from components.obstacle_placer import ObstaclePlacer
+        
+        # Small board so that the placer has to refuse cut cells
+        placer = ObstaclePlacer(6, 6, min_head_distance=1, rng=random.Random(7))
+        head = (0, 0)
+        placer.reset([head])
+        
+        placed = []
+        while True:
+            pos = placer.place(head, blocked=((5, 5),))
+            if pos is None:
+                break
+            placed.append(pos)
+            
+        assert placed, "Should place at least one obstacle"
+        assert head not in placer.obstacles, "Obstacle must not cover the head"
+        assert (5, 5) not in placer.obstacles, "Obstacle must not cover food"
+        
+        # Every open cell must still be reachable from the head
+        open_cells = {(x, y) for x in range(6) for y in range(6)} - placer.obstacles
+        seen = {head}
+        queue = deque([head])
+        while queue:
+            x, y = queue.popleft()
+            for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if nxt in open_cells and nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        assert seen == open_cells, "Board should stay connected"
+        
+        # Free pool tracks snake moves
+        placer.reset([head], placed)
+        free_before = placer.get_free_count()
+        placer.advance((1, 0), tail=head)
+        assert placer.get_free_count() == free_before, "Moving should keep free count"
+        
+        print("✅ Obstacle placement keeps the board connected")
+        return True
+    except Exception as e:
+        print(f"❌ Obstacle placement test error: {e}")
+        return False
+
+def test_environment():
+    """Test the headless training environment."""
+    try:
+        from ai.environment import SnakeEnv, BODY, HEAD
+        
+        env = SnakeEnv()
+        obs, info = env.reset(seed=42)
+        assert obs[BODY].sum() == 1 and obs[HEAD].sum() == 1, "Snake should be painted"
+        
+        # Same seed, same episode; observations reuse one buffer
+        rewards = []
+        for seed in (42, 42):
+            env.reset(seed=seed)
+            total = 0
+            for i in range(200):
+                step_obs, reward, terminated, truncated, info = env.step(i // 7 % 4)
+                assert step_obs is obs, "Observation buffer should be reused"
+                total += reward
+                if terminated or truncated:
+                    break
+            rewards.append((total, i, info['score']))
+        assert rewards[0] == rewards[1], "Seeded episodes should be identical"
+        
+        print("✅ Environment steps deterministically")
+        return True
+    except Exception as e:
+        print(f"❌ Environment test error: {e}")
+        return False
+
+def test_game_state_snapshots():
+    """Test snapshot, restore and undo of the compact game state."""
+    try:
+        import random
+        from components.game_state import GameState
+        from config import DIRECTIONS
+        
+        state = GameState.new_game((10, 10), rng=random.Random(3))
+        state.grow_pending = True
+        for _ in range(4):
+            state.step(DIRECTIONS['RIGHT'])
+        saved = state.snapshot()
+        saved_body = state.body()
+        
+        # Tick-granular undo walks back exactly
+        for direction in ('DOWN', 'LEFT', 'LEFT'):
+            state.step(DIRECTIONS[direction], record=True)
+        assert state.body() != saved_body, "Snake should have moved"
+        while state.undo():
+            pass
+        assert state.body() == saved_body, "Undo should restore the body"
+        
+        # Branches share history without disturbing each other
+        state.step(DIRECTIONS['UP'])
+        up_body = state.body()
+        state.restore(saved)
+        state.step(DIRECTIONS['DOWN'])
+        assert state.body() != up_body, "Branches should differ"
+        state.restore(saved)
+        assert state.body() == saved_body, "Snapshot should be unchanged"
+        assert state.tail_cell() == saved_body[-1], "Tail should match body"
+        
+        # Dying on the tick after eating leaves the snake as it was
+        state = GameState.new_game((10, 1), rng=random.Random(3))
+        state.food = (10, 0)
+        state.step(DIRECTIONS['UP'], record=True)
+        assert state.grow_pending, "Eating should make the snake grow"
+        before = state.snapshot()
+        body = state.body()
+        state.step(DIRECTIONS['UP'], record=True)
+        assert not state.alive and state.death_cause == 'wall'
+        assert state.body() == body and state.length == len(body)
+        assert GameState.from_compact(state.to_compact()).body() == body
+        assert state.undo() and state.snapshot() == before, "Undo should revive the snake"
+        
+        print("✅ Game state snapshots restore correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Game state test error: {e}")
+        return False
+
+def test_sprite_atlas():
+    """Test that atlas sprites match the primitive drawing and are cached."""
+    try:
+        import pygame
+        from components.snake import Snake
+        from managers.sprite_manager import SpriteManager
+        from config import THEMES, DIRECTIONS
+        
+        sprite_manager = SpriteManager()
+        sprites = sprite_manager.get_sprites('forest')
+        assert sprite_manager.get_sprites('forest') is sprites, "Atlas should be cached"
+        sprite_manager.get_sprites('sea')
+        assert sprite_manager.build_count == 2, "Atlas should rebuild on theme change"
+        
+        snake = Snake(2, 2, THEMES['forest']['snake_color'])
+        snake.body = [(2, 2), (2, 3), (3, 3), (4, 3)]
+        snake.direction = DIRECTIONS['UP']
+        drawn = pygame.Surface((200, 200))
+        blitted = pygame.Surface((200, 200))
+        snake.draw(drawn, 0, 0)
+        snake.draw(blitted, 0, 0, sprite_manager.get_sprites('forest'))
+        assert (pygame.image.tostring(drawn, 'RGB') ==
+                pygame.image.tostring(blitted, 'RGB')), "Sprites should match primitives"
+        
+        print("✅ Sprite atlas matches primitive drawing")
+        return True
+    except Exception as e:
+        print(f"❌ Sprite atlas test error: {e}")
+        return False
+
+def test_board_layer():
+    """Test that incremental layer updates match a full rebuild."""
+    try:
+        import pygame
+        from components.snake import Snake
+        from managers.sprite_manager import SpriteManager
+        from managers.board_renderer import BoardRenderer
+        from config import THEMES, DIRECTIONS
+        
+        renderer = BoardRenderer(SpriteManager())
+        snake = Snake(5, 5, THEMES['forest']['snake_color'])
+        screen = pygame.Surface((900, 700))
+        renderer.draw(screen, 0, 0, 'forest', snake, None, [(1, 1)])
+        
+        for i, name in enumerate(['RIGHT'] * 4 + ['DOWN'] * 3 + ['LEFT', 'UP', 'UP']):
+            if i < 6:
+                snake.grow()
+            snake.change_direction(DIRECTIONS[name])
+            tail = snake.move()
+            renderer.on_snake_move(snake, tail)
+        renderer.draw(screen, 0, 0, 'forest', snake, None, [(1, 1)])
+        assert renderer.rebuild_count == 1, "Moves should not rebuild the layer"
+        incremental = pygame.image.tostring(renderer.layer, 'RGB')
+        
+        renderer.invalidate()
+        renderer.draw(screen, 0, 0, 'forest', snake, None, [(1, 1)])
+        assert pygame.image.tostring(renderer.layer, 'RGB') == incremental, \
+            "Incremental layer should match a full rebuild"
+        
+        print("✅ Board layer updates incrementally")
+        return True
+    except Exception as e:
+        print(f"❌ Board layer test error: {e}")
+        return False
+
+def test_sound_synthesis():
+    """Test synthesized theme sounds."""
+    try:
+        import numpy as np
+        from managers.sound_manager import synthesize_theme
+        from config import THEMES
+        
+        for theme in THEMES.values():
+            sounds = synthesize_theme(theme['sound_theme'])
+            assert set(sounds) == {'eat', 'bonus', 'game_over', 'ambient'}, "Missing sounds"
+            for samples in sounds.values():
+                assert samples.dtype == np.float32 and len(samples) > 0, "Bad sample data"
+                assert np.abs(samples).max() <= 1.0, "Samples should not clip"
+                
+        # The ambient loop should not click at its seam
+        ambient = synthesize_theme('forest')['ambient']
+        seam = abs(float(ambient[-1]) - float(ambient[0]))
+        assert seam < 0.1, "Ambient loop should be seamless"
+        
+        print("✅ Theme sounds synthesized")
+        return True
+    except Exception as e:
+        print(f"❌ Sound synthesis test error: {e}")
+        return False
+
+def test_classic_mode():
+    """Test classic rules and flat memory across restarts."""
+    try:
+        import random
+        import tracemalloc
+        from components.classic_game import ClassicGame
+        from config import DIRECTIONS
+        
+        game = ClassicGame(rng=random.Random(1))
+        assert game.grid_width == 80 and game.grid_height == 60, "Classic uses 10px blocks"
+        assert game.step() and game.body[-1] == (40, 30), "Snake waits for the first key"
+        
+        # Walking into the wall loses the round
+        game.change_direction(DIRECTIONS['LEFT'])
+        while game.step():
+            pass
+        assert game.body[-1] == (0, 30) and game.get_score() == 0, "Should stop at the wall"
+        
+        def play_round():
+            game.reset()
+            for i in range(200):
+                if i % 7 == 0:
+                    game.change_direction(rng.choice(list(DIRECTIONS.values())))
+                if not game.step():
+                    break
+                    
+        rng = random.Random(2)
+        for _ in range(50):
+            play_round()
+        tracemalloc.start()
+        for _ in range(50):
+            play_round()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in range(500):
+            play_round()
+        growth = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        assert growth < 16 * 1024, f"Restarts should not grow memory ({growth} bytes)"
+        
+        print("✅ Classic mode restarts in constant memory")
+        return True
+    except Exception as e:
+        print(f"❌ Classic mode test error: {e}")
+        return False
+
+def test_game_clock():
+    """Test that timers follow the virtual clock."""
+    try:
+        from components.game_clock import GameClock
+        from components.food import Food
+        from config import BOARD_WIDTH, BOARD_HEIGHT
+        
+        clock = GameClock()
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=clock)
+        food.spawn_bonus_food([(0, 0)], [])
+        
+        # Paused time does not run the bonus timer down
+        clock.pause()
+        clock.advance(60000)
+        food.update_bonus_food()
+        assert food.bonus_food is not None, "Bonus should not expire while paused"
+        
+        # Scaled time runs it down faster
+        clock.resume()
+        clock.set_scale(4.0)
+        for _ in range(4):
+            clock.advance(250)
+        assert abs(food.get_bonus_time_remaining() - 5.0) < 1e-6, "4x should use 4 seconds"
+        clock.advance(1000)  # Long frames are clamped to MAX_FRAME_MS
+        assert abs(food.get_bonus_time_remaining() - 4.0) < 1e-6, "Frame should be clamped"
+        for _ in range(5):
+            clock.advance(250)
+        food.update_bonus_food()
+        assert food.bonus_food is None, "Bonus should expire in game time"
+        
+        clock.set_scale(1e6)
+        assert clock.scale == 1000.0, "Scale should be clamped"
+        assert clock.advance_to(clock.time + 150) == 150, "Unthrottled jumps should be exact"
+        
+        print("✅ Game clock drives timers")
+        return True
+    except Exception as e:
+        print(f"❌ Game clock test error: {e}")
+        return False
+
+def test_history_archive():
+    """Test appending games and querying the columnar archive."""
+    try:
+        import tempfile
+        from managers.history_manager import HistoryManager
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            history = HistoryManager(temp_dir)
+            assert history.get_count() == 0, "New archive should be empty"
+            assert history.death_causes()['wall'] == 0, "Empty queries should work"
+            
+            history.append(100, 11, 10, 0, 30.5, 'forest', 'wall', (40, 12))
+            history.append(300, 33, 28, 1, 95.0, 'forest', 'self', (3, 4))
+            history.append(50, 6, 5, 0, 12.0, 'sea', 'obstacle', (7, 7))
+            
+            # A fresh reader sees the same data through memmap
+            history = HistoryManager(temp_dir)
+            assert history.get_count() == 3, "Should hold three games"
+            averages = history.theme_averages('score')
+            assert averages == {'forest': 200.0, 'sea': 50.0}, "Per-theme averages"
+            assert history.percentiles('score', (50,))[50] == 100.0, "Median score"
+            assert history.death_causes('forest') == {'wall': 1, 'self': 1, 'obstacle': 0,
+                                                      'full': 0, 'other': 0}, "Death causes"
+            counts, _ = history.distribution('length', bins=3)
+            assert counts.sum() == 3, "Distribution should cover all games"
+            assert history.columns('death_x')['death_x'].tolist() == [40, 3, 7], "Death cells"
+            
+        print("✅ History archive stores and queries games")
+        return True
+    except Exception as e:
+        print(f"❌ History archive test error: {e}")
+        return False
+
+def test_heatmaps():
+    """Test recording, sharding and merging heatmap counts."""
+    try:
+        import subprocess
+        import tempfile
+        import time
+        import numpy as np
+        from managers.heatmap_manager import HeatmapManager
+        from config import BOARD_WIDTH, BOARD_HEIGHT
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Two sessions write shards into the same directory
+            for _ in range(2):
+                heatmap = HeatmapManager(temp_dir)
+                heatmap.set_context('forest', 2)
+                for x in range(5):
+                    heatmap.record_visit((x, 3))
+                heatmap.record_death((-1, 3))
+                heatmap.save()
+                
+            heatmap = HeatmapManager(temp_dir)
+            heatmap.load()
+            visits = heatmap.get_counts('visits', 'forest', 2)
+            assert visits[3, :5].tolist() == [2] * 5, "Visits from both sessions merged"
+            assert visits.sum() == 10, "No stray visits"
+            assert heatmap.get_counts('deaths')[3, 0] == 2, "Off-board deaths clamp to the edge"
+            assert heatmap.get_counts('deaths', 'sea').sum() == 0, "Other themes stay empty"
+            assert len(os.listdir(temp_dir)) == 1, "Shards should be compacted into the base"
+            
+            # Counts merged in memory are saved like recorded ones
+            heatmap.merge(heatmap.visits, heatmap.deaths)
+            heatmap.save()
+            reloaded = HeatmapManager(temp_dir)
+            reloaded.load()
+            assert np.array_equal(reloaded.visits, heatmap.visits), "Merged counts persist"
+            
+            # A live process's lock defers merging; a dead or old one's is broken
+            lock_path = os.path.join(temp_dir, 'compact.lock')
+            exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+            exited.wait()
+            for owner, age, merged in ((os.getpid(), 0, False), (os.getpid(), 3600, True),
+                                       (exited.pid, 0, True)):
+                heatmap.record_death((7, 7))
+                heatmap.save()
+                with open(lock_path, 'w') as f:
+                    f.write(str(owner))
+                os.utime(lock_path, (time.time() - age,) * 2)
+                reloaded = HeatmapManager(temp_dir)
+                reloaded.load()
+                assert np.array_equal(reloaded.deaths, heatmap.deaths), "No counts are lost"
+                assert os.path.exists(lock_path) != merged, "Only a stale lock is broken"
+                assert (len(os.listdir(temp_dir)) == 1) == merged, "Merge only with the lock"
+                
+            # Two loads race over a dead process's lock: the second to break it
+            # finds the first one's fresh lock instead, and leaves it alone
+            heatmap.record_death((8, 8))
+            heatmap.save()
+            with open(lock_path, 'w') as f:
+                f.write(str(exited.pid))
+            first, second = HeatmapManager(temp_dir), HeatmapManager(temp_dir)
+            is_stale = first._is_stale
+            
+            def racing_is_stale(path):
+                stale = is_stale(path)
+                if path == lock_path and stale and second.lock_taken is None:
+                    second.lock_taken = second._lock()  # Both judged it stale
+                return stale
+                
+            second.lock_taken = None
+            first._is_stale = racing_is_stale
+            assert first._lock() is None, "Only one load may hold the lock"
+            assert second.lock_taken == lock_path, "The second load should keep its lock"
+            with open(lock_path, 'r') as f:
+                assert f.read() == str(os.getpid()), "The live lock should be put back"
+            os.remove(lock_path)
+            first._is_stale = is_stale
+            first.load()
+            assert np.array_equal(first.deaths, heatmap.deaths), "No counts are lost"
+            assert sorted(os.listdir(temp_dir)) == ['base.npz'], "No lock or shard should be left"
+            
+            surface = heatmap.render('visits')
+            assert surface.get_size() == (BOARD_WIDTH, BOARD_HEIGHT), "Heatmap covers the board"
+            assert heatmap.render('visits') is surface, "Unchanged heatmaps are cached"
+            
+        print("✅ Heatmaps merge across sessions")
+        return True
+    except Exception as e:
+        print(f"❌ Heatmap test error: {e}")
+        return False
+
+def test_replays():
+    """Test that seeking a replay matches the recorded game at every tick."""
+    try:
+        import random
+        import tempfile
+        from components.replay import Replay, ReplayRecorder, ReplayState, ReplayPlayer
+        from components.snake import Snake
+        from components.food import Food
+        from components.game_clock import GameClock
+        from managers.score_manager import ScoreManager
+        from managers.theme_manager import ThemeManager
+        from config import BOARD_WIDTH, BOARD_HEIGHT
+        
+        # The snake circles a rectangle; food is put a few cells ahead
+        loop = ([(x, 5) for x in range(5, 25)] + [(24, y) for y in range(6, 15)] +
+                [(x, 14) for x in range(23, 4, -1)] + [(5, y) for y in range(13, 5, -1)])
+        clock = GameClock()
+        snake = Snake(5, 5, (0, 255, 0))
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT, rng=random.Random(2), clock=clock)
+        food.regular_food = loop[3]
+        score_manager = ScoreManager(persistent=False)
+        obstacles = []
+        theme_manager = ThemeManager(clock)
+        recorder = ReplayRecorder(snake, food, score_manager, obstacles, theme_manager, 0,
+                                  interval=8)
+        
+        recorded = []
+        for tick in range(1, 301):
+            position = loop.index(snake.body[0])
+            next_cell = loop[(position + 1) % len(loop)]
+            snake.change_direction((next_cell[0] - snake.body[0][0],
+                                    next_cell[1] - snake.body[0][1]))
+            snake.move()
+            clock.time = tick * 150
+            regular_eaten, _ = food.check_food_eaten(snake.body[0])
+            if regular_eaten:
+                snake.grow()
+                score_manager.add_regular_food_score()
+                if len(snake.body) < 30:
+                    food.regular_food = loop[(position + 8) % len(loop)]
+                else:
+                    food.regular_food = (0, 0)
+                obstacles.append((10 + len(obstacles), 20))
+            if tick == 100:
+                theme_manager.set_theme('sea')
+                food.spawn_bonus_food(snake.body, obstacles)
+            recorder.record_move(clock.time)
+            recorded.append((list(snake.body), food.regular_food, food.bonus_food,
+                             list(obstacles), score_manager.get_current_score(),
+                             theme_manager.current_theme))
+            
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'game.replay.npz')
+            recorder.replay.save(path)
+            loaded = Replay.load(path)
+            
+        for replay in (recorder.replay, loaded):
+            state = ReplayState()
+            for tick in random.Random(5).sample(range(1, 301), 100) + [300, 1]:
+                replay.seek(state, tick)
+                assert (state.snake.body, state.food.regular_food, state.food.bonus_food,
+                        state.obstacles, state.score_manager.get_current_score(),
+                        state.theme) == recorded[tick - 1], f"Seek to tick {tick} differs"
+                        
+        # Playback follows game time at the chosen speed
+        player = ReplayPlayer(loaded)
+        player.set_speed(1000)
+        assert player.speed == 64, "Speed should be clamped"
+        player.update(150)
+        assert player.state.tick == 64, "64x should play 64 ticks of 150 ms"
+        assert len(recorded[-1][0]) >= 30, "Snake should have grown"
+        
+        print("✅ Replays seek to any tick")
+        return True
+    except Exception as e:
+        print(f"❌ Replay test error: {e}")
+        return False
+
+def test_leaderboard_sync():
+    """Test that queued scores reach the server exactly once across restarts."""
+    try:
+        import tempfile
+        import threading
+        import time
+        from managers.leaderboard_manager import LeaderboardManager
+        from leaderboard_server import LeaderboardServer
+        
+        entry = {'score': 0, 'player': 'Player', 'date': '2025-01-01T12:00:00',
+                 'food_eaten': 0, 'bonus_eaten': 0}
+        server = LeaderboardServer().start()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Offline, then the game crashes without shutting down
+            offline = LeaderboardManager(None, temp_dir)
+            for score in range(50):
+                offline.submit('forest', dict(entry, score=score))
+                
+            # Next start: old and new entries upload despite server errors
+            server.fail_requests = 2
+            client = LeaderboardManager(server.url, temp_dir, batch_size=20, min_backoff=0.01)
+            assert client.get_pending_count() == 50, "Queued entries should survive"
+            for score in range(50, 100):
+                client.submit('sea', dict(entry, score=score))
+            assert client.flush(5.0), "Queue should drain"
+            client.shutdown()
+            
+            assert len(server.entries) == 100, "Every entry should arrive once"
+            assert server.stats['failed'] == 2, "Failed requests should be retried"
+            assert server.stats['batches'] < 100, "Entries should be batched"
+            assert server.get_top('sea', 1)[0]['score'] == 99, "Leaderboard should rank"
+            assert os.path.getsize(client.journal_path) == 0, "Sent entries should be dropped"
+            
+            # Submitting never syncs on the caller's thread; the worker does
+            real_fsync = os.fsync
+            synced_on = []
+            
+            def record_fsync(fd):
+                synced_on.append(threading.get_ident())
+                real_fsync(fd)
+                
+            offline = LeaderboardManager(None, temp_dir)
+            os.fsync = record_fsync
+            try:
+                offline.submit('forest', entry)
+                deadline = time.monotonic() + 2.0
+                while offline.unsynced and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                os.fsync = real_fsync
+            assert synced_on and threading.get_ident() not in synced_on, \
+                "The worker, not submit(), should sync the journal"
+            offline.shutdown()
+            
+            # A count the journal does not back is corrected, not retried forever
+            client = LeaderboardManager(server.url, temp_dir)
+            with client.lock:
+                client.pending = 3
+            client.wake.set()
+            assert client.flush(2.0), "Pending count should follow the journal"
+            client.shutdown()
+        server.stop()
+        
+        print("✅ Leaderboard sync delivers queued scores")
+        return True
+    except Exception as e:
+        print(f"❌ Leaderboard sync test error: {e}")
+        return False
+
+def test_quality_governor():
+    """Test that the quality tier follows frame load with hysteresis."""
+    try:
+        from components.quality_governor import QualityGovernor
+        from managers.theme_manager import ThemeManager
+        from config import QUALITY_TIERS, QUALITY_UPGRADE_FRAMES
+        
+        governor = QualityGovernor(budget_ms=16.0)
+        for _ in range(200):
+            governor.record_frame(10.0)  # Busy but within budget
+        assert governor.tier == 0, "Moderate load should keep the best tier"
+        
+        # Sustained overload steps down one tier at a time
+        for _ in range(40):
+            governor.record_frame(30.0)
+        assert governor.tier == 1, "Overload should drop one tier"
+        for _ in range(200):
+            governor.record_frame(30.0)
+        assert governor.tier == len(QUALITY_TIERS) - 1, "Overload should reach the lowest tier"
+        
+        # Load between the thresholds changes nothing
+        for _ in range(1000):
+            governor.record_frame(10.0)
+        assert governor.tier == len(QUALITY_TIERS) - 1, "Middle load should not raise quality"
+        
+        # A raise that overloads again is retried only after a longer wait
+        for _ in range(QUALITY_UPGRADE_FRAMES + 20):
+            governor.record_frame(2.0)
+        raised = governor.tier
+        assert raised == len(QUALITY_TIERS) - 2, "Headroom should raise one tier"
+        for _ in range(50):
+            governor.record_frame(30.0)
+        assert governor.tier == raised + 1, "Overload after a raise should drop back"
+        assert governor.upgrade_frames == 2 * QUALITY_UPGRADE_FRAMES, "Retry should back off"
+        
+        # A fixed tier ignores frame times
+        governor.set_override(0)
+        for _ in range(200):
+            governor.record_frame(100.0)
+        assert governor.tier == 0 and 'fixed' in governor.get_label(), "Override should hold"
+        
+        theme_manager = ThemeManager()
+        assert len(theme_manager.create_particle_effect((0, 0), 'bonus')) == 12
+        theme_manager.set_quality(QUALITY_TIERS[1])
+        assert len(theme_manager.create_particle_effect((0, 0), 'bonus')) == 6
+        theme_manager.set_quality(QUALITY_TIERS[-1])
+        assert not theme_manager.create_particle_effect((0, 0), 'eat'), "Lowest tier has none"
+        
+        print("✅ Quality governor adapts to frame load")
+        return True
+    except Exception as e:
+        print(f"❌ Quality governor test error: {e}")
+        return False
+
+def test_renderers():
+    """Test the null renderer and the terminal renderer's cell diffs."""
+    try:
+        import io
+        from renderers.renderer import Frame, NullRenderer
+        from renderers.terminal_renderer import TerminalRenderer
+        from components.snake import Snake
+        from components.food import Food
+        from managers.score_manager import ScoreManager
+        from config import BOARD_WIDTH, BOARD_HEIGHT, THEMES
+        
+        snake = Snake(10, 10, THEMES['forest']['snake_color'])
+        for _ in range(4):
+            snake.grow()
+            snake.move()
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT)
+        food.regular_food = (20, 20)
+        frame = Frame().update('forest', snake, food, [(5, 5)], ScoreManager())
+        
+        null_renderer = NullRenderer()
+        null_renderer.render(frame)
+        assert null_renderer.frames == 1 and null_renderer.bytes_written == 0
+        
+        stream = io.BytesIO()
+        renderer = TerminalRenderer(stream, input_stream=False)
+        renderer.render(frame)
+        full = renderer.bytes_written
+        assert stream.getvalue().startswith(b'\x1b[?25l'), "First frame should clear the screen"
+        assert full > 40 * 30 * 2, "First frame should draw every cell"
+        
+        renderer.render(frame)
+        assert renderer.bytes_written == full, "An unchanged frame should write nothing"
+        
+        # A move repaints the new head, the old head and the vacated tail
+        snake.move()
+        before = stream.tell()
+        renderer.render(frame)
+        moved = stream.getvalue()[before:]
+        assert 0 < len(moved) < 150, f"A move should write a few cells, wrote {len(moved)}"
+        assert moved.count(b'  ') == 3, "Exactly three cells should change"
+        
+        # A new theme changes every color, so the screen is redrawn
+        renderer.render(frame.update('sea', snake, food, [(5, 5)], frame.score_manager))
+        assert renderer.bytes_written - full - len(moved) > 40 * 30 * 2
+        renderer.close()
+        assert stream.getvalue().endswith(b'\n'), "Closing should restore the terminal"
+        
+        print("✅ Renderers draw frames and terminal diffs stay small")
+        return True
+    except Exception as e:
+        print(f"❌ Renderer test error: {e}")
+        return False
+
+def test_idle_invalidation():
+    """Test what makes an idle screen redraw."""
+    try:
+        import pygame
+        from managers.ui_manager import UIManager
+        from managers.theme_manager import ThemeManager
+        from config import QUALITY_TIERS
+        
+        pygame.init()
+        ui_manager = UIManager()
+        button = ui_manager.buttons[0]
+        outside = (button.rect.right + 5, button.rect.bottom + 5)
+        ui_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=outside))
+        assert not ui_manager.hover_changed, "Moving outside the buttons changes nothing"
+        ui_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=button.rect.center))
+        assert ui_manager.hover_changed, "Entering a button should invalidate the screen"
+        ui_manager.hover_changed = False
+        ui_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION,
+                                                   pos=(button.rect.centerx + 1,
+                                                        button.rect.centery)))
+        assert not ui_manager.hover_changed, "Moving within a button changes nothing"
+        
+        theme_manager = ThemeManager()
+        assert not theme_manager.is_animated(), "Forest has no moving background"
+        theme_manager.current_theme = 'sea'
+        assert theme_manager.is_animated(), "Sea waves need animation ticks"
+        theme_manager.set_quality(QUALITY_TIERS[-1])
+        assert not theme_manager.is_animated(), "Static quality freezes the waves"
+        
+        print("✅ Idle screens redraw only when invalidated")
+        return True
+    except Exception as e:
+        print(f"❌ Idle invalidation test error: {e}")
+        return False
+
+def test_input_buffer():
+    """Test that quick presses become one turn per move."""
+    try:
+        from components.input_buffer import InputBuffer
+        from components.snake import Snake
+        from config import DIRECTIONS
+        
+        snake = Snake(10, 10, (0, 255, 0))  # Moving right
+        buffer = InputBuffer(size=3)
+        buffer.push(DIRECTIONS['UP'], 100)
+        buffer.push(DIRECTIONS['LEFT'], 110)
+        assert buffer.apply(snake, 150) and snake.direction == DIRECTIONS['UP']
+        snake.move()
+        assert buffer.apply(snake, 300) and snake.direction == DIRECTIONS['LEFT']
+        snake.move()
+        assert snake.body[0] == (9, 9), "Both turns should be made, one per move"
+        assert not buffer.apply(snake, 450), "An empty buffer should not turn"
+        
+        # Reversals and repeats are no turns; overflowing presses are dropped
+        buffer.push(DIRECTIONS['RIGHT'], 500)
+        buffer.push(DIRECTIONS['RIGHT'], 501)
+        buffer.push(DIRECTIONS['DOWN'], 502)
+        buffer.push(DIRECTIONS['LEFT'], 503)
+        buffer.push(DIRECTIONS['UP'], 504)
+        assert buffer.dropped == 1, "The fourth queued press should be dropped"
+        assert buffer.apply(snake, 600) and snake.direction == DIRECTIONS['DOWN']
+        assert buffer.rejected == 1, "The reversal should be rejected"
+        
+        stats = buffer.get_latency_stats()
+        assert stats['count'] == 3 and stats['max'] == 190, "Latencies should be recorded"
+        assert stats['p50'] == 98, f"Median latency should be 98, got {stats['p50']}"
+        
+        print("✅ Input buffer queues one turn per move")
+        return True
+    except Exception as e:
+        print(f"❌ Input buffer test error: {e}")
+        return False
+
+def test_video_export():
+    """Test frame capture into an encoder pipe and a PNG sequence."""
+    try:
+        import tempfile
+        import pygame
+        from renderers.video_writer import open_writer, get_pixel_layout
+        
+        surface = pygame.Surface((64, 48), 0, 32)
+        surface.fill((10, 20, 30))
+        surface.set_at((3, 5), (200, 100, 50))
+        layout = get_pixel_layout(surface)
+        assert sorted(layout[0].replace('0', '')) == ['b', 'g', 'r'], "Layout should name RGB"
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # A stand-in encoder that stores the raw frames it is sent
+            encoder = os.path.join(temp_dir, 'store.sh')
+            with open(encoder, 'w') as f:
+                f.write('#!/bin/sh\nfor last; do :; done\ncat > "$last"\n')
+            os.chmod(encoder, 0o755)
+            
+            path = os.path.join(temp_dir, 'clip.mp4')
+            writer = open_writer(path, surface, encoder=encoder)
+            for _ in range(3):
+                writer.capture(surface)
+            writer.close()
+            with open(path, 'rb') as f:
+                raw = f.read()
+            assert len(raw) == 3 * 64 * 48 * 4, "Every frame should reach the encoder"
+            pixel = raw[(5 * 64 + 3) * 4:(5 * 64 + 3) * 4 + 4]
+            assert tuple(pixel[layout[2][i]] for i in range(3)) == (200, 100, 50)
+            
+            # Without the encoder, frames become PNG files
+            writer = open_writer(path, surface, encoder='no-such-encoder')
+            for _ in range(3):
+                writer.capture(surface)
+            writer.close()
+            frames = sorted(os.listdir(writer.path))
+            assert frames == ['frame_000000.png', 'frame_000001.png', 'frame_000002.png']
+            image = pygame.image.load(os.path.join(writer.path, frames[2]))
+            assert image.get_at((3, 5))[:3] == (200, 100, 50), "PNG pixels should match"
+            assert image.get_at((0, 0))[:3] == (10, 20, 30)
+            
+        print("✅ Video export streams frames to the encoder or PNG files")
+        return True
+    except Exception as e:
+        print(f"❌ Video export test error: {e}")
+        return False
+
+def test_session_save():
+    """Test saving a session to the binary format and loading it back."""
+    try:
+        import tempfile
+        import threading
+        import time
+        from types import SimpleNamespace
+        from components.snake import Snake
+        from components.food import Food
+        from components.game_clock import GameClock
+        from managers.score_manager import ScoreManager
+        from managers.theme_manager import ThemeManager
+        from managers.session_manager import SessionManager
+        from config import BOARD_WIDTH, BOARD_HEIGHT, GRID_WIDTH, GRID_HEIGHT, DIRECTIONS
+        
+        clock = GameClock()
+        clock.time = 20000.0
+        snake = Snake(5, 5, (0, 255, 0))
+        snake.body = [(5, 5), (4, 5), (3, 5), (3, 6)]
+        snake.direction = DIRECTIONS['RIGHT']
+        snake.grow_next = True
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=clock)
+        food.regular_food = (10, 12)
+        food.bonus_food = (0, 29)
+        food.bonus_timer = 17.5  # 6.5 seconds left
+        score_manager = ScoreManager(persistent=False)
+        score_manager.current_score, score_manager.food_eaten, score_manager.bonus_food_eaten = 130, 11, 1
+        theme_manager = ThemeManager(clock)
+        theme_manager.set_theme('snow')
+        theme_manager.enable_mix_mode()
+        game = SimpleNamespace(snake=snake, food=food, score_manager=score_manager,
+                               theme_manager=theme_manager, game_clock=clock,
+                               obstacles=[(20, 20), (39, 0)],
+                               last_move_time=19950.0, game_start_time=5000.0)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = SessionManager(os.path.join(temp_dir, 'session.bin'))
+            assert manager.load() is None, "No save should load as None"
+            manager.save(manager.pack(game))
+            session = manager.load()
+            assert session['body'] == snake.body and session['obstacles'] == game.obstacles
+            assert session['direction'] == DIRECTIONS['RIGHT'] and session['grow_next']
+            assert session['theme'] == 'snow' and session['mix_mode']
+            assert session['food'] == (10, 12) and session['bonus_food'] == (0, 29)
+            assert abs(session['bonus_remaining'] - 6.5) < 1e-4, "Bonus time left should be kept"
+            assert session['move_phase'] == 50 and session['elapsed'] == 15000
+            assert (session['score'], session['food_eaten'], session['bonus_eaten']) == (130, 11, 1)
+            
+            # A damaged file is ignored rather than restored
+            with open(manager.path, 'r+b') as f:
+                f.seek(40)
+                f.write(b'\xff')
+            assert manager.load() is None, "A damaged save should not load"
+            
+            # Background checkpoints write the newest state; game over discards it
+            food.bonus_food = None
+            manager.checkpoint(game)
+            manager.shutdown()
+            assert manager.load()['bonus_food'] is None, "The checkpoint should be written"
+            manager.discard()
+            assert not os.path.exists(manager.path), "Discard should delete the save"
+            
+            # A slow disk neither holds up the game thread nor outlives a discard
+            slow = SessionManager(os.path.join(temp_dir, 'slow.bin'))
+            writing, release = threading.Event(), threading.Event()
+            
+            def slow_save(data):
+                writing.set()
+                release.wait(5)
+                SessionManager.save(slow, data)
+                
+            slow.save = slow_save
+            slow.checkpoint(game)
+            assert writing.wait(5), "The worker should start writing"
+            start = time.perf_counter()
+            slow.checkpoint(game, force=True)
+            slow.discard()
+            blocked_ms = (time.perf_counter() - start) * 1000
+            release.set()
+            slow.shutdown()
+            assert blocked_ms < 100, f"The game thread waited {blocked_ms:.0f} ms on a write"
+            assert not os.path.exists(slow.path), "A save discarded mid-write should be deleted"
+            
+            # A full-board snake packs well under a millisecond
+            snake.body = [(x if y % 2 == 0 else GRID_WIDTH - 1 - x, y)
+                          for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH)]
+            game.obstacles = []
+            start = time.perf_counter()
+            for _ in range(100):
+                data = manager.pack(game)
+            pack_ms = (time.perf_counter() - start) * 10
+            assert manager.unpack(data)['body'] == snake.body
+            assert pack_ms < 1.0, f"Packing a full board took {pack_ms:.3f} ms"
+            
+        print(f"✅ Sessions save in {len(data)} bytes and {pack_ms:.3f} ms and load back")
+        return True
+    except Exception as e:
+        print(f"❌ Session save test error: {e}")
+        return False
+
+def test_gc_control():
+    """Test GC thresholds per state, safe-point collections and pause telemetry."""
+    try:
+        import gc
+        from components.gc_control import GCController
+        from components.frame_stats import FrameStats
+        
+        idle_thresholds = gc.get_threshold()
+        controller = GCController(enabled=True, play_thresholds=(5000, 20, 1000000))
+        try:
+            controller.set_active(True)
+            assert gc.get_threshold() == (5000, 20, 1000000), "Play should use play thresholds"
+            gc.collect(0)
+            assert controller.stats['collections'][0] >= 1, "Collections should be timed"
+            assert controller.take_frame_pause() > 0, "The pause should go to the frame"
+            assert controller.take_frame_pause() == 0, "Taking the pause should reset it"
+            
+            # A still screen restores the thresholds and collects outside the frame
+            controller.set_active(False)
+            assert gc.get_threshold() == idle_thresholds
+            assert controller.stats['safe_collections'] == 1
+            assert controller.take_frame_pause() == 0, "Safe points are not frame pauses"
+        finally:
+            controller.shutdown()
+        assert controller._on_collect not in gc.callbacks, "Shutdown should remove the callback"
+        
+        stats = FrameStats(budget_ms=10.0)
+        for frame_ms, gc_ms in ((5.0, 0.0), (12.0, 4.0), (15.0, 0.0), (6.0, 0.5)):
+            stats.record(frame_ms, gc_ms)
+        result = stats.get_stats()
+        assert result['spikes'] == 2 and result['gc_spikes'] == 1, "Spikes should be attributed"
+        assert result['gc_frames'] == 2 and result['gc_total'] == 4.5 and result['max'] == 15.0
+        
+        print("✅ GC control defers full collections and reports pauses per frame")
+        return True
+    except Exception as e:
+        print(f"❌ GC control test error: {e}")
+        return False
+
+def test_frame_allocations():
+    """Test that steady-state game frames allocate (almost) nothing."""
+    try:
+        import tempfile
+        import tracemalloc
+        from array import array
+        from managers.game_manager import GameManager
+        from config import DIRECTIONS
+        
+        frames = 10000
+        peak_ceiling = 4096  # Bytes alive at once within one frame
+        growth_ceiling = 64  # Bytes kept per frame (heatmap visits, replay moves)
+        
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                game = GameManager()
+                game.sound_manager.ready.wait(30)  # Synthesis allocates on its own thread
+                game.session_manager.interval = float('inf')
+                game.start_game()
+                
+                # Circle a 10x4 loop with the food off it, so every frame is alike
+                turns = {(24, 15): DIRECTIONS['DOWN'], (24, 18): DIRECTIONS['LEFT'],
+                         (15, 18): DIRECTIONS['UP'], (15, 15): DIRECTIONS['RIGHT']}
+                game.food.regular_food = (2, 2)
+                game.food.bonus_food = None
+                
+                def frame():
+                    turn = turns.get(game.snake.body[0])
+                    if turn is not None:
+                        game.snake.direction = turn
+                    game.game_clock.advance(1000 / 60)
+                    game.update_game(1 / 60)
+                    game.draw_game()
+                    
+                for _ in range(600):  # Fill the caches
+                    frame()
+                    
+                peaks = array('q', bytes(8 * frames))
+                tracemalloc.start()
+                try:
+                    start = tracemalloc.get_traced_memory()[0]
+                    for i in range(frames):
+                        tracemalloc.reset_peak()
+                        current = tracemalloc.get_traced_memory()[0]
+                        frame()
+                        peaks[i] = tracemalloc.get_traced_memory()[1] - current
+                    growth = (tracemalloc.get_traced_memory()[0] - start) / frames
+                finally:
+                    tracemalloc.stop()
+                assert game.state == 'playing', f"The snake should still be circling, not {game.state}"
+                
+                # Like cleanup(), but pygame stays up for the other tests
+                game.sound_manager.shutdown()
+                game.leaderboard_manager.shutdown()
+                game.session_manager.shutdown()
+                game.gc_controller.shutdown()
+            finally:
+                os.chdir(cwd)
+                
+        peak = max(peaks)
+        assert peak <= peak_ceiling, f"A frame had {peak} bytes allocated at once"
+        assert growth <= growth_ceiling, f"Frames kept {growth:.1f} bytes each"
+        print(f"✅ {frames} frames allocate at most {peak} bytes at once "
+              f"(mean {sum(peaks) / frames:.0f}) and keep {growth:.1f} bytes each")
+        return True
+    except Exception as e:
+        print(f"❌ Frame allocation test error: {e}")
+        return False
+
+def test_bot_tuner():
+    """Test the heuristic bot's features and the reproducible, resumable weight tuner."""
+    try:
+        import tempfile
+        from components.game_state import GameState
+        from ai.heuristic import HeuristicBot, move_features, get_score_theme
+        from ai.tuner import HeuristicTuner
+        from config import DIRECTIONS
+        
+        # Food at the end of a dead-end pocket above the head
+        state = GameState.from_compact((
+            [(5, 5), (6, 5), (7, 5)], DIRECTIONS['LEFT'], False, (5, 4), None, 0.0,
+            [(4, 4), (6, 4), (5, 3)], 0, 0, 0, 0))
+        assert move_features(state, DIRECTIONS['RIGHT']) is None, "Moving into the neck is fatal"
+        free_space, tail_distance, food_distance = move_features(state, DIRECTIONS['UP'])
+        assert free_space == 0 and food_distance == 0 and tail_distance == 1.0
+        assert HeuristicBot().choose_direction(state) != DIRECTIONS['UP'], "The pocket is a trap"
+        greedy = {'free_space': 0.0, 'tail_distance': 0.0, 'food_distance': -1.0}
+        assert HeuristicBot(greedy).choose_direction(state) == DIRECTIONS['UP']
+        assert HeuristicBot(theme_weights={'sea': greedy}).choose_direction(state, 'sea') == DIRECTIONS['UP']
+        assert get_score_theme(0) == 'forest' and get_score_theme(150) == 'sea'
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def tuner(name, generations, workers=0):
+                return HeuristicTuner(seed=3, population=4, generations=generations, games=2,
+                                      levels=2, max_moves=400, workers=workers,
+                                      directory=os.path.join(temp_dir, name),
+                                      weights_path=os.path.join(temp_dir, name + '.json'),
+                                      log=lambda message: None)
+                                      
+            # Worker processes give the same result as in-process evaluation
+            fresh = tuner('fresh', 2).tune_all(['sea'])['sea']
+            parallel = tuner('parallel', 2, workers=2).tune_all(['sea'])['sea']
+            assert parallel == fresh, "Tuning should not depend on the worker count"
+            
+            # A run stopped after one generation resumes to the same result
+            tuner('resumed', 1).tune_all(['sea'])
+            resumed = tuner('resumed', 2)
+            messages = []
+            resumed.log = messages.append
+            assert resumed.tune_all(['sea'])['sea'] == fresh
+            assert 'resuming' in messages[0], "The checkpoint should be resumed"
+            
+            bot = HeuristicBot.load(os.path.join(temp_dir, 'fresh.json'))
+            assert bot.get_weights('sea') == tuple(fresh[0].values()), "Tuned weights should load"
+            assert bot.get_weights('hill') == bot.weights, "Untuned themes use the defaults"
+            
+        print(f"✅ Bot tuner is reproducible and resumable (sea fitness {fresh[1]:.3f})")
+        return True
+    except Exception as e:
+        print(f"❌ Bot tuner test error: {e}")
+        return False
+
+def test_layer_compositing():
+    """Test that layers drawn on a thread pool compose the same frame as drawing in turn."""
+    try:
+        import numpy as np
+        import pygame
+        from renderers.renderer import Frame
+        from renderers.pygame_renderer import PygameRenderer, merge_rects
+        from managers.theme_manager import ThemeManager
+        from managers.board_renderer import BoardRenderer
+        from managers.sprite_manager import SpriteManager
+        from managers.ui_manager import UIManager
+        from managers.score_manager import ScoreManager
+        from components.snake import Snake
+        from components.food import Food
+        from components.game_clock import GameClock
+        from components.distance_field import DistanceField
+        from config import SCREEN_WIDTH, SCREEN_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT, THEMES
+        
+        merged = merge_rects([(0, 0, 10, 10), (50, 50, 5, 5), (5, 5, 10, 10)])
+        assert sorted(map(tuple, merged)) == [(0, 0, 15, 15), (50, 50, 5, 5)]
+        
+        clock = GameClock()
+        snake = Snake(10, 10, THEMES['forest']['snake_color'])
+        for _ in range(4):
+            snake.grow()
+            snake.move()
+        food = Food(BOARD_WIDTH, BOARD_HEIGHT, clock=clock)
+        food.regular_food = (20, 20)
+        food.bonus_food = (25, 5)
+        food.bonus_timer = 0.0
+        field = DistanceField()
+        field.reset(snake.body, [(5, 5)], (food.regular_food, food.bonus_food))
+        theme_manager = ThemeManager(clock)  # Shared, so both get the same background
+        
+        # Overlapping particles, spread out a little
+        particles = (theme_manager.create_particle_effect((500, 300)) +
+                     theme_manager.create_particle_effect((503, 302), 'bonus'))
+        for particle in particles:
+            particle['pos'][0] += 3 * particle['vel'][0]
+            particle['pos'][1] += 3 * particle['vel'][1]
+        frame = Frame().update('forest', snake, food, [(5, 5)], ScoreManager(persistent=False),
+                               particles, field)
+        
+        def renderer(threads):
+            return PygameRenderer(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), theme_manager,
+                                  BoardRenderer(SpriteManager()), UIManager(), clock,
+                                  threads=threads)
+                                  
+        in_turn, layered = renderer(0), renderer(2)
+        try:
+            for particle_list in (particles, []):  # Then the particle layer must be cleared
+                frame.particles = particle_list
+                for target in (in_turn, layered):
+                    target.render(frame)
+                expected = pygame.surfarray.array3d(in_turn.screen)
+                actual = pygame.surfarray.array3d(layered.screen)
+                assert np.array_equal(expected, actual), \
+                    f"{np.count_nonzero((expected != actual).any(axis=2))} pixels differ"
+            assert layered.hud_rects and not layered.particle_rects
+        finally:
+            layered.close()
+        assert layered.pool is None, "Closing should stop the layer threads"
+        
+        print("✅ Layers composed on a thread pool match drawing in turn, pixel for pixel")
+        return True
+    except Exception as e:
+        print(f"❌ Layer compositing test error: {e}")
+        return False
+
+def test_wall_death_replay():
+    """Test that a game lost to a wall replays and exports cleanly."""
+    try:
+        import glob
+        import tempfile
+        from managers.game_manager import GameManager
+        from components.replay import Replay
+        from config import DIRECTIONS, GRID_WIDTH, GRID_HEIGHT, CELL_SIZE
+        
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                game = GameManager()
+                game.session_manager.interval = float('inf')
+                game.start_game()
+                game.food.regular_food = (2, 2)  # Off the snake's path
+                game.snake.direction = DIRECTIONS['RIGHT']
+                
+                # A failing archive store must not keep the others from saving
+                def full_disk(*args):
+                    raise OSError("No space left on device")
+                    
+                game.leaderboard_manager.submit = full_disk
+                for _ in range(10000):
+                    if game.state != 'playing':
+                        break
+                    game.game_clock.advance(1000 / 60)
+                    game.update_game(1 / 60)
+                    game.draw_game()
+                assert game.state == 'game_over', f"The snake should hit the wall, not {game.state}"
+                
+                # The Replay button plays what was stored, up to the fatal move
+                replay = game.replay_recorder.replay
+                stored = Replay.load(glob.glob(os.path.join('data', 'replays', '*.npz'))[0])
+                assert list(stored.moves) == list(replay.moves), "Stored replay should match"
+                assert list(stored.times) == list(replay.times)
+                assert game.history_manager.get_count() == 1, "The game should be archived"
+                assert replay.get_tick_count() == GRID_WIDTH - GRID_WIDTH // 2, \
+                    "The replay should end with the move into the wall"
+                    
+                # Ending with the head in the wall, it still plays and exports
+                game.start_replay(replay)
+                game.replay_player.set_speed(64)
+                while game.replay_player.playing:
+                    game.game_clock.advance(1000 / 60)
+                    game.update_replay(1 / 60)
+                    game.draw_replay()
+                assert game.replay_player.state.snake.body[0][0] == GRID_WIDTH
+                game.stop_replay()
+                writer = game.export_replay(replay, os.path.join(temp_dir, 'death.mp4'),
+                                            start_ms=replay.get_duration() - 500,
+                                            encoder='no-such-encoder')
+                assert len(os.listdir(writer.path)) > 1, "Export should write frames"
+                
+                # A head in the left or top wall must not wrap to the far edge
+                board_renderer = game.board_renderer
+                snake = game.snake
+                for cell, direction, far_edge in (
+                        ((0, 10), 'LEFT', (GRID_WIDTH - 1, 10)),
+                        ((10, 0), 'UP', (10, GRID_HEIGHT - 1)),
+                        ((10, GRID_HEIGHT - 1), 'DOWN', (10, 0))):
+                    board_renderer.invalidate()
+                    snake.body[:] = [cell]
+                    snake.direction = DIRECTIONS[direction]
+                    game.draw_game()
+                    point = (far_edge[0] * CELL_SIZE + CELL_SIZE // 2,
+                             far_edge[1] * CELL_SIZE + CELL_SIZE // 2)
+                    before = board_renderer.layer.get_at(point)
+                    board_renderer.on_snake_move(snake, snake.move())
+                    assert board_renderer.layer.get_at(point) == before, \
+                        f"Moving {direction} out of {cell} drew on the far edge"
+                        
+                game.sound_manager.shutdown()
+                game.leaderboard_manager.shutdown()
+                game.session_manager.shutdown()
+                game.gc_controller.shutdown()
+            finally:
+                os.chdir(cwd)
+                
+        print("✅ Wall deaths replay and export without drawing off the board")
+        return True
+    except Exception as e:
+        print(f"❌ Wall death replay test error: {e}")
+        return False
+
+def test_mcts_search():
+    """Test that seeded MCTS picks safe moves and matches across worker processes."""
+    try:
+        import random
+        from components.game_state import GameState
+        from ai.mcts import MCTSController, safe_directions
+        from config import DIRECTIONS, GRID_WIDTH
+        
+        # Heading into the right wall, with an obstacle above the head
+        state = GameState.new_game((GRID_WIDTH - 1, 10), rng=random.Random(4))
+        state.obstacle_mask |= state.board.bit((GRID_WIDTH - 1, 9))
+        state.food = (GRID_WIDTH - 1, 5)
+        safe = safe_directions(state)
+        assert safe == [DIRECTIONS['DOWN']], f"Only DOWN should be safe, not {safe}"
+        
+        results = []
+        for workers in (0, 1):
+            controller = MCTSController(workers=workers, seed=7, iterations=300)
+            try:
+                direction = controller.decide(state, 100)
+                results.append((direction, dict(controller.stats), controller.rollouts))
+            finally:
+                controller.shutdown()
+        direction, stats, rollouts = results[0]
+        assert direction in safe, f"Search chose the fatal move {direction}"
+        assert rollouts == 300, "A fixed iteration count should bound the search"
+        assert results[1] == results[0], "A worker process should search exactly like in-process"
+        
+        print("✅ Seeded MCTS picks safe moves, the same in-process and in a worker")
+        return True
+    except Exception as e:
+        print(f"❌ MCTS search test error: {e}")
+        return False
+
+def test_bitboard_backend():
+    """Test that the bitboard snake plays seeded moves exactly like the list snake."""
+    try:
+        import random
+        from components.snake import Snake
+        from components.bitboard import BitboardSnake
+        from config import BOARD_WIDTH, BOARD_HEIGHT, GRID_WIDTH, GRID_HEIGHT, DIRECTIONS
+        
+        directions = list(DIRECTIONS.values())
+        causes = set()
+        for seed in range(300):
+            rng = random.Random(seed)
+            start = (rng.randrange(GRID_WIDTH), rng.randrange(GRID_HEIGHT))
+            snakes = (Snake(*start, (0, 255, 0)), BitboardSnake(*start, (0, 255, 0)))
+            for _ in range(400):
+                grow = rng.random() < 0.3
+                direction = rng.choice(directions)
+                tails = []
+                for snake in snakes:
+                    if grow:
+                        snake.grow()
+                    snake.change_direction(direction)
+                    tails.append(snake.move())
+                listed, bitboard = snakes
+                assert tails[0] == tails[1] and listed.body == bitboard.body, \
+                    f"Seed {seed}: bodies differ"
+                on_board = {cell for cell in listed.body if bitboard.board.bit(cell)}
+                assert set(bitboard.get_occupancy()) == on_board, \
+                    f"Seed {seed}: body mask differs"
+                collided = listed.check_collision(BOARD_WIDTH, BOARD_HEIGHT)
+                assert bitboard.check_collision(BOARD_WIDTH, BOARD_HEIGHT) == collided, \
+                    f"Seed {seed}: collisions differ at {listed.body[0]}"
+                if collided:
+                    causes.add('self' if listed.body[0] in on_board else 'wall')
+                    break
+        assert causes == {'self', 'wall'}, f"Walks should end both ways, not only {causes}"
+        
+        # Past the row ends lie the padding bits, which must still be walls
+        for start, direction in (((GRID_WIDTH - 1, 5), 'RIGHT'), ((0, 5), 'LEFT'),
+                                 ((GRID_WIDTH - 1, GRID_HEIGHT - 1), 'RIGHT'),
+                                 ((0, 0), 'UP'), ((3, GRID_HEIGHT - 1), 'DOWN')):
+            snake = BitboardSnake(*start, (0, 255, 0))
+            snake.direction = DIRECTIONS[direction]
+            snake.move()
+            assert snake.check_collision(BOARD_WIDTH, BOARD_HEIGHT), \
+                f"Moving {direction} from {start} should hit the wall"
+            assert not snake.board.bit(snake.body[0]), "Off-board cells have no bit"
+            assert not snake.body_mask.value & ~snake.board.board_mask, "Mask left the board"
+            
+        print("✅ Bitboard snake matches the list snake move for move")
+        return True
+    except Exception as e:
+        print(f"❌ Bitboard backend test error: {e}")
+        return False
+
+def test_distance_field():
+    """Test that incremental food distances match a full BFS after any block/release."""
+    try:
+        import random
+        from collections import deque
+        from components.distance_field import DistanceField
+        
+        def full_bfs(field):
+            """Food distances from scratch, one cell at a time."""
+            dist = [field.unreachable] * field.size
+            queue = deque(field.index(cell) for cell in field.food_cells)
+            for index in queue:
+                dist[index] = 0
+            while queue:
+                current = queue.popleft()
+                for neighbour in field.neighbours[current]:
+                    if not field.blocked[neighbour] and dist[neighbour] > dist[current] + 1:
+                        dist[neighbour] = dist[current] + 1
+                        queue.append(neighbour)
+            return dist
+            
+        for seed in range(20):
+            rng = random.Random(seed)
+            field = DistanceField(12, 9)  # Small, so walls of blocks cut off regions
+            cells = [(x, y) for y in range(9) for x in range(12)]
+            food = rng.sample(cells, rng.choice((1, 2)))
+            field.reset([], [], food)
+            free = [cell for cell in cells if cell not in food]
+            blocked = []
+            for step in range(300):
+                if blocked and (rng.random() < 0.4 or not free):
+                    cell = blocked.pop(rng.randrange(len(blocked)))
+                    field.release(cell)
+                    free.append(cell)
+                else:
+                    cell = free.pop(rng.randrange(len(free)))
+                    field.block(cell)
+                    blocked.append(cell)
+                assert field.food_dist.tolist() == full_bfs(field), \
+                    f"Seed {seed}, step {step}: field differs after changing {cell}"
+                    
+        print("✅ Incremental food distances match a full BFS")
+        return True
+    except Exception as e:
+        print(f"❌ Distance field test error: {e}")
+        return False
+
 def main():
     """Run all tests."""
     print("🐍 Snake Odyssey: Component Test Suite")
@@ -106,7 +1460,33 @@ def main():
     tests = [
         ("Module Imports", test_imports),
         ("Component Initialization", test_components),
-        ("Game Logic", test_game_logic)
+        ("Game Logic", test_game_logic),
+        ("Obstacle Placement", test_obstacle_placement),
+        ("Environment", test_environment),
+        ("Game State Snapshots", test_game_state_snapshots),
+        ("Sprite Atlas", test_sprite_atlas),
+        ("Board Layer", test_board_layer),
+        ("Sound Synthesis", test_sound_synthesis),
+        ("Classic Mode", test_classic_mode),
+        ("Game Clock", test_game_clock),
+        ("History Archive", test_history_archive),
+        ("Heatmaps", test_heatmaps),
+        ("Replays", test_replays),
+        ("Leaderboard Sync", test_leaderboard_sync),
+        ("Quality Governor", test_quality_governor),
+        ("Renderers", test_renderers),
+        ("Idle Invalidation", test_idle_invalidation),
+        ("Input Buffer", test_input_buffer),
+        ("Video Export", test_video_export),
+        ("Session Save", test_session_save),
+        ("GC Control", test_gc_control),
+        ("Frame Allocations", test_frame_allocations),
+        ("Bot Tuner", test_bot_tuner),
+        ("Layer Compositing", test_layer_compositing),
+        ("Wall Death Replay", test_wall_death_replay),
+        ("MCTS Search", test_mcts_search),
+        ("Bitboard Backend", test_bitboard_backend),
+        ("Distance Field", test_distance_field)
     ]
     
     passed = 0
@@ -0,0 +1,50 @@
+"""
+Heuristic bot tuner for Snake Odyssey.
+Evolves the bot's weights per theme on seeded headless games in worker processes.
+
+Usage:
+    python tune_bot.py [theme ...] [--seed N] [--generations N] [--population N]
+                       [--games N] [--workers N]
+
+Populations are checkpointed to data/tuning/, so an interrupted run picks
+up where it stopped; the best weights per theme go to data/bot_weights.json.
+"""
+
+import sys
+import os
+import time
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config import THEMES
+from ai.tuner import HeuristicTuner
+
+OPTIONS = ('seed', 'generations', 'population', 'games', 'workers')
+
+def main():
+    """Tune the named themes, or all of them."""
+    args = sys.argv[1:]
+    settings = {}
+    themes = []
+    while args:
+        arg = args.pop(0)
+        if arg.startswith('--') and arg[2:] in OPTIONS and args:
+            settings[arg[2:]] = int(args.pop(0))
+        elif arg in THEMES:
+            themes.append(arg)
+        else:
+            print(__doc__)
+            return 2
+            
+    tuner = HeuristicTuner(**settings)
+    start = time.perf_counter()
+    results = tuner.tune_all(themes or list(THEMES))
+    for theme, (weights, fitness) in results.items():
+        values = ', '.join(f'{name} {weight:+.3f}' for name, weight in weights.items())
+        print(f"🏆 {theme}: {values} (fitness {fitness:.3f})")
+    print(f"Saved to {tuner.weights_path} in {time.perf_counter() - start:.1f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file